@@ -3,9 +3,12 @@ import os
 from celery import Celery
 from django.conf import settings
 
+from tracker.codec import register_celery_serializer
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
+register_celery_serializer()
+
 app = Celery("core", broker=settings.CELERY_BROKER_URL)
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
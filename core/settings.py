@@ -13,7 +13,9 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 import os
 from pathlib import Path
 
+from celery.schedules import crontab
 from dotenv import load_dotenv
+from psycopg_pool import ConnectionPool
 
 load_dotenv()
 
@@ -80,11 +82,25 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "core.wsgi.application"
+ASGI_APPLICATION = "core.asgi.application"
 
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Every process type gets its own pool size, e.g. the bot and the workers
+# need far fewer connections than the web workers. Set PROCESS_TYPE to
+# one of DB_POOL_SIZES keys when starting a process.
+PROCESS_TYPE = os.environ.get("PROCESS_TYPE", "web")
+
+DB_POOL_SIZES = {
+    "web": (2, 10),
+    "bot": (1, 8),
+    "worker": (1, 4),
+    "beat": (1, 1),
+}
+DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE = DB_POOL_SIZES.get(PROCESS_TYPE, (1, 4))
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -94,8 +110,22 @@ DATABASES = {
         "HOST": os.environ.get("DB_HOST", ""),
         "PORT": os.environ.get("DB_PORT", ""),
         "ATOMIC_REQUESTS": True,
+        "OPTIONS": {
+            "pool": {
+                "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", DB_POOL_MIN_SIZE)),
+                "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", DB_POOL_MAX_SIZE)),
+                "timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+                "max_idle": 300,
+                "check": ConnectionPool.check_connection,
+            },
+        },
     }
 }
+DB_POOL_STATS_INTERVAL = int(os.environ.get("DB_POOL_STATS_INTERVAL", 300))
+# Threads running the bot's database calls, kept within the bot pool size.
+BOT_DB_EXECUTOR_WORKERS = int(
+    os.environ.get("BOT_DB_EXECUTOR_WORKERS", DB_POOL_SIZES["bot"][1])
+)
 
 
 # Password validation
@@ -144,17 +174,180 @@ AUTH_USER_MODEL = "tracker.CustomUser"
 LOGOUT_REDIRECT_URL = "/"
 
 GITHUB_AUTH_TOKEN = os.environ.get("GITHUB_AUTH_TOKEN")
+# With a GitHub App, requests to repositories of its installations use
+# installation tokens; everything else falls back to GITHUB_AUTH_TOKEN.
+GITHUB_APP_ID = os.environ.get("GITHUB_APP_ID")
+GITHUB_APP_PRIVATE_KEY = os.environ.get("GITHUB_APP_PRIVATE_KEY", "").replace(
+    "\\n", "\n"
+)
+GITHUB_APP_TOKEN_REFRESH_MARGIN = int(
+    os.environ.get("GITHUB_APP_TOKEN_REFRESH_MARGIN", 300)
+)
+GITHUB_APP_INSTALLATIONS_TTL = int(os.environ.get("GITHUB_APP_INSTALLATIONS_TTL", 3600))
+GITHUB_REQUEST_TIMEOUT = int(os.environ.get("GITHUB_REQUEST_TIMEOUT", 10))
+GITHUB_CONNECT_TIMEOUT = int(os.environ.get("GITHUB_CONNECT_TIMEOUT", 5))
+GITHUB_POOL_CONNECTIONS = int(os.environ.get("GITHUB_POOL_CONNECTIONS", 4))
+GITHUB_POOL_SIZE = int(os.environ.get("GITHUB_POOL_SIZE", 16))
+# Failed idempotent GitHub requests are retried with a jittered exponential
+# backoff of GITHUB_BACKOFF_BASE * 2**attempt seconds, capped at GITHUB_BACKOFF_MAX.
+GITHUB_MAX_RETRIES = int(os.environ.get("GITHUB_MAX_RETRIES", 2))
+GITHUB_BACKOFF_BASE = float(os.environ.get("GITHUB_BACKOFF_BASE", 0.5))
+GITHUB_BACKOFF_MAX = int(os.environ.get("GITHUB_BACKOFF_MAX", 8))
+# The circuit of an endpoint class opens after GITHUB_CIRCUIT_THRESHOLD failed
+# calls in a row for GITHUB_CIRCUIT_COOLDOWN seconds. Meanwhile the last known
+# good data, kept for GITHUB_LAST_GOOD_TTL seconds, is served marked as stale.
+GITHUB_CIRCUIT_THRESHOLD = int(os.environ.get("GITHUB_CIRCUIT_THRESHOLD", 5))
+GITHUB_CIRCUIT_COOLDOWN = int(os.environ.get("GITHUB_CIRCUIT_COOLDOWN", 60))
+GITHUB_LAST_GOOD_TTL = int(os.environ.get("GITHUB_LAST_GOOD_TTL", 86400))
 TELEGRAM_AUTH_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
+TELEGRAM_BOT_USERNAME = os.environ.get("TELEGRAM_BOT_USERNAME", "")
+
+
+REDIS_URL = os.environ.get("REDIS_URL")
+
+# Caches are shared through Redis so every bot worker, web and Celery
+# process sees the same report cursors and GitHub data.
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+        if REDIS_URL
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    )
+}
 
 
 # Celery settings
 
-CELERY_BROKER_URL = os.environ.get("REDIS_URL")
-CELERY_RESULT_BACKEND = os.environ.get("REDIS_URL")
-CELERY_ACCEPT_CONTENT = ["application/json"]
-CELERY_TASK_SERIALIZER = "json"
-CELERY_RESULT_SERIALIZER = "json"
+CELERY_BROKER_URL = REDIS_URL
+CELERY_RESULT_BACKEND = REDIS_URL
+# Task payloads and results use the msgspec codec registered in core/celery.py,
+# plain JSON is still accepted from producers that have not been updated.
+CELERY_ACCEPT_CONTENT = ["application/json", "application/x-msgspec-json"]
+CELERY_TASK_SERIALIZER = "msgspec"
+CELERY_RESULT_SERIALIZER = "msgspec"
+
+# Every stage of the approvals pipeline has its own queue, so a slow GitHub
+# repository never delays notification delivery. See entrypoint.sh for the
+# per-queue worker concurrency.
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_ROUTES = {
+    "tracker.tasks.dispatch_approvals": {"queue": "default"},
+    "tracker.tasks.fetch_approvals": {"queue": "default"},
+    "tracker.tasks.fetch_approvals_batch": {"queue": "default"},
+    "tracker.tasks.fetch_repository_reviews": {"queue": "github"},
+    "tracker.tasks.aggregate_revisions": {"queue": "default"},
+    "tracker.tasks.release_approvals": {"queue": "default"},
+    "tracker.tasks.send_revision_notification": {"queue": "telegram"},
+    "tracker.tasks.flush_notification_digests": {"queue": "default"},
+    "tracker.tasks.send_notification_digest": {"queue": "telegram"},
+    "tracker.tasks.refresh_repository_issues": {"queue": "github"},
+    "tracker.tasks.prewarm_hot_repositories": {"queue": "default"},
+    "tracker.tasks.sync_leaderboard": {"queue": "default"},
+    "tracker.tasks.sync_repository_leaderboard": {"queue": "github"},
+    "tracker.tasks.refresh_issue_stats": {"queue": "default"},
+}
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(
+    os.environ.get("CELERY_WORKER_PREFETCH_MULTIPLIER", 1)
+)
+CELERY_FETCH_MAX_RETRIES = 3
+CELERY_SEND_MAX_RETRIES = 5
 
 # Custom app settings
 
-DEFAULT_SCHEDULE_INTERVAL = 3600
+# Every subscriber is notified about approvals once per APPROVALS_INTERVAL
+# seconds, at an offset derived from their telegram id. The dispatcher runs
+# at the start of every slot of APPROVALS_INTERVAL / APPROVALS_SLOTS seconds,
+# which should be a whole number of minutes.
+APPROVALS_INTERVAL = int(os.environ.get("APPROVALS_INTERVAL", 3600))
+APPROVALS_SLOTS = int(os.environ.get("APPROVALS_SLOTS", 60))
+APPROVALS_LOCK_TTL = int(os.environ.get("APPROVALS_LOCK_TTL", 1800))
+# With APPROVALS_BATCH_SIZE above 1, the subscribers of a slot are notified
+# in batches of that size, each in one event loop running at most
+# APPROVALS_BATCH_CONCURRENCY GitHub fetches and Telegram sends at a time.
+APPROVALS_BATCH_SIZE = int(os.environ.get("APPROVALS_BATCH_SIZE", 1))
+APPROVALS_BATCH_CONCURRENCY = int(os.environ.get("APPROVALS_BATCH_CONCURRENCY", 10))
+
+# Telegram bot scaling: in webhook mode updates are pushed into BOT_WORKERS
+# Redis streams, sharded by chat, each consumed by one bot worker process.
+BOT_MODE = os.environ.get("BOT_MODE", "polling")
+BOT_WORKERS = int(os.environ.get("BOT_WORKERS", 1))
+BOT_WORKER_CONCURRENCY = int(os.environ.get("BOT_WORKER_CONCURRENCY", 16))
+BOT_WEBHOOK_URL = os.environ.get("BOT_WEBHOOK_URL", "")
+BOT_WEBHOOK_PATH = "/telegram/webhook"
+BOT_WEBHOOK_SECRET = os.environ.get("BOT_WEBHOOK_SECRET", "")
+BOT_WEBHOOK_HOST = "0.0.0.0"
+BOT_WEBHOOK_PORT = int(os.environ.get("BOT_WEBHOOK_PORT", 8080))
+BOT_STREAM_MAXLEN = 10000
+BOT_STREAM_BATCH = 50
+BOT_STREAM_BLOCK_MS = 5000
+
+# Health endpoints only report an ok/degraded status to anonymous callers.
+# Staff users and callers sending HEALTH_TOKEN in the X-Health-Token header
+# get the details as well.
+HEALTH_TOKEN = os.environ.get("HEALTH_TOKEN", "")
+
+# Issue listings are fresh for ISSUES_CACHE_TTL seconds and served stale,
+# while being refreshed in the background, up to ISSUES_STALE_TTL seconds.
+ISSUES_CACHE_TTL = int(os.environ.get("ISSUES_CACHE_TTL", 60))
+ISSUES_STALE_TTL = int(os.environ.get("ISSUES_STALE_TTL", 600))
+# Pull request reviews of a tracked repository are shared by its subscribers.
+REVIEWS_CACHE_TTL = int(os.environ.get("REVIEWS_CACHE_TTL", 300))
+# The last assignment time of an issue is kept until the issue is updated,
+# for at most ASSIGNMENT_CACHE_TTL seconds.
+ASSIGNMENT_CACHE_TTL = int(os.environ.get("ASSIGNMENT_CACHE_TTL", 604800))
+# The pull request to issue links of a repository are refreshed from the
+# open pull requests at most every LINKS_REFRESH_INTERVAL seconds.
+LINKS_REFRESH_INTERVAL = int(os.environ.get("LINKS_REFRESH_INTERVAL", 60))
+
+# Popular repositories are refreshed every PREWARM_INTERVAL seconds; the
+# request counters decay by POPULARITY_DECAY on every run and repositories
+# below POPULARITY_MIN_SCORE are evicted from the cache.
+PREWARM_INTERVAL = 30
+PREWARM_HOT_REPOSITORIES = int(os.environ.get("PREWARM_HOT_REPOSITORIES", 20))
+POPULARITY_DECAY = 0.9
+POPULARITY_MIN_SCORE = 0.1
+
+# Issue statistics are recomputed from the issue history every
+# STATS_REFRESH_INTERVAL seconds and cached for STATS_CACHE_TTL seconds.
+STATS_REFRESH_INTERVAL = int(os.environ.get("STATS_REFRESH_INTERVAL", 3600))
+STATS_CACHE_TTL = int(os.environ.get("STATS_CACHE_TTL", 7200))
+
+CELERY_BEAT_SCHEDULE = {
+    "dispatch-approvals": {
+        "task": "tracker.tasks.dispatch_approvals",
+        "schedule": crontab(
+            minute=f"*/{max(APPROVALS_INTERVAL // APPROVALS_SLOTS // 60, 1)}"
+        ),
+    },
+    "refresh-issue-stats": {
+        "task": "tracker.tasks.refresh_issue_stats",
+        "schedule": STATS_REFRESH_INTERVAL,
+    },
+    "flush-notification-digests": {
+        "task": "tracker.tasks.flush_notification_digests",
+        "schedule": crontab(minute=0),
+    },
+    "prewarm-hot-repositories": {
+        "task": "tracker.tasks.prewarm_hot_repositories",
+        "schedule": PREWARM_INTERVAL,
+    },
+    "sync-leaderboard": {
+        "task": "tracker.tasks.sync_leaderboard",
+        "schedule": int(os.environ.get("LEADERBOARD_SYNC_INTERVAL", 3600)),
+    },
+}
+
+REPORT_PAGE_SIZE = int(os.environ.get("REPORT_PAGE_SIZE", 10))
+REPORT_CURSOR_TTL = int(os.environ.get("REPORT_CURSOR_TTL", 900))
+REPORT_CONCURRENCY = int(os.environ.get("REPORT_CONCURRENCY", 4))
+REPORT_REPOSITORY_TIMEOUT = int(os.environ.get("REPORT_REPOSITORY_TIMEOUT", 30))
+# Threads building report sections, shared by every report of the process.
+REPORT_WORKERS = int(os.environ.get("REPORT_WORKERS", 16))
+REPORT_PROGRESS_EDIT_INTERVAL = 1
+# Repositories are read in chunks of EXPORT_CHUNK_SIZE rows while streaming exports.
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 100))
+
+LEADERBOARD_SIZE = int(os.environ.get("LEADERBOARD_SIZE", 10))
@@ -9,6 +9,22 @@ python manage.py migrate
 echo "Starting the server, celery and bot..."
 exec "$@"
 
-celery -A core worker --loglevel=info &  celery -A core beat --loglevel=info &
+PROCESS_TYPE=worker celery -A core worker -Q default -n default@%h --loglevel=info \
+  --concurrency="${CELERY_DEFAULT_CONCURRENCY:-2}" &
+PROCESS_TYPE=worker celery -A core worker -Q github -n github@%h --loglevel=info \
+  --concurrency="${CELERY_GITHUB_CONCURRENCY:-8}" --prefetch-multiplier=1 &
+PROCESS_TYPE=worker celery -A core worker -Q telegram -n telegram@%h --loglevel=info \
+  --concurrency="${CELERY_TELEGRAM_CONCURRENCY:-2}" --prefetch-multiplier=4 &
+PROCESS_TYPE=beat celery -A core beat --loglevel=info &
 
-gunicorn --bind 0.0.0.0:8000 core.wsgi:application & python manage.py run_telegram_bot
\ No newline at end of file
+if [ "${BOT_MODE:-polling}" = "webhook" ]; then
+  for shard in $(seq 0 $((${BOT_WORKERS:-1} - 1))); do
+    PROCESS_TYPE=bot python manage.py run_telegram_bot --mode worker --shard "$shard" &
+  done
+fi
+
+if [ "${SERVER_MODE:-asgi}" = "asgi" ]; then
+  PROCESS_TYPE=web gunicorn --bind 0.0.0.0:8000 -k uvicorn_worker.UvicornWorker core.asgi:application & PROCESS_TYPE=bot python manage.py run_telegram_bot
+else
+  PROCESS_TYPE=web gunicorn --bind 0.0.0.0:8000 core.wsgi:application & PROCESS_TYPE=bot python manage.py run_telegram_bot
+fi
@@ -1,21 +1,24 @@
-import asyncio
-
+from asgiref.sync import async_to_sync
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.models import Group
 from django.db.models import QuerySet
 from django.forms import BaseModelForm
+from django.http import StreamingHttpResponse
 from django.utils.html import format_html
 from django.utils.safestring import SafeString
 from django_celery_beat.models import IntervalSchedule, PeriodicTask
-from django.http import JsonResponse
 
-from .models import Repository, Contributor
-from .telegram.bot import create_tg_link
+from .codec import JsonResponse
+from .exports import export_response
+from .history import get_period_stats
+from .models import Contributor, IssueHistory, LeaderboardEntry, Repository
+from .values import SECONDS_IN_AN_HOUR, STATS_PERIODS
+from .telegram.client import create_tg_link
 
 admin.site.unregister(Group)
 
 
-
 @admin.register(Repository)
 class RepositoryAdmin(admin.ModelAdmin):
     """
@@ -27,6 +30,8 @@ class RepositoryAdmin(admin.ModelAdmin):
 
     Methods:
         telegram_link: Adds a referral link to display in the list view.
+        export_csv: Streams the assignments report of the selected repositories as CSV.
+        export_json: Streams the assignments report of the selected repositories as JSON.
         get_form: Customizes the model form to set the user field to the current user.
         get_queryset: Filters the queryset to show only the current user's repositories.
 
@@ -35,6 +40,7 @@ class RepositoryAdmin(admin.ModelAdmin):
     """
 
     list_display = ("name", "author", "telegram_link")
+    actions = ("export_csv", "export_json")
 
     def telegram_link(self, obj) -> SafeString:
         """
@@ -43,12 +49,32 @@ class RepositoryAdmin(admin.ModelAdmin):
         :return: SafeString
         """
 
-        link = asyncio.run(create_tg_link(obj.user.id))
+        link = async_to_sync(create_tg_link)(obj.user_id)
 
         return format_html(
             '<a href="{}" target="_blank">Get info about repository</a>', link
         )
 
+    @admin.action(description="Export assignments of selected repositories (CSV)")
+    def export_csv(self, request, queryset: QuerySet) -> StreamingHttpResponse:
+        """
+        Streams the assignments and missed deadlines of the selected repositories.
+        :param request: HttpRequest
+        :param queryset: the selected repositories
+        :return: StreamingHttpResponse
+        """
+        return export_response(request, queryset, "csv")
+
+    @admin.action(description="Export assignments of selected repositories (JSON)")
+    def export_json(self, request, queryset: QuerySet) -> StreamingHttpResponse:
+        """
+        Streams the assignments and missed deadlines of the selected repositories.
+        :param request: HttpRequest
+        :param queryset: the selected repositories
+        :return: StreamingHttpResponse
+        """
+        return export_response(request, queryset, "json")
+
     def get_form(self, request, obj=None, **kwargs) -> BaseModelForm:
         """
         A custom method to set the user field to the current user.
@@ -86,6 +112,7 @@ class ContributorAdmin(admin.ModelAdmin):
     """
 
     list_display = ("user", "role", "rank", "notes")
+    list_select_related = ("user__telegramuser",)
     search_fields = ("user__email", "user__telegramuser__telegram_id", "role")
     list_filter = ("role",)
 
@@ -108,30 +135,193 @@ class ContributorAdmin(admin.ModelAdmin):
         Returns JSON data if requested via AJAX or API.
         """
         if request.headers.get("Content-Type") == "application/json":
-            queryset = self.get_queryset(request)
+            queryset = self.get_queryset(request).select_related(
+                "user__telegramuser"
+            )
             user = request.user
 
-            if user.is_project_lead():
-                data = [
-                    {
-                        "id": contributor.id,
-                        "user": contributor.user.telegramuser.telegram_id,
-                        "role": contributor.role,
-                        "notes": contributor.notes,
-                        "rank": contributor.rank,
-                    }
-                    for contributor in queryset
-                ]
-            else:
-                data = [
-                    {
-                        "id": contributor.id,
-                        "user": contributor.user.telegramuser.telegram_id,
-                        "role": contributor.role,
-                    }
-                    for contributor in queryset
-                ]
+            data = [
+                contributor.to_dict(full=user.is_project_lead())
+                for contributor in queryset
+            ]
 
             return JsonResponse(data, safe=False)
 
-        return super().changelist_view(request, extra_context=extra_context)
\ No newline at end of file
+        return super().changelist_view(request, extra_context=extra_context)
+
+
+class RankedChangeList(ChangeList):
+    """
+    A change list setting the rank of every leaderboard entry on the page.
+    """
+
+    def get_results(self, request) -> None:
+        """
+        Loads the page of entries and numbers them from the page offset.
+        :param request: HttpRequest
+        :return: None
+        """
+        super().get_results(request)
+
+        offset = 0
+        if self.multi_page and not self.show_all:
+            offset = (self.page_num - 1) * self.list_per_page
+
+        self.result_list = list(self.result_list)
+        for rank, entry in enumerate(self.result_list, start=offset + 1):
+            entry.rank = rank
+
+
+@admin.register(LeaderboardEntry)
+class LeaderboardEntryAdmin(admin.ModelAdmin):
+    """
+    Read-only admin of the precomputed contributor leaderboard.
+
+    Entries are listed in rank order only, so a page reads just its own rows
+    through the rank index. Searching and sorting are disabled as they
+    would break the numbering.
+
+    Methods:
+        rank: Shows the position of an entry on the leaderboard.
+        get_changelist: Uses RankedChangeList.
+    """
+
+    list_display = (
+        "rank",
+        "login",
+        "score",
+        "issues_completed",
+        "pull_requests_merged",
+        "reviews_received",
+        "deadlines_missed",
+    )
+    list_display_links = ("login",)
+    sortable_by = ()
+    show_full_result_count = False
+
+    @admin.display(description="Rank")
+    def rank(self, obj: LeaderboardEntry) -> int:
+        """
+        Returns the rank set by RankedChangeList.
+        :param obj: LeaderboardEntry
+        :return: int
+        """
+        return obj.rank
+
+    def get_changelist(self, request, **kwargs) -> type[ChangeList]:
+        """
+        Returns the change list class numbering the entries.
+        :param request: HttpRequest
+        :param kwargs: dict
+        :return: RankedChangeList
+        """
+        return RankedChangeList
+
+    def has_add_permission(self, request) -> bool:
+        """
+        Entries are only created by recorded activity.
+        :param request: HttpRequest
+        :return: bool
+        """
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        """
+        Entries are only changed by recorded activity.
+        :param request: HttpRequest
+        :param obj: LeaderboardEntry
+        :return: bool
+        """
+        return False
+
+
+@admin.register(IssueHistory)
+class IssueHistoryAdmin(admin.ModelAdmin):
+    """
+    Read-only admin of the append-only issue history.
+
+    The change list starts with a chart of the time to the first pull
+    request and the deadline hit rate of every repository over the last
+    month, read from the precomputed statistics. Like the repositories,
+    the chart and the entries are limited to those the current user tracks.
+
+    Methods:
+        get_queryset: Limits the entries to the repositories of the user.
+        changelist_view: Adds the chart to the change list.
+    """
+
+    chart_period = "month"
+    list_display = ("occurred_at", "tracked", "number", "kind", "login")
+    list_filter = ("kind",)
+    list_select_related = ("tracked",)
+    search_fields = ("login",)
+
+    def get_queryset(self, request) -> QuerySet:
+        """
+        Returns the entries of the repositories the current user tracks.
+        :param request: HttpRequest
+        :return: QuerySet
+        """
+        queryset = super().get_queryset(request)
+
+        return queryset.filter(
+            tracked_id__in=Repository.objects.filter(user=request.user).values(
+                "tracked_id"
+            )
+        )
+
+    def changelist_view(self, request, extra_context=None):
+        """
+        Adds the statistics chart of the repositories the current user tracks
+        to the change list. Bars are scaled to the slowest p90 time to PR.
+        """
+        stats = get_period_stats(self.chart_period)["repositories"]
+        tracked_ids = {
+            str(tracked_id)
+            for tracked_id in Repository.objects.filter(user=request.user).values_list(
+                "tracked_id", flat=True
+            )
+        }
+        repositories = sorted(
+            (stats[tracked_id] for tracked_id in tracked_ids if tracked_id in stats),
+            key=lambda entry: entry["label"],
+        )
+        longest = max(
+            (entry["p90_time_to_pr"] or 0 for entry in repositories), default=0
+        )
+
+        chart = [
+            {
+                "label": entry["label"],
+                "assignments": entry["assignments"],
+                "p50_hours": (entry["p50_time_to_pr"] or 0) / SECONDS_IN_AN_HOUR,
+                "p90_hours": (entry["p90_time_to_pr"] or 0) / SECONDS_IN_AN_HOUR,
+                "p50_width": 100 * (entry["p50_time_to_pr"] or 0) / (longest or 1),
+                "p90_width": 100 * (entry["p90_time_to_pr"] or 0) / (longest or 1),
+                "hit_rate": entry["deadline_hit_rate"],
+            }
+            for entry in repositories
+        ]
+
+        extra_context = (extra_context or dict()) | {
+            "chart": chart,
+            "chart_days": STATS_PERIODS[self.chart_period],
+        }
+        return super().changelist_view(request, extra_context=extra_context)
+
+    def has_add_permission(self, request) -> bool:
+        """
+        Entries are only appended by the repository syncs.
+        :param request: HttpRequest
+        :return: bool
+        """
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        """
+        Entries are never changed.
+        :param request: HttpRequest
+        :param obj: IssueHistory
+        :return: bool
+        """
+        return False
@@ -0,0 +1,232 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+import msgspec
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from .db import database_sync_to_async
+from .leaderboard import record_reviews
+from .models import Repository, TelegramUser
+from .notifications import buffer_reviews, sends_immediately
+from .resilience import StaleResultError, stale_since
+from .telegram.client import get_bot, revision_messages
+from .utils import get_repository_revisions
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+REVIEWS_CACHE_KEY = "reviews:{tracked_id}"
+APPROVALS_LOCK_KEY = "approvals_lock:{telegram_id}"
+
+
+def release_approvals_lock(telegram_id: str) -> None:
+    """
+    Marks the approvals run of a subscriber as finished.
+    :param telegram_id: The telegram id of the user
+    :return: None
+    """
+    cache.delete(APPROVALS_LOCK_KEY.format(telegram_id=telegram_id))
+
+
+@database_sync_to_async
+def get_batch_subscriptions(
+    telegram_ids: list[str],
+) -> tuple[dict[str, TelegramUser], dict[str, dict[str, tuple[str, str]]]]:
+    """
+    Loads the subscribers of a batch and their tracked repositories in two queries.
+    :param telegram_ids: The telegram ids of the subscribers
+    :return: TelegramUser by telegram id, and the tracked repositories of
+             every subscriber as {tracked_id: (author, name)}
+    """
+    telegram_users = {
+        telegram_user.telegram_id: telegram_user
+        for telegram_user in TelegramUser.objects.filter(telegram_id__in=telegram_ids)
+    }
+
+    subscriptions = dict()
+    repositories = Repository.objects.filter(
+        user__telegramuser__telegram_id__in=telegram_ids
+    ).values_list(
+        "user__telegramuser__telegram_id",
+        "tracked_id",
+        "tracked__author",
+        "tracked__name",
+    )
+    for telegram_id, tracked_id, author, name in repositories:
+        subscriptions.setdefault(telegram_id, dict())[str(tracked_id)] = (author, name)
+
+    return telegram_users, subscriptions
+
+
+async def fetch_tracked_reviews(
+    tracked_id: str, author: str, name: str, semaphore: asyncio.Semaphore
+) -> list[dict]:
+    """
+    Fetches the reviews of a tracked repository, sharing the cache of
+    `fetch_repository_reviews`, and credits them on the leaderboard.
+    The blocking GitHub calls run in a worker thread on the process-wide
+    GitHub session. Stale results are neither cached nor credited.
+
+    :param tracked_id: The id of the TrackedRepository
+    :param author: The author of the repository
+    :param name: The name of the repository
+    :param semaphore: Bounds the concurrent GitHub calls of the batch
+    :raises StaleResultError: If a listing of the repository failed.
+    :return: The revisions as plain dicts
+    """
+    cache_key = REVIEWS_CACHE_KEY.format(tracked_id=tracked_id)
+    revisions = await cache.aget(cache_key)
+
+    if revisions is None:
+        async with semaphore:
+            revisions = await sync_to_async(
+                get_repository_revisions, thread_sensitive=False
+            )(author, name)
+
+        if stale_since(revisions) is not None:
+            raise StaleResultError(f"The reviews of {author}/{name} are stale.")
+
+        await database_sync_to_async(record_reviews)(revisions)
+        await cache.aset(cache_key, revisions, timeout=settings.REVIEWS_CACHE_TTL)
+
+    return msgspec.to_builtins(revisions)
+
+
+async def notify_subscriber(
+    bot,
+    telegram_id: str,
+    telegram_user: TelegramUser | None,
+    reviews: list[dict],
+    semaphore: asyncio.Semaphore,
+) -> bool:
+    """
+    Delivers the reviews of a subscriber like `aggregate_revisions` does,
+    sending the report through the shared bot session.
+
+    :param bot: aiogram.Bot with an open session
+    :param telegram_id: The telegram id of the user
+    :param telegram_user: TelegramUser, None if unknown
+    :param reviews: The merged reviews of the subscriber
+    :param semaphore: Bounds the concurrent Telegram calls of the batch
+    :return: False if Telegram asked to retry the send later
+    """
+    from aiogram.exceptions import (
+        TelegramAPIError,
+        TelegramNetworkError,
+        TelegramRetryAfter,
+    )
+
+    if not reviews:
+        release_approvals_lock(telegram_id)
+        return True
+
+    if telegram_user is not None and not sends_immediately(
+        telegram_user, datetime.now(timezone.utc)
+    ):
+        await database_sync_to_async(buffer_reviews)(telegram_user, reviews)
+        release_approvals_lock(telegram_id)
+        return True
+
+    try:
+        async with semaphore:
+            for message in revision_messages(reviews):
+                await bot.send_message(telegram_id, message)
+
+    except (TelegramRetryAfter, TelegramNetworkError) as e:
+        logger.info(e)
+        return False
+
+    except TelegramAPIError as e:
+        logger.info(e)
+
+    release_approvals_lock(telegram_id)
+    return True
+
+
+async def run_approvals_batch(telegram_ids: list[str]) -> list[tuple[str, list]]:
+    """
+    Notifies a batch of subscribers about the reviews of their repositories
+    within one event loop.
+
+    Every tracked repository of the batch is fetched once, and all the
+    reports are sent through one Telegram session. At most
+    `settings.APPROVALS_BATCH_CONCURRENCY` GitHub fetches and Telegram sends
+    are in flight at a time. Subscribers with a run in progress are skipped,
+    and the run of a subscriber whose delivery failed is finished.
+
+    :param telegram_ids: The telegram ids of the subscribers
+    :return: (telegram_id, reviews) of the sends Telegram asked to retry later
+    """
+    telegram_users, subscriptions = await get_batch_subscriptions(telegram_ids)
+
+    locked = [
+        telegram_id
+        for telegram_id in subscriptions
+        if await cache.aadd(
+            APPROVALS_LOCK_KEY.format(telegram_id=telegram_id),
+            True,
+            timeout=settings.APPROVALS_LOCK_TTL,
+        )
+    ]
+    if not locked:
+        return []
+
+    repositories = {
+        tracked_id: repository
+        for telegram_id in locked
+        for tracked_id, repository in subscriptions[telegram_id].items()
+    }
+    semaphore = asyncio.Semaphore(settings.APPROVALS_BATCH_CONCURRENCY)
+
+    results = await asyncio.gather(
+        *(
+            fetch_tracked_reviews(tracked_id, author, name, semaphore)
+            for tracked_id, (author, name) in repositories.items()
+        ),
+        return_exceptions=True,
+    )
+
+    reviews = dict()
+    for tracked_id, result in zip(repositories, results):
+        if isinstance(result, Exception):
+            logger.info(result)
+        else:
+            reviews[tracked_id] = result
+
+    merged = {
+        telegram_id: [
+            review
+            for tracked_id in subscriptions[telegram_id]
+            for review in reviews.get(tracked_id, [])
+        ]
+        for telegram_id in locked
+    }
+
+    bot = get_bot()
+    async with bot.context():
+        delivered = await asyncio.gather(
+            *(
+                notify_subscriber(
+                    bot,
+                    telegram_id,
+                    telegram_users.get(telegram_id),
+                    merged[telegram_id],
+                    semaphore,
+                )
+                for telegram_id in locked
+            ),
+            return_exceptions=True,
+        )
+
+    retries = list()
+    for telegram_id, result in zip(locked, delivered):
+        if isinstance(result, Exception):
+            logger.exception(result)
+            release_approvals_lock(telegram_id)
+        elif not result:
+            retries.append((telegram_id, merged[telegram_id]))
+
+    return retries
@@ -14,3 +14,51 @@ class Roles(models.TextChoices):
 
     PROJECT_LEAD = "lead", "Tech-lead"
     CONTRIBUTOR = "contributor", "Contributor"
+
+
+class ActivityKind(models.TextChoices):
+    """
+    Kinds of tracked GitHub activity counted on the leaderboard.
+    The values are the names of the LeaderboardEntry counters.
+
+    Attributes:
+        issue_completed (ActivityKind Enumeration): An issue closed within the time limit.
+        pull_request_merged (ActivityKind Enumeration): A merged pull request.
+        review_received (ActivityKind Enumeration): A review of the contributor's pull request.
+        deadline_missed (ActivityKind Enumeration): An assignment that outlived the time limit.
+    """
+
+    ISSUE_COMPLETED = "issues_completed", "Issue completed"
+    PULL_REQUEST_MERGED = "pull_requests_merged", "Pull request merged"
+    REVIEW_RECEIVED = "reviews_received", "Review received"
+    DEADLINE_MISSED = "deadlines_missed", "Deadline missed"
+
+
+class NotificationMode(models.TextChoices):
+    """
+    How review notifications are delivered to a Telegram user.
+
+    Attributes:
+        immediate (NotificationMode Enumeration): A message after every approvals run.
+        hourly (NotificationMode Enumeration): One digest per hour.
+        daily (NotificationMode Enumeration): One digest per day.
+    """
+
+    IMMEDIATE = "immediate", "Immediate"
+    HOURLY = "hourly", "Hourly digest"
+    DAILY = "daily", "Daily digest"
+
+
+class HistoryKind(models.TextChoices):
+    """
+    Kinds of entries of the issue history.
+
+    Attributes:
+        assigned (HistoryKind Enumeration): An issue was assigned to a contributor.
+        pull_request (HistoryKind Enumeration): A contributor opened a pull request.
+        closed (HistoryKind Enumeration): An issue was closed.
+    """
+
+    ASSIGNED = "assigned", "Assigned"
+    PULL_REQUEST = "pull_request", "Pull request opened"
+    CLOSED = "closed", "Closed"
@@ -0,0 +1,65 @@
+from typing import Any
+
+import msgspec
+from django.http import HttpResponse
+from kombu.serialization import register
+
+CELERY_SERIALIZER = "msgspec"
+CELERY_CONTENT_TYPE = "application/x-msgspec-json"
+
+_encoder = msgspec.json.Encoder()
+_decoder = msgspec.json.Decoder()
+
+
+def encode(data: Any) -> bytes:
+    """
+    Encodes data to JSON, including records, datetimes and UUIDs.
+    :param data: Any
+    :return: bytes
+    """
+    return _encoder.encode(data)
+
+
+def decode(data: bytes | str) -> Any:
+    """
+    Decodes JSON into plain Python objects.
+    :param data: bytes or str
+    :return: Any
+    """
+    return _decoder.decode(data)
+
+
+def register_celery_serializer() -> None:
+    """
+    Registers the codec as a kombu serializer, so tasks can pass records
+    around. Records arrive at the worker as plain dicts of their fields.
+    :return: None
+    """
+    register(
+        CELERY_SERIALIZER,
+        encode,
+        decode,
+        content_type=CELERY_CONTENT_TYPE,
+        content_encoding="utf-8",
+    )
+
+
+class JsonResponse(HttpResponse):
+    """
+    A drop-in replacement of `django.http.JsonResponse` encoding with the codec.
+    """
+
+    def __init__(self, data: Any, safe: bool = True, **kwargs) -> None:
+        """
+        :param data: data to encode
+        :param safe: only allow dicts, like `django.http.JsonResponse`
+        :param kwargs: passed on to HttpResponse
+        """
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                "In order to allow non-dict objects to be serialized set the "
+                "safe parameter to False."
+            )
+
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=encode(data), **kwargs)
@@ -0,0 +1,99 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+_executor = None
+
+
+def configure_database_executor(max_workers: int) -> None:
+    """
+    Creates the executor used by `database_sync_to_async` in this process.
+    Without it database calls fall back to the thread-sensitive default.
+    :param max_workers: maximal amount of concurrent database calls
+    :return: None
+    """
+    global _executor
+
+    _executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="database"
+    )
+
+
+def _release_connections(func: Callable) -> Callable:
+    """
+    Wraps a function so stale connections are dropped before it runs and its
+    connection goes back to the pool afterwards.
+    :param func: a blocking function using the ORM
+    :return: Callable
+    """
+
+    @functools.wraps(func)
+    def inner(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return inner
+
+
+def database_sync_to_async(func: Callable) -> Callable:
+    """
+    Like `sync_to_async`, but runs ORM calls of different callers in parallel
+    on the executor set up by `configure_database_executor`.
+    :param func: a blocking function using the ORM
+    :return: an async function
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if _executor is None:
+            return await sync_to_async(func)(*args, **kwargs)
+
+        return await sync_to_async(
+            _release_connections(func), thread_sensitive=False, executor=_executor
+        )(*args, **kwargs)
+
+    return wrapper
+
+
+def get_pool_stats(alias: str = DEFAULT_DB_ALIAS) -> dict:
+    """
+    Returns the usage statistics of the connection pool of this process.
+    :param alias: database alias
+    :return: dict, empty if the database is not pooled
+    """
+    pool = getattr(connections[alias], "pool", None)
+
+    return pool.get_stats() if pool else {}
+
+
+def check_database(alias: str = DEFAULT_DB_ALIAS) -> None:
+    """
+    Runs a trivial query to make sure the database is reachable.
+    :param alias: database alias
+    :raises DatabaseError: If the database is not reachable.
+    :return: None
+    """
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+async def log_pool_stats(interval: int) -> None:
+    """
+    Logs the pool statistics every `interval` seconds until cancelled.
+    :param interval: seconds between two reports
+    :return: None
+    """
+    while True:
+        await asyncio.sleep(interval)
+        logger.info("Database pool stats: %s", await sync_to_async(get_pool_stats)())
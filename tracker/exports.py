@@ -0,0 +1,211 @@
+import csv
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import QuerySet
+from django.http import HttpRequest, StreamingHttpResponse
+
+from .codec import encode
+from .issues import issues_listing_url
+from .resilience import stale_since
+from .utils import get_assignments, is_deadline_missed
+from .values import PULLS_URL
+
+EXPORT_COLUMNS = (
+    "repository",
+    "number",
+    "title",
+    "url",
+    "assignee",
+    "assigned_at",
+    "days",
+    "has_pull_request",
+    "missed_deadline",
+    "stale",
+)
+EXPORT_FORMATS = {"csv": "text/csv", "json": "application/json"}
+REPOSITORY_FIELDS = ("author", "name", "labels", "milestone")
+
+
+class Echo:
+    """
+    A file-like object returning what is written, so `csv.writer` renders
+    rows one at a time instead of into a buffer.
+    """
+
+    def write(self, value: str) -> str:
+        """
+        Returns the written value.
+        :param value: str
+        :return: str
+        """
+        return value
+
+
+def repository_values(queryset: QuerySet) -> QuerySet:
+    """
+    Returns the repositories of a queryset as dicts of the filter fields.
+    :param queryset: Repository queryset
+    :return: QuerySet of repository dicts
+    """
+    return queryset.order_by("created_at").values(*REPOSITORY_FIELDS)
+
+
+def iter_repositories(queryset: QuerySet) -> Iterator[dict]:
+    """
+    Reads repositories in chunks of `settings.EXPORT_CHUNK_SIZE` rows.
+    :param queryset: Repository queryset
+    :return: iterator of repository dicts
+    """
+    return repository_values(queryset).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+
+def repository_rows(repository: dict) -> list[dict]:
+    """
+    Returns a row for every open assigned issue of a repository, computed
+    like the missed deadlines report.
+    :param repository: repository dict with the filter fields
+    :return: rows with the EXPORT_COLUMNS keys
+    """
+    label = f"{repository['author']}/{repository['name']}"
+    assignments = get_assignments(
+        issues_url=issues_listing_url(repository, assigned=True),
+        pull_requests_url=PULLS_URL.format(
+            owner=repository["author"], repo=repository["name"]
+        ),
+    )
+    stale = stale_since(assignments) is not None
+
+    return [
+        {
+            "repository": label,
+            "number": issue.number,
+            "title": issue.title,
+            "url": issue.html_url,
+            "assignee": issue.assignee_login,
+            "assigned_at": issue.assigned_at,
+            "days": issue.days,
+            "has_pull_request": has_pull_request,
+            "missed_deadline": is_deadline_missed(issue, has_pull_request),
+            "stale": stale,
+        }
+        for issue, has_pull_request in assignments
+    ]
+
+
+def iter_report_rows(repositories: Iterable[dict]) -> Iterator[dict]:
+    """
+    Yields the rows of every repository. Only the issues of one repository
+    are held in memory at a time.
+
+    :param repositories: repository dicts with the filter fields
+    :return: iterator of rows with the EXPORT_COLUMNS keys
+    """
+    for repository in repositories:
+        yield from repository_rows(repository)
+
+
+async def aiter_report_rows(queryset: QuerySet) -> AsyncIterator[dict]:
+    """
+    Yields the rows of every repository of a queryset without blocking the
+    event loop: repositories are read in chunks and the rows of each one
+    are computed in a worker thread, one repository at a time.
+
+    :param queryset: Repository queryset
+    :return: async iterator of rows with the EXPORT_COLUMNS keys
+    """
+    async for repository in repository_values(queryset).aiterator(
+        chunk_size=settings.EXPORT_CHUNK_SIZE
+    ):
+        for row in await sync_to_async(repository_rows)(repository):
+            yield row
+
+
+def iter_csv(rows: Iterable[dict]) -> Iterator[str]:
+    """
+    Renders rows as CSV lines, the header first.
+    :param rows: rows with the EXPORT_COLUMNS keys
+    :return: iterator of CSV lines
+    """
+    writer = csv.DictWriter(Echo(), fieldnames=EXPORT_COLUMNS)
+
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_json(rows: Iterable[dict]) -> Iterator[bytes]:
+    """
+    Renders rows as a JSON array, one element at a time.
+    :param rows: rows with the EXPORT_COLUMNS keys
+    :return: iterator of JSON fragments
+    """
+    separator = b"["
+
+    for row in rows:
+        yield separator + encode(row)
+        separator = b","
+
+    yield b"]" if separator == b"," else b"[]"
+
+
+async def aiter_csv(rows: AsyncIterable[dict]) -> AsyncIterator[str]:
+    """
+    Renders rows as CSV lines, the header first.
+    :param rows: rows with the EXPORT_COLUMNS keys
+    :return: async iterator of CSV lines
+    """
+    writer = csv.DictWriter(Echo(), fieldnames=EXPORT_COLUMNS)
+
+    yield writer.writeheader()
+    async for row in rows:
+        yield writer.writerow(row)
+
+
+async def aiter_json(rows: AsyncIterable[dict]) -> AsyncIterator[bytes]:
+    """
+    Renders rows as a JSON array, one element at a time.
+    :param rows: rows with the EXPORT_COLUMNS keys
+    :return: async iterator of JSON fragments
+    """
+    separator = b"["
+
+    async for row in rows:
+        yield separator + encode(row)
+        separator = b","
+
+    yield b"]" if separator == b"," else b"[]"
+
+
+def export_response(
+    request: HttpRequest, queryset: QuerySet, export_format: str
+) -> StreamingHttpResponse:
+    """
+    Streams the assignments report of repositories as a file download.
+
+    Django consumes a synchronous iterator entirely before serving it under
+    ASGI, and an asynchronous one under WSGI, so the content is produced
+    by the iterator kind of the server the request came through.
+
+    :param request: HttpRequest
+    :param queryset: Repository queryset
+    :param export_format: "csv" or "json"
+    :return: StreamingHttpResponse
+    """
+    if isinstance(request, ASGIRequest):
+        rows = aiter_report_rows(queryset)
+        content = aiter_csv(rows) if export_format == "csv" else aiter_json(rows)
+    else:
+        rows = iter_report_rows(iter_repositories(queryset))
+        content = iter_csv(rows) if export_format == "csv" else iter_json(rows)
+
+    response = StreamingHttpResponse(
+        content, content_type=EXPORT_FORMATS[export_format]
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="assignments.{export_format}"'
+    )
+
+    return response
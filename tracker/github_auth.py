@@ -0,0 +1,319 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+from urllib.parse import urlsplit
+
+import redis
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from .codec import decode, encode
+from .popularity import get_redis
+from .values import DATETIME_FORMAT, GITHUB_API_URL, HEADERS
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+INSTALLATIONS_URL = f"{GITHUB_API_URL}/app/installations"
+ACCESS_TOKENS_URL = (
+    f"{GITHUB_API_URL}/app/installations/{{installation_id}}/access_tokens"
+)
+TOKEN_CACHE_KEY = "github_token:{installation_id}"
+USAGE_KEY = "github:usage"
+FALLBACK_LABEL = "token"
+RATE_LIMIT_HEADERS = {
+    "limit": "X-RateLimit-Limit",
+    "remaining": "X-RateLimit-Remaining",
+    "used": "X-RateLimit-Used",
+    "reset": "X-RateLimit-Reset",
+}
+
+_usage = dict()
+
+
+def owner_from_url(url: str) -> str:
+    """
+    Returns the lowercased owner of the repository an API URL belongs to.
+    :param url: a GitHub API URL
+    :return: the owner, an empty string for non-repository URLs
+    """
+    parts = urlsplit(url).path.split("/")
+    return parts[2].lower() if len(parts) > 2 and parts[1] == "repos" else str()
+
+
+@dataclass
+class InstallationToken:
+    """
+    An access token of a GitHub App installation.
+
+    Attributes:
+    - token (str): The token sent as a Bearer credential.
+    - expires_at (float): The expiry as a unix timestamp.
+    """
+
+    token: str
+    expires_at: float
+
+    def is_fresh(self) -> bool:
+        """
+        Checks the token stays valid longer than the refresh margin.
+        :return: bool
+        """
+        return self.expires_at - settings.GITHUB_APP_TOKEN_REFRESH_MARGIN > time.time()
+
+
+class InstallationTokenPool:
+    """
+    Mints installation tokens of a GitHub App, one per account it is
+    installed on, and refreshes them before they expire.
+
+    Tokens are shared between processes through the Django cache, so each
+    installation token is minted once per refresh, not once per worker.
+    Minting locks only its own installation, so a slow GitHub call does
+    not hold up the token lookups of other accounts.
+    """
+
+    def __init__(self, app_id: str, private_key: str) -> None:
+        self.app_id = app_id
+        self.private_key = private_key
+        self.installations = dict()
+        self.installations_loaded_at = 0.0
+        self.tokens = dict()
+        self.lock = threading.Lock()
+        self.installations_lock = threading.Lock()
+        self.token_locks = dict()
+        self.http = requests.Session()
+        self.http.headers.update(HEADERS)
+
+    def app_headers(self) -> dict:
+        """
+        Returns the headers authenticating as the App itself with a short-lived JWT.
+        :return: dict
+        """
+        import jwt
+
+        now = int(time.time())
+        app_jwt = jwt.encode(
+            {"iat": now - 60, "exp": now + 540, "iss": str(self.app_id)},
+            self.private_key,
+            algorithm="RS256",
+        )
+        return {"Authorization": f"Bearer {app_jwt}"}
+
+    def load_installations(self) -> None:
+        """
+        Loads the accounts the App is installed on.
+        :return: None
+        """
+        installations = dict()
+        url = f"{INSTALLATIONS_URL}?per_page=100"
+
+        while url:
+            response = self.http.get(
+                url,
+                headers=self.app_headers(),
+                timeout=settings.GITHUB_REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
+
+            for installation in response.json():
+                login = installation.get("account", dict()).get("login", str())
+                installations[login.lower()] = installation["id"]
+
+            url = response.links.get("next", dict()).get("url")
+
+        self.installations = installations
+
+    def installation_for(self, owner: str) -> int | None:
+        """
+        Returns the installation of an account, reloading the installations
+        every `settings.GITHUB_APP_INSTALLATIONS_TTL` seconds. A failed load
+        is retried on the next lookup.
+        :param owner: lowercased account login
+        :raises RequestException: If loading the installations fails.
+        :return: the installation id or None if the App is not installed there
+        """
+        if self.installations_expired():
+            with self.installations_lock:
+                if self.installations_expired():
+                    self.load_installations()
+                    self.installations_loaded_at = time.time()
+
+        return self.installations.get(owner)
+
+    def installations_expired(self) -> bool:
+        """
+        Checks the installations are due for a reload.
+        :return: bool
+        """
+        return (
+            time.time() - self.installations_loaded_at
+            > settings.GITHUB_APP_INSTALLATIONS_TTL
+        )
+
+    def token_lock(self, installation_id: int) -> threading.Lock:
+        """
+        Returns the lock serializing the minting of an installation's tokens.
+        :param installation_id: int
+        :return: threading.Lock
+        """
+        with self.lock:
+            return self.token_locks.setdefault(installation_id, threading.Lock())
+
+    def mint_token(self, installation_id: int) -> InstallationToken:
+        """
+        Creates a new access token of an installation.
+        :param installation_id: int
+        :return: InstallationToken
+        """
+        response = self.http.post(
+            ACCESS_TOKENS_URL.format(installation_id=installation_id),
+            headers=self.app_headers(),
+            timeout=settings.GITHUB_REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        expires_at = datetime.strptime(data["expires_at"], DATETIME_FORMAT)
+        return InstallationToken(
+            token=data["token"],
+            expires_at=expires_at.replace(tzinfo=timezone.utc).timestamp(),
+        )
+
+    def token_for(self, owner: str) -> str | None:
+        """
+        Returns a fresh installation token for the repositories of an account.
+        :param owner: lowercased account login
+        :return: the token or None if there is no usable installation
+        """
+        try:
+            installation_id = self.installation_for(owner)
+            if installation_id is None:
+                return None
+
+            token = self.tokens.get(installation_id)
+            if token is None or not token.is_fresh():
+                with self.token_lock(installation_id):
+                    token = self.tokens.get(installation_id)
+                    if token is None or not token.is_fresh():
+                        token = self.load_token(installation_id)
+                        self.tokens[installation_id] = token
+
+            return token.token
+
+        except requests.exceptions.RequestException as e:
+            logger.info(e)
+        return None
+
+    def load_token(self, installation_id: int) -> InstallationToken:
+        """
+        Returns the token shared through the cache, minting a new one if it
+        is missing or about to expire.
+        :param installation_id: int
+        :return: InstallationToken
+        """
+        cache_key = TOKEN_CACHE_KEY.format(installation_id=installation_id)
+        token = cache.get(cache_key)
+
+        if token is None or not token.is_fresh():
+            token = self.mint_token(installation_id)
+            cache.set(
+                cache_key,
+                token,
+                timeout=int(
+                    token.expires_at
+                    - settings.GITHUB_APP_TOKEN_REFRESH_MARGIN
+                    - time.time()
+                ),
+            )
+
+        return token
+
+
+class GitHubAuth(requests.auth.AuthBase):
+    """
+    Authenticates every request with the token owning its repository:
+    the installation token of the repository owner if the GitHub App is
+    installed there, the single `GITHUB_AUTH_TOKEN` otherwise.
+    The rate limit usage GitHub reports is recorded per token.
+    """
+
+    def __init__(self, pool: InstallationTokenPool | None, token: str | None) -> None:
+        self.pool = pool
+        self.token = token
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        owner = owner_from_url(request.url)
+        token = self.pool.token_for(owner) if self.pool and owner else None
+        label = f"installation:{owner}" if token else FALLBACK_LABEL
+        token = token or self.token
+
+        if token:
+            request.headers["Authorization"] = f"Bearer {token}"
+        request.register_hook("response", partial(record_usage, label))
+
+        return request
+
+
+def get_auth() -> GitHubAuth:
+    """
+    Builds the authentication of the GitHub session from the settings.
+    The App is only used when both its id and private key are configured.
+    :return: GitHubAuth
+    """
+    pool = (
+        InstallationTokenPool(settings.GITHUB_APP_ID, settings.GITHUB_APP_PRIVATE_KEY)
+        if settings.GITHUB_APP_ID and settings.GITHUB_APP_PRIVATE_KEY
+        else None
+    )
+    return GitHubAuth(pool, settings.GITHUB_AUTH_TOKEN)
+
+
+def record_usage(label: str, response: requests.Response, *args, **kwargs) -> None:
+    """
+    Stores the rate limit usage GitHub reported for a token.
+    :param label: the token label, e.g. 'installation:owner'
+    :param response: requests.Response
+    :return: None
+    """
+    if RATE_LIMIT_HEADERS["remaining"] not in response.headers:
+        return
+
+    usage = {
+        name: int(response.headers.get(header, 0))
+        for name, header in RATE_LIMIT_HEADERS.items()
+    }
+    _usage[label] = usage
+
+    client = get_redis()
+    if client is None:
+        return
+
+    try:
+        client.hset(USAGE_KEY, label, encode(usage))
+    except redis.RedisError as e:
+        logger.info(e)
+
+
+def get_token_usage() -> dict[str, dict]:
+    """
+    Returns the last reported rate limit usage of every token, shared
+    between processes through Redis when it is configured.
+    :return: dict of token label to usage
+    """
+    client = get_redis()
+    if client is None:
+        return dict(_usage)
+
+    try:
+        return {
+            label.decode(): decode(usage)
+            for label, usage in client.hgetall(USAGE_KEY).items()
+        }
+    except redis.RedisError as e:
+        logger.info(e)
+    return dict(_usage)
@@ -0,0 +1,223 @@
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+
+from .choices import HistoryKind
+from .db import database_sync_to_async
+from .models import IssueHistory, TrackedRepository
+from .values import DATETIME_FORMAT, STATS_PERIODS
+
+STATS_CACHE_KEY = "stats:{period}"
+
+
+def history_entry(
+    tracked_id: str, number: int, kind: str, login: str, occurred_at: str | None
+) -> IssueHistory | None:
+    """
+    Builds a history entry from GitHub data.
+    :param tracked_id: the id of the TrackedRepository
+    :param number: the number of the issue or pull request
+    :param kind: HistoryKind
+    :param login: the assignee or the pull request author
+    :param occurred_at: a GitHub timestamp
+    :return: IssueHistory, None if the time is unknown
+    """
+    if not occurred_at:
+        return None
+
+    return IssueHistory(
+        tracked_id=tracked_id,
+        number=number,
+        kind=kind,
+        login=login,
+        occurred_at=datetime.strptime(occurred_at, DATETIME_FORMAT).replace(
+            tzinfo=timezone.utc
+        ),
+    )
+
+
+def record_history(entries: list[IssueHistory | None]) -> None:
+    """
+    Appends entries to the issue history in one query, skipping the known ones.
+    :param entries: IssueHistory entries, None entries are skipped
+    :return: None
+    """
+    IssueHistory.objects.bulk_create(
+        [entry for entry in entries if entry is not None], ignore_conflicts=True
+    )
+
+
+def percentile(values: list[float], fraction: float) -> float | None:
+    """
+    Returns a percentile of sorted values, interpolating between ranks.
+    :param values: sorted values
+    :param fraction: e.g. 0.9 for the 90th percentile
+    :return: float, None without values
+    """
+    if not values:
+        return None
+
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def first_after(times: list[datetime], moment: datetime) -> datetime | None:
+    """
+    Returns the first of sorted times at or after a moment.
+    :param times: sorted times
+    :param moment: datetime
+    :return: datetime or None
+    """
+    index = bisect_left(times, moment)
+    return times[index] if index < len(times) else None
+
+
+def summarize(samples: dict[str, list]) -> dict:
+    """
+    Aggregates the samples of a repository or contributor.
+    :param samples: dict with "time_to_pr", "time_to_close" and "hits" lists
+    :return: dict of the aggregates, times in seconds
+    """
+    time_to_pr = sorted(samples["time_to_pr"])
+    time_to_close = sorted(samples["time_to_close"])
+    hits = samples["hits"]
+
+    return {
+        "assignments": samples["assignments"],
+        "p50_time_to_pr": percentile(time_to_pr, 0.5),
+        "p90_time_to_pr": percentile(time_to_pr, 0.9),
+        "p50_time_to_close": percentile(time_to_close, 0.5),
+        "p90_time_to_close": percentile(time_to_close, 0.9),
+        "deadline_hit_rate": sum(hits) / len(hits) if hits else None,
+    }
+
+
+def compute_stats(since: datetime, now: datetime) -> dict:
+    """
+    Computes the time to the first pull request, the time to close and the
+    deadline hit rate of the assignments made since a moment, per repository
+    and per contributor.
+
+    The history is read in a single ordered query and the entries are
+    matched with binary searches, so the cost grows with the number of
+    entries, not with the number of repositories.
+
+    A pull request counts for an assignment when it is opened by the
+    assignee in the same repository after the assignment. The deadline is
+    the most lenient time limit of the repository subscribers.
+
+    :param since: the start of the period
+    :param now: the end of the period
+    :return: dict with "repositories" (by tracked id) and "contributors" (by login)
+    """
+    repositories = {
+        str(tracked_id): (f"{author}/{name}", limit)
+        for tracked_id, author, name, limit in TrackedRepository.objects.annotate(
+            limit=Max("subscriptions__time_limit")
+        ).values_list("id", "author", "name", "limit")
+    }
+
+    assignments = list()
+    pull_requests = defaultdict(list)
+    closes = defaultdict(list)
+
+    entries = (
+        IssueHistory.objects.filter(occurred_at__gte=since, occurred_at__lte=now)
+        .order_by("occurred_at")
+        .values_list("tracked_id", "number", "kind", "login", "occurred_at")
+    )
+    for tracked_id, number, kind, login, occurred_at in entries.iterator():
+        tracked_id = str(tracked_id)
+
+        if kind == HistoryKind.ASSIGNED:
+            assignments.append((tracked_id, number, login, occurred_at))
+        elif kind == HistoryKind.PULL_REQUEST:
+            pull_requests[(tracked_id, login)].append(occurred_at)
+        else:
+            closes[(tracked_id, number)].append(occurred_at)
+
+    groups = {"repositories": dict(), "contributors": dict()}
+
+    for tracked_id, number, login, assigned_at in assignments:
+        pull_request_at = first_after(pull_requests[(tracked_id, login)], assigned_at)
+        closed_at = first_after(closes[(tracked_id, number)], assigned_at)
+
+        label, limit = repositories.get(tracked_id, (tracked_id, None))
+        deadline = assigned_at + timedelta(seconds=limit) if limit else None
+
+        hit = None
+        if deadline and closed_at:
+            hit = closed_at <= deadline
+        elif deadline and now > deadline:
+            hit = False
+
+        for scope, key in (("repositories", tracked_id), ("contributors", login)):
+            samples = groups[scope].setdefault(
+                key,
+                {"assignments": 0, "time_to_pr": [], "time_to_close": [], "hits": []},
+            )
+            samples["assignments"] += 1
+
+            if pull_request_at:
+                samples["time_to_pr"].append(
+                    (pull_request_at - assigned_at).total_seconds()
+                )
+            if closed_at:
+                samples["time_to_close"].append(
+                    (closed_at - assigned_at).total_seconds()
+                )
+            if hit is not None:
+                samples["hits"].append(hit)
+
+    return {
+        "repositories": {
+            tracked_id: {"label": repositories.get(tracked_id, (tracked_id,))[0]}
+            | summarize(samples)
+            for tracked_id, samples in groups["repositories"].items()
+        },
+        "contributors": {
+            login: summarize(samples)
+            for login, samples in groups["contributors"].items()
+        },
+    }
+
+
+def refresh_stats(period: str) -> dict:
+    """
+    Computes the statistics of a period and caches them for
+    `settings.STATS_CACHE_TTL` seconds.
+    :param period: a key of STATS_PERIODS
+    :return: the statistics
+    """
+    now = datetime.now(timezone.utc)
+    stats = compute_stats(now - timedelta(days=STATS_PERIODS[period]), now)
+    cache.set(STATS_CACHE_KEY.format(period=period), stats, settings.STATS_CACHE_TTL)
+
+    return stats
+
+
+def get_period_stats(period: str) -> dict:
+    """
+    Returns the cached statistics of a period, computing them on a miss.
+    Only the database is read, never GitHub.
+    :param period: a key of STATS_PERIODS
+    :return: the statistics
+    """
+    return cache.get(STATS_CACHE_KEY.format(period=period)) or refresh_stats(period)
+
+
+@database_sync_to_async
+def get_stats(period: str) -> dict:
+    """
+    Returns the statistics of a period asynchronously.
+    :param period: a key of STATS_PERIODS
+    :return: the statistics
+    """
+    return get_period_stats(period)
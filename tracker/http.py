@@ -0,0 +1,190 @@
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from .github_auth import get_auth
+from .resilience import (
+    IDEMPOTENT_METHODS,
+    CircuitOpenError,
+    DeadlineExceeded,
+    backoff_delay,
+    endpoint_class,
+    get_breaker,
+    is_failure,
+    retry_after,
+)
+from .values import HEADERS
+
+_lock = threading.Lock()
+_session = None
+_session_pid = None
+_deadline = contextvars.ContextVar("github_deadline", default=None)
+
+
+@contextmanager
+def request_deadline(deadline: float):
+    """
+    Bounds the GitHub requests sent within the block, including their
+    retries, by a `time.monotonic()` deadline.
+    :param deadline: the monotonic time the requests must be done by
+    :return: None
+    """
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_left() -> float | None:
+    """
+    Returns the seconds left until the deadline of the current context.
+    :return: float, None without a deadline
+    """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def within_deadline(timeout):
+    """
+    Caps the timeout of a request to the time left until the deadline.
+    :param timeout: the requests timeout, a number, a tuple or None
+    :return: the capped timeout
+    """
+    left = time_left()
+    if left is None:
+        return timeout
+
+    left = max(left, 0.001)
+    if timeout is None:
+        return left
+    if isinstance(timeout, tuple):
+        return tuple(left if part is None else min(part, left) for part in timeout)
+    return min(timeout, left)
+
+
+def may_retry(attempt: int, attempts: int, delay: float | None) -> bool:
+    """
+    Checks a failed attempt may be retried after waiting `delay` seconds.
+    :param attempt: the index of the failed attempt
+    :param attempts: the amount of attempts allowed
+    :param delay: the backoff delay, None if the request must not be retried
+    :return: bool
+    """
+    left = time_left()
+    return (
+        attempt + 1 < attempts and delay is not None and (left is None or delay < left)
+    )
+
+
+class GitHubSession(requests.Session):
+    """
+    A pooled keep-alive session for the GitHub API.
+
+    Every request gets `settings.GITHUB_REQUEST_TIMEOUT` unless the caller
+    passes its own timeout, so a hung socket cannot block a worker forever.
+    Requests are authenticated by the token owning their repository.
+
+    Idempotent requests failing on a network error, a 5xx or a rate limit
+    are retried up to `settings.GITHUB_MAX_RETRIES` times with a jittered
+    exponential backoff. Calls of an endpoint class that keeps failing are
+    rejected by its circuit breaker with `CircuitOpenError`. Any other error
+    raised while sending counts as a failed call, so a trial call cannot
+    leave its circuit probing forever.
+
+    Within `request_deadline`, timeouts and retries are cut short to the
+    deadline and later requests raise `DeadlineExceeded`.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.auth = get_auth()
+        self.headers.update(HEADERS)
+        self.headers.update({"Accept-Encoding": "gzip, deflate"})
+
+        adapter = HTTPAdapter(
+            pool_connections=settings.GITHUB_POOL_CONNECTIONS,
+            pool_maxsize=settings.GITHUB_POOL_SIZE,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method: str, url: str, *args, **kwargs) -> requests.Response:
+        """
+        Sends a request applying the default timeout, the retries and the
+        circuit breaker of its endpoint class.
+        :param method: HTTP method
+        :param url: URL of the request
+        :raises CircuitOpenError: If the circuit of the endpoint class is open.
+        :raises DeadlineExceeded: If the deadline of the context has passed.
+        :return: requests.Response
+        """
+        timeout = kwargs.pop(
+            "timeout",
+            (settings.GITHUB_CONNECT_TIMEOUT, settings.GITHUB_REQUEST_TIMEOUT),
+        )
+
+        left = time_left()
+        if left is not None and left <= 0:
+            raise DeadlineExceeded(f"The deadline passed before requesting {url}.")
+
+        breaker = get_breaker(endpoint_class(url))
+        if not breaker.allow():
+            raise CircuitOpenError(f"The circuit of GitHub {breaker.name} is open.")
+
+        attempts = 1
+        if method.upper() in IDEMPOTENT_METHODS:
+            attempts += settings.GITHUB_MAX_RETRIES
+
+        for attempt in range(attempts):
+            try:
+                response = super().request(
+                    method, url, *args, timeout=within_deadline(timeout), **kwargs
+                )
+
+            except (requests.ConnectionError, requests.Timeout):
+                delay = backoff_delay(attempt)
+                if not may_retry(attempt, attempts, delay):
+                    breaker.record_failure()
+                    raise
+
+                time.sleep(delay)
+                continue
+
+            except Exception:
+                breaker.record_failure()
+                raise
+
+            if not is_failure(response):
+                breaker.record_success()
+                return response
+
+            delay = backoff_delay(attempt, retry_after(response))
+            if not may_retry(attempt, attempts, delay):
+                breaker.record_failure()
+                return response
+
+            time.sleep(delay)
+
+
+def get_session() -> GitHubSession:
+    """
+    Returns the process-wide GitHub session.
+    The session is created lazily and recreated after a fork, so prefork
+    Celery and gunicorn workers never share sockets with their parent.
+    :return: GitHubSession
+    """
+    global _session, _session_pid
+
+    if _session is None or _session_pid != os.getpid():
+        with _lock:
+            if _session is None or _session_pid != os.getpid():
+                _session, _session_pid = GitHubSession(), os.getpid()
+
+    return _session
@@ -0,0 +1,220 @@
+import hashlib
+import logging
+import re
+import time
+from dataclasses import dataclass, field, replace
+from urllib.parse import urlencode
+
+import msgspec
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from kombu.exceptions import OperationalError
+
+from .http import get_session
+from .popularity import record_request
+from .records import ISSUES_DECODER, Issue
+from .values import DEFAULT_ISSUES_LABEL, ISSUES_URL, MILESTONE_PATTERN
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+ISSUES_CACHE_KEY = "issues:{digest}"
+ISSUES_REFRESH_LOCK_KEY = "issues_refresh:{digest}"
+
+
+def url_digest(url: str) -> str:
+    """
+    Returns a short stable digest of a URL to be used in cache keys.
+    :param url: str
+    :return: str
+    """
+    return hashlib.md5(url.encode()).hexdigest()
+
+
+def issues_cache_key(url: str) -> str:
+    """
+    Returns the cache key of a classified issues listing.
+    :param url: The API endpoint for issues.
+    :return: str
+    """
+    return ISSUES_CACHE_KEY.format(digest=url_digest(url))
+
+
+def issues_listing_url(repository: dict, assigned: bool) -> str:
+    """
+    Returns the issues endpoint of a repository with its filters translated
+    into GitHub query parameters, so GitHub only returns relevant issues.
+
+    Every report asks for the assigned or the unassigned issues only, so
+    each kind has its own listing, shared by the reports using it.
+    Milestones that GitHub would reject are left out.
+
+    :param repository: dict with "author", "name" and the filter fields
+    :param assigned: list the assigned issues, the unassigned ones otherwise
+    :return: str
+    """
+    params = {"state": "open"}
+
+    labels = [
+        label.strip()
+        for label in repository.get("labels", str()).split(",")
+        if label.strip()
+    ]
+    if labels:
+        params["labels"] = ",".join(labels)
+
+    milestone = repository.get("milestone") or str()
+    if re.fullmatch(MILESTONE_PATTERN, milestone):
+        params["milestone"] = milestone
+
+    params["assignee"] = "*" if assigned else "none"
+
+    url = ISSUES_URL.format(
+        owner=repository.get("author", str()), repo=repository.get("name", str())
+    )
+
+    return f"{url}?{urlencode(params)}"
+
+
+@dataclass
+class IssueBuckets:
+    """
+    Issues of a repository classified in a single pass.
+
+    Attributes:
+    - available (list[Issue]): Open issues nobody is assigned to.
+    - assigned (list[Issue]): Open issues with an assignee.
+    - draft (list[Issue]): Draft items.
+    - pull_requests (list[Issue]): Items backed by a pull request.
+    - stale (bool): The buckets are the last known listing, served because
+      GitHub is failing.
+    - fetched_at (float): When a stale listing was fetched, 0 if never.
+    """
+
+    available: list[Issue] = field(default_factory=list)
+    assigned: list[Issue] = field(default_factory=list)
+    draft: list[Issue] = field(default_factory=list)
+    pull_requests: list[Issue] = field(default_factory=list)
+    stale: bool = False
+    fetched_at: float = 0.0
+
+
+def classify_issues(issues: list[Issue]) -> IssueBuckets:
+    """
+    Sorts issues into buckets in a single pass.
+    :param issues: issues decoded from the GitHub issues endpoint
+    :return: IssueBuckets
+    """
+    buckets = IssueBuckets()
+
+    for issue in issues:
+        if issue.pull_request:
+            buckets.pull_requests.append(issue)
+        elif issue.draft:
+            buckets.draft.append(issue)
+        elif issue.state != "open":
+            continue
+        elif issue.assignee:
+            buckets.assigned.append(issue)
+        else:
+            buckets.available.append(issue)
+
+    return buckets
+
+
+def get_classified_issues(url: str) -> IssueBuckets:
+    """
+    Returns the classified issues of a repository, fetching the listing at
+    most once per `settings.ISSUES_CACHE_TTL` seconds for every report.
+
+    Stale entries, up to `settings.ISSUES_STALE_TTL` seconds old, are served
+    immediately while a background task refreshes them. Only a cold cache
+    or an older entry waits for GitHub.
+
+    :param url: The API endpoint for issues.
+    :return: IssueBuckets
+    """
+    record_request(url)
+    entry = cache.get(issues_cache_key(url))
+
+    if entry is None or time.time() - entry["fetched_at"] > settings.ISSUES_STALE_TTL:
+        return refresh_classified_issues(url)
+
+    if time.time() - entry["fetched_at"] > settings.ISSUES_CACHE_TTL:
+        schedule_refresh(url)
+
+    return entry["buckets"]
+
+
+def refresh_classified_issues(url: str) -> IssueBuckets:
+    """
+    Fetches and classifies the issues listing and stores it in the cache.
+    The listing is kept for `settings.GITHUB_LAST_GOOD_TTL` seconds, so if
+    the request fails, the last known buckets are returned marked as stale,
+    or empty stale buckets if there are none.
+
+    :param url: The API endpoint for issues.
+    :return: IssueBuckets
+    """
+    try:
+        response = get_session().get(url, params={"per_page": 100})
+        response.raise_for_status()
+
+        buckets = classify_issues(ISSUES_DECODER.decode(response.content))
+        cache.set(
+            issues_cache_key(url),
+            {"buckets": buckets, "fetched_at": time.time()},
+            timeout=max(settings.GITHUB_LAST_GOOD_TTL, settings.ISSUES_STALE_TTL),
+        )
+
+        return buckets
+
+    except (requests.exceptions.RequestException, msgspec.DecodeError) as e:
+        logger.info(e)
+
+    entry = cache.get(issues_cache_key(url))
+    if entry is None:
+        return IssueBuckets(stale=True)
+
+    return replace(entry["buckets"], stale=True, fetched_at=entry["fetched_at"])
+
+
+def schedule_refresh(url: str) -> None:
+    """
+    Queues a background refresh of a listing unless one is already queued.
+    :param url: The API endpoint for issues.
+    :return: None
+    """
+    if not cache.add(
+        ISSUES_REFRESH_LOCK_KEY.format(digest=url_digest(url)),
+        True,
+        timeout=settings.ISSUES_CACHE_TTL,
+    ):
+        return
+
+    from .tasks import refresh_repository_issues
+
+    try:
+        refresh_repository_issues.delay(url)
+    except OperationalError as e:
+        logger.info(e)
+
+
+def issues_cache_age(url: str) -> float | None:
+    """
+    Returns the age of the cached listing in seconds, None if it is not cached.
+    :param url: The API endpoint for issues.
+    :return: float or None
+    """
+    entry = cache.get(issues_cache_key(url))
+    return time.time() - entry["fetched_at"] if entry else None
+
+
+def evict_issues(url: str) -> None:
+    """
+    Drops the cached listing of a repository.
+    :param url: The API endpoint for issues.
+    :return: None
+    """
+    cache.delete(issues_cache_key(url))
@@ -0,0 +1,263 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+import msgspec
+import requests
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from .choices import ActivityKind, HistoryKind
+from .db import database_sync_to_async
+from .history import history_entry, record_history
+from .http import get_session
+from .issues import get_classified_issues, issues_listing_url
+from .models import ActivityEvent, LeaderboardEntry
+from .records import CLOSED_ITEMS_DECODER, Issue
+from .utils import check_issue_assignment_events, get_all_open_pull_requests
+from .values import DATETIME_FORMAT, ISSUES_URL, LEADERBOARD_POINTS, PULLS_URL
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SYNC_CURSOR_KEY = "leaderboard_since:{author}/{name}"
+
+
+def record_activity(kind: str, key: str, login: str) -> bool:
+    """
+    Counts a piece of activity on the leaderboard of a GitHub account.
+    Only the counter of the activity and the score are incremented, the
+    same key is never counted twice.
+
+    :param kind: ActivityKind of the activity
+    :param key: a stable identifier of the activity
+    :param login: the GitHub login the activity is credited to
+    :return: True if the activity was counted, False if it already was
+    """
+    if not login:
+        return False
+
+    with transaction.atomic():
+        _, created = ActivityEvent.objects.get_or_create(
+            key=key, defaults={"kind": kind, "login": login}
+        )
+        if not created:
+            return False
+
+        LeaderboardEntry.objects.bulk_create(
+            [LeaderboardEntry(login=login)], ignore_conflicts=True
+        )
+        LeaderboardEntry.objects.filter(login=login).update(
+            **{kind: F(kind) + 1},
+            score=F("score") + LEADERBOARD_POINTS[kind],
+        )
+
+    return True
+
+
+def record_issue_activity(repository: dict, issue: Issue) -> str:
+    """
+    Records the outcome of the last assignment of an issue: a deadline
+    missed once the time limit has passed, otherwise an issue completed
+    when it is closed as completed.
+
+    :param repository: dict with "author", "name" and "time_limit" keys
+    :param issue: an assigned issue, open or closed
+    :return: the time of the last assignment, an empty string if unknown
+    """
+    if not issue.assignee_login:
+        return str()
+
+    assigned_at = check_issue_assignment_events(issue)
+    if not assigned_at:
+        return str()
+
+    label = f"{repository['author']}/{repository['name']}#{issue.number}"
+    deadline = parse_datetime(assigned_at) + timedelta(seconds=repository["time_limit"])
+    finished_at = (
+        parse_datetime(issue.closed_at)
+        if issue.closed_at
+        else datetime.now(timezone.utc)
+    )
+
+    if finished_at > deadline:
+        record_activity(
+            ActivityKind.DEADLINE_MISSED,
+            f"deadline:{label}:{assigned_at}",
+            issue.assignee_login,
+        )
+    elif issue.state == "closed" and issue.state_reason == "completed":
+        record_activity(
+            ActivityKind.ISSUE_COMPLETED, f"completed:{label}", issue.assignee_login
+        )
+
+    return assigned_at
+
+
+def issue_history(tracked_id: str, issue: Issue, assigned_at: str) -> list:
+    """
+    Returns the history entries of an assigned issue.
+    :param tracked_id: the id of the TrackedRepository
+    :param issue: the issue
+    :param assigned_at: the time of its last assignment
+    :return: list of IssueHistory or None
+    """
+    return [
+        history_entry(
+            tracked_id,
+            issue.number,
+            HistoryKind.ASSIGNED,
+            issue.assignee_login,
+            assigned_at,
+        ),
+        history_entry(
+            tracked_id,
+            issue.number,
+            HistoryKind.CLOSED,
+            issue.assignee_login,
+            issue.closed_at,
+        ),
+    ]
+
+
+def record_reviews(revisions: list[dict]) -> None:
+    """
+    Credits the reviews of pull requests to their authors.
+    Self-reviews are not counted.
+
+    :param revisions: revisions as returned by `get_repository_revisions`
+    :return: None
+    """
+    for revision in revisions:
+        author = revision.get("pull_author", str())
+
+        for review in revision.get("reviews", []):
+            if review.user and review.user.login != author:
+                record_activity(
+                    ActivityKind.REVIEW_RECEIVED, f"review:{review.id}", author
+                )
+
+
+def sync_repository_activity(repository: dict) -> None:
+    """
+    Records the activity of a repository since the previous sync.
+
+    Items closed since the stored cursor are fetched oldest first: merged
+    pull requests are credited to their authors and closed issues to their
+    assignees. Open assigned issues are checked for missed deadlines.
+    Losing the cursor only causes a rescan, as recording is idempotent.
+
+    With a "tracked_id", the assignments, pull requests and closes seen are
+    appended to the issue history as well.
+
+    :param repository: dict with "author", "name", "time_limit" and
+                       optionally "tracked_id" keys
+    :return: None
+    """
+    author, name = repository["author"], repository["name"]
+    tracked_id = repository.get("tracked_id")
+    history = list()
+    cursor_key = SYNC_CURSOR_KEY.format(author=author, name=name)
+
+    params = {"state": "closed", "sort": "updated", "direction": "asc", "per_page": 100}
+    if since := cache.get(cursor_key):
+        params["since"] = since
+
+    try:
+        response = get_session().get(
+            ISSUES_URL.format(owner=author, repo=name), params=params
+        )
+        response.raise_for_status()
+        closed = CLOSED_ITEMS_DECODER.decode(response.content)
+
+    except (requests.exceptions.RequestException, msgspec.DecodeError) as e:
+        logger.info(e)
+        return
+
+    for item in closed:
+        if not item.pull_request:
+            assigned_at = record_issue_activity(repository, item)
+            history += issue_history(tracked_id, item, assigned_at)
+            continue
+
+        if item.user:
+            history.append(
+                history_entry(
+                    tracked_id,
+                    item.number,
+                    HistoryKind.PULL_REQUEST,
+                    item.user.login,
+                    item.created_at,
+                )
+            )
+        if item.pull_request.merged_at and item.user:
+            record_activity(
+                ActivityKind.PULL_REQUEST_MERGED,
+                f"merged:{author}/{name}#{item.number}",
+                item.user.login,
+            )
+
+    if closed:
+        cache.set(cursor_key, closed[-1].updated_at, timeout=None)
+
+    listing = get_classified_issues(
+        issues_listing_url({"author": author, "name": name}, assigned=True)
+    )
+    for issue in listing.assigned:
+        assigned_at = record_issue_activity(repository, issue)
+        history += issue_history(tracked_id, issue, assigned_at)
+
+    if not tracked_id:
+        return
+
+    for pull_request in get_all_open_pull_requests(
+        PULLS_URL.format(owner=author, repo=name)
+    ):
+        if pull_request.user:
+            history.append(
+                history_entry(
+                    tracked_id,
+                    pull_request.number,
+                    HistoryKind.PULL_REQUEST,
+                    pull_request.user.login,
+                    pull_request.created_at,
+                )
+            )
+
+    record_history(history)
+
+
+def parse_datetime(value: str) -> datetime:
+    """
+    Parses a GitHub timestamp.
+    :param value: str in DATETIME_FORMAT
+    :return: an aware datetime
+    """
+    return datetime.strptime(value, DATETIME_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def get_leaderboard_page(offset: int, limit: int) -> list[LeaderboardEntry]:
+    """
+    Returns a page of the leaderboard with the rank set on every entry.
+    Only the rows of the page are read, using the rank index.
+
+    :param offset: the number of entries before the page
+    :param limit: the size of the page
+    :return: list of LeaderboardEntry
+    """
+    entries = list(LeaderboardEntry.objects.all()[offset : offset + limit])
+
+    for rank, entry in enumerate(entries, start=offset + 1):
+        entry.rank = rank
+
+    return entries
+
+
+@database_sync_to_async
+def get_leaderboard(limit: int) -> list[LeaderboardEntry]:
+    """
+    Returns the top of the leaderboard asynchronously.
+    :param limit: the number of entries
+    :return: list of LeaderboardEntry
+    """
+    return get_leaderboard_page(0, limit)
@@ -0,0 +1,299 @@
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+
+import msgspec
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from .issues import url_digest
+from .records import (
+    LINKED_PULL_REQUESTS_DECODER,
+    TIMELINE_DECODER,
+    Issue,
+    LinkedPullRequest,
+)
+from .resilience import stale_since
+from .utils import fetch_records, get_page
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+LINKS_CACHE_KEY = "links:{digest}"
+CLOSING_REFERENCE = re.compile(
+    r"\b(?:close[sd]?|fix(?:e[sd])?|resolve[sd]?)\s*:?\s+"
+    r"(?:(?P<slug>[\w.-]+/[\w.-]+))?#(?P<number>\d+)\b",
+    re.IGNORECASE,
+)
+
+
+def closing_references(body: str | None, repository: str) -> set[int]:
+    """
+    Returns the issues of a repository a pull request description closes,
+    e.g. "Fixes #12" or "closes owner/repo#12".
+    :param body: the description of the pull request
+    :param repository: the lowercased "owner/repo" the pull request belongs to
+    :return: set of issue numbers
+    """
+    return {
+        int(match["number"])
+        for match in CLOSING_REFERENCE.finditer(body or str())
+        if not match["slug"] or match["slug"].lower() == repository
+    }
+
+
+@dataclass
+class PullLinks:
+    """
+    What the index knows of an open pull request.
+
+    Attributes:
+    - author (str): The login of the author.
+    - updated_at (str): The time the pull request was last updated.
+    - closes (set[int]): The issues its description closes.
+    """
+
+    author: str
+    updated_at: str
+    closes: set[int] = field(default_factory=set)
+
+
+@dataclass
+class IssueLinks:
+    """
+    The pull requests referencing an issue in its timeline.
+
+    Attributes:
+    - updated_at (str): The `updated_at` of the issue when the timeline was read.
+    - pulls (set[int]): The pull requests referencing the issue.
+    - seen_at (float): When the issue was last among the assigned issues.
+    """
+
+    updated_at: str
+    pulls: set[int] = field(default_factory=set)
+    seen_at: float = 0.0
+
+
+@dataclass
+class LinkIndex:
+    """
+    Links between the open pull requests and the issues of a repository,
+    built from closing references and cross-reference timeline events.
+
+    Attributes:
+    - pulls (dict[int, PullLinks]): Open pull requests by number.
+    - timelines (dict[int, IssueLinks]): Timeline references by issue number.
+    - issue_pulls (dict[int, set[int]]): Issue number to its linked open pull requests.
+    - author_issues (dict[str, set[int]]): Pull request author to the issues they link.
+    - unlinked_authors (set[str]): Authors of open pull requests linking no issue.
+    - refreshed_at (float): When the pull requests were last listed.
+    - stale (bool): The pull requests are the last known listing.
+    - fetched_at (float): When a stale listing was fetched, 0 if never.
+    """
+
+    pulls: dict[int, PullLinks] = field(default_factory=dict)
+    timelines: dict[int, IssueLinks] = field(default_factory=dict)
+    issue_pulls: dict[int, set[int]] = field(default_factory=dict)
+    author_issues: dict[str, set[int]] = field(default_factory=dict)
+    unlinked_authors: set[str] = field(default_factory=set)
+    refreshed_at: float = 0.0
+    stale: bool = False
+    fetched_at: float = 0.0
+
+    def build(self) -> None:
+        """
+        Rebuilds the lookup maps in one pass over the known links.
+        Only open pull requests are linked.
+        :return: None
+        """
+        issue_pulls = dict()
+
+        for number, pull in self.pulls.items():
+            for issue_number in pull.closes:
+                issue_pulls.setdefault(issue_number, set()).add(number)
+
+        for issue_number, links in self.timelines.items():
+            for number in links.pulls & self.pulls.keys():
+                issue_pulls.setdefault(issue_number, set()).add(number)
+
+        author_issues = dict()
+        for issue_number, numbers in issue_pulls.items():
+            for number in numbers:
+                author_issues.setdefault(self.pulls[number].author, set()).add(
+                    issue_number
+                )
+
+        self.issue_pulls = issue_pulls
+        self.author_issues = author_issues
+        self.unlinked_authors = {
+            pull.author for pull in self.pulls.values() if pull.author
+        } - author_issues.keys()
+
+    def pulls_for(self, number: int) -> set[int]:
+        """
+        Returns the open pull requests linked to an issue.
+        :param number: the issue number
+        :return: set of pull request numbers
+        """
+        return self.issue_pulls.get(number, set())
+
+    def issues_of(self, login: str) -> set[int]:
+        """
+        Returns the issues the open pull requests of an author link.
+        :param login: the author login
+        :return: set of issue numbers
+        """
+        return self.author_issues.get(login, set())
+
+    def has_pull_request(self, issue: Issue) -> bool:
+        """
+        Checks an issue has an open pull request. An open pull request of
+        the assignee linking no issue at all is counted as well, since it
+        cannot be attributed to any other issue.
+        :param issue: an assigned issue
+        :return: bool
+        """
+        return bool(self.pulls_for(issue.number)) or (
+            issue.assignee_login in self.unlinked_authors
+        )
+
+
+def links_cache_key(pull_requests_url: str) -> str:
+    """
+    Returns the cache key of the link index of a repository.
+    :param pull_requests_url: The API endpoint for pull requests.
+    :return: str
+    """
+    return LINKS_CACHE_KEY.format(digest=url_digest(pull_requests_url))
+
+
+def update_pulls(
+    index: LinkIndex, pull_requests: list[LinkedPullRequest], repository: str
+) -> None:
+    """
+    Replaces the open pull requests of an index, parsing the description
+    of the new and updated ones only.
+    :param index: LinkIndex
+    :param pull_requests: the open pull requests
+    :param repository: the lowercased "owner/repo"
+    :return: None
+    """
+    pulls = dict()
+
+    for pull_request in pull_requests:
+        known = index.pulls.get(pull_request.number)
+
+        if known and known.updated_at == pull_request.updated_at:
+            pulls[pull_request.number] = known
+            continue
+
+        pulls[pull_request.number] = PullLinks(
+            author=pull_request.user.login if pull_request.user else str(),
+            updated_at=pull_request.updated_at,
+            closes=closing_references(pull_request.body, repository),
+        )
+
+    index.pulls = pulls
+
+
+def get_cross_references(issue: Issue) -> set[int]:
+    """
+    Reads the timeline of an issue for the pull requests of its own
+    repository referencing it.
+    :param issue: Issue
+    :raises RequestException: If a request fails.
+    :raises DecodeError: If a page is not a list of timeline events.
+    :return: set of pull request numbers
+    """
+    numbers = set()
+    url = f"{issue.repository_url}/issues/{issue.number}/timeline?per_page=100"
+
+    while url:
+        response = get_page(url)
+
+        for event in TIMELINE_DECODER.decode(response.content):
+            source = event.source.issue if event.source else None
+            if (
+                event.event == "cross-referenced"
+                and source
+                and source.pull_request
+                and source.repository_url == issue.repository_url
+            ):
+                numbers.add(source.number)
+
+        url = response.links.get("next", dict()).get("url")
+
+    return numbers
+
+
+def update_timelines(index: LinkIndex, issues: list[Issue]) -> None:
+    """
+    Reads the timelines of the issues updated since they were last read.
+    A failed read is retried on the next refresh. Issues no report has
+    listed for `settings.GITHUB_LAST_GOOD_TTL` seconds are dropped.
+    :param index: LinkIndex
+    :param issues: the assigned issues
+    :return: None
+    """
+    now = time.time()
+
+    for issue in issues:
+        known = index.timelines.get(issue.number)
+        if known and issue.updated_at and known.updated_at == issue.updated_at:
+            known.seen_at = now
+            continue
+
+        try:
+            index.timelines[issue.number] = IssueLinks(
+                updated_at=issue.updated_at,
+                pulls=get_cross_references(issue),
+                seen_at=now,
+            )
+        except (requests.exceptions.RequestException, msgspec.DecodeError) as e:
+            logger.info(e)
+
+    index.timelines = {
+        number: links
+        for number, links in index.timelines.items()
+        if now - links.seen_at <= settings.GITHUB_LAST_GOOD_TTL
+    }
+
+
+def get_link_index(pull_requests_url: str, issues: list[Issue]) -> LinkIndex:
+    """
+    Returns the link index of a repository, shared by every report.
+
+    The open pull requests are listed at most once per
+    `settings.LINKS_REFRESH_INTERVAL` seconds and only new or updated ones
+    are parsed. The timeline of an issue is only read again once the issue
+    was updated. If listing the pull requests fails, the index is built
+    from the last known listing and marked as stale.
+
+    :param pull_requests_url: The API endpoint for pull requests.
+    :param issues: The assigned issues of the repository.
+    :return: LinkIndex
+    """
+    cache_key = links_cache_key(pull_requests_url)
+    index = cache.get(cache_key) or LinkIndex()
+
+    if time.time() - index.refreshed_at > settings.LINKS_REFRESH_INTERVAL:
+        pull_requests = fetch_records(
+            pull_requests_url,
+            LINKED_PULL_REQUESTS_DECODER,
+            params={"state": "open", "per_page": 100},
+        )
+        repository = "/".join(pull_requests_url.split("/")[-3:-1]).lower()
+
+        update_pulls(index, pull_requests, repository)
+        index.stale = stale_since(pull_requests) is not None
+        index.fetched_at = getattr(pull_requests, "fetched_at", 0.0)
+        index.refreshed_at = 0.0 if index.stale else time.time()
+
+    update_timelines(index, issues)
+    index.build()
+
+    cache.set(cache_key, index, timeout=settings.GITHUB_LAST_GOOD_TTL)
+
+    return index
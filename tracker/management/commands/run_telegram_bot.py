@@ -1,8 +1,16 @@
 import asyncio
+import logging
+import sys
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
-from tracker.telegram.bot import start_tg_bot
+from tracker.db import configure_database_executor
+from tracker.telegram.bot import (
+    start_tg_bot,
+    start_update_workers,
+    start_webhook_receiver,
+)
 
 
 class Command(BaseCommand):
@@ -10,13 +18,36 @@ class Command(BaseCommand):
     Django management command to run the Telegram bot.
 
     This command initializes and starts the Telegram bot using asynchronous operations.
+    The bot runs in one of three modes:
+        - polling: a single process polling Telegram for updates.
+        - webhook: receives updates and pushes them into Redis streams.
+        - worker: handles the updates of one or more stream shards.
 
     Methods:
+        - add_arguments(self, parser): Adds the mode and shard arguments.
         - handle(self, *args, **kwargs): Handles the execution of the command.
     """
 
     help = "Runs the Telegram bot"
 
+    def add_arguments(self, parser) -> None:
+        """
+        Adds the command arguments.
+        :param parser: CommandParser
+        :return: None
+        """
+        parser.add_argument(
+            "--mode",
+            choices=("polling", "webhook", "worker"),
+            default=settings.BOT_MODE,
+        )
+        parser.add_argument(
+            "--shard",
+            type=int,
+            action="append",
+            help="Stream shard to consume in worker mode, all shards by default.",
+        )
+
     def handle(self, *args, **kwargs) -> None:
         """
         Handles the execution of the command.
@@ -28,5 +59,15 @@ class Command(BaseCommand):
         :param kwargs: Additional keyword arguments.
         :return: None
         """
-        self.stdout.write("Starting Telegram bot...")
-        asyncio.run(start_tg_bot())
+        logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+        mode = kwargs["mode"]
+        self.stdout.write(f"Starting Telegram bot in {mode} mode...")
+        configure_database_executor(settings.BOT_DB_EXECUTOR_WORKERS)
+
+        if mode == "webhook":
+            asyncio.run(start_webhook_receiver())
+        elif mode == "worker":
+            shards = kwargs["shard"] or list(range(settings.BOT_WORKERS))
+            asyncio.run(start_update_workers(shards))
+        else:
+            asyncio.run(start_tg_bot())
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:43
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0004_contributor"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="repository",
+            name="labels",
+            field=models.CharField(
+                blank=True,
+                help_text="Comma-separated labels, e.g. ODHack,good first issue",
+                max_length=255,
+            ),
+        ),
+        migrations.AddField(
+            model_name="repository",
+            name="milestone",
+            field=models.CharField(
+                blank=True,
+                help_text='Milestone number, "*" for any or "none" for issues without one',
+                max_length=50,
+                validators=[
+                    django.core.validators.RegexValidator(
+                        "^(?:\\d+|\\*|none)$",
+                        'Enter a milestone number, "*" or "none".',
+                    )
+                ],
+            ),
+        ),
+    ]
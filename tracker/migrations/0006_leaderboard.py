@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:51
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0005_repository_issue_filters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActivityEvent",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("key", models.CharField(max_length=255, unique=True)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("issues_completed", "Issue completed"),
+                            ("pull_requests_merged", "Pull request merged"),
+                            ("reviews_received", "Review received"),
+                            ("deadlines_missed", "Deadline missed"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("login", models.CharField(max_length=39)),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="LeaderboardEntry",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("login", models.CharField(max_length=39, unique=True)),
+                ("issues_completed", models.PositiveIntegerField(default=0)),
+                ("pull_requests_merged", models.PositiveIntegerField(default=0)),
+                ("reviews_received", models.PositiveIntegerField(default=0)),
+                ("deadlines_missed", models.PositiveIntegerField(default=0)),
+                ("score", models.IntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "Leaderboard",
+                "ordering": ("-score", "login"),
+                "indexes": [
+                    models.Index(
+                        fields=["-score", "login"], name="leaderboard_rank_idx"
+                    )
+                ],
+            },
+        ),
+    ]
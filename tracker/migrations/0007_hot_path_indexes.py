@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:53
+
+from django.db import migrations, models
+
+
+def delete_duplicate_repositories(apps, schema_editor):
+    """
+    Keeps the oldest copy of a repository tracked more than once by a user,
+    so the unique constraint can be added.
+    """
+    Repository = apps.get_model("tracker", "Repository")
+    seen = set()
+
+    for repository in Repository.objects.order_by("created_at").only(
+        "id", "user_id", "author", "name"
+    ):
+        key = (repository.user_id, repository.author, repository.name)
+
+        if key in seen:
+            repository.delete()
+        else:
+            seen.add(key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0006_leaderboard"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="contributor",
+            index=models.Index(fields=["role"], name="contributor_role_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="repository",
+            index=models.Index(fields=["author", "name"], name="repository_slug_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="repository",
+            index=models.Index(
+                fields=["user", "created_at"], name="repository_user_idx"
+            ),
+        ),
+        migrations.RunPython(delete_duplicate_repositories, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="repository",
+            constraint=models.UniqueConstraint(
+                fields=("user", "author", "name"), name="unique_user_repository"
+            ),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:55
+
+import django.db.models.deletion
+import django.db.models.functions.text
+import uuid
+from django.db import migrations, models
+
+
+def merge_repositories(apps, schema_editor):
+    """
+    Creates one TrackedRepository per case-insensitive 'author/name' and links
+    every subscription to it. A user subscribed to several spellings of the
+    same repository keeps the oldest subscription.
+    """
+    Repository = apps.get_model("tracker", "Repository")
+    TrackedRepository = apps.get_model("tracker", "TrackedRepository")
+    canonical, subscribed = dict(), set()
+
+    for repository in Repository.objects.order_by("created_at"):
+        slug = (repository.author.lower(), repository.name.lower())
+
+        if slug not in canonical:
+            canonical[slug] = TrackedRepository.objects.create(
+                author=repository.author, name=repository.name, link=repository.link
+            )
+        tracked = canonical[slug]
+
+        if (repository.user_id, slug) in subscribed:
+            repository.delete()
+            continue
+        subscribed.add((repository.user_id, slug))
+
+        Repository.objects.filter(id=repository.id).update(
+            tracked=tracked, author=tracked.author, name=tracked.name
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0007_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrackedRepository",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("author", models.CharField(max_length=255)),
+                ("name", models.CharField(max_length=255)),
+                ("link", models.URLField(max_length=255)),
+            ],
+            options={
+                "verbose_name_plural": "Tracked repositories",
+                "constraints": [
+                    models.UniqueConstraint(
+                        django.db.models.functions.text.Lower("author"),
+                        django.db.models.functions.text.Lower("name"),
+                        name="unique_tracked_repository",
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="repository",
+            name="tracked",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="subscriptions",
+                to="tracker.trackedrepository",
+            ),
+        ),
+        migrations.RunPython(merge_repositories, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Separate from 0008, PostgreSQL cannot alter a table with pending
+    foreign key checks from the data migration in the same transaction.
+    """
+
+    dependencies = [
+        ("tracker", "0008_tracked_repository"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="repository",
+            name="tracked",
+            field=models.ForeignKey(
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="subscriptions",
+                to="tracker.trackedrepository",
+            ),
+        ),
+    ]
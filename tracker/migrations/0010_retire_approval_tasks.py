@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.utils import timezone
+
+
+def retire_approval_tasks(apps, schema_editor):
+    """
+    Deletes the per-user approval tasks, the approvals are dispatched by the
+    single `dispatch-approvals` beat entry now.
+    """
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTasks = apps.get_model("django_celery_beat", "PeriodicTasks")
+
+    deleted, _ = PeriodicTask.objects.filter(
+        name__regex=r"^user_.+_approval_task$",
+        task__in=("core.tasks.fetch_approvals", "tracker.tasks.fetch_approvals"),
+    ).delete()
+
+    if deleted:
+        PeriodicTasks.objects.update_or_create(
+            ident=1, defaults={"last_update": timezone.now()}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_celery_beat", "0018_improve_crontab_helptext"),
+        ("tracker", "0009_repository_tracked_required"),
+    ]
+
+    operations = [
+        migrations.RunPython(retire_approval_tasks, migrations.RunPython.noop),
+    ]
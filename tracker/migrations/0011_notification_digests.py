@@ -0,0 +1,87 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:06
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0010_retire_approval_tasks"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="telegramuser",
+            name="last_digest_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="telegramuser",
+            name="notification_mode",
+            field=models.CharField(
+                choices=[
+                    ("immediate", "Immediate"),
+                    ("hourly", "Hourly digest"),
+                    ("daily", "Daily digest"),
+                ],
+                default="immediate",
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="telegramuser",
+            name="quiet_hours_end",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                null=True,
+                validators=[django.core.validators.MaxValueValidator(23)],
+            ),
+        ),
+        migrations.AddField(
+            model_name="telegramuser",
+            name="quiet_hours_start",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                null=True,
+                validators=[django.core.validators.MaxValueValidator(23)],
+            ),
+        ),
+        migrations.CreateModel(
+            name="PendingNotification",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("key", models.CharField(max_length=255)),
+                ("payload", models.JSONField()),
+                (
+                    "telegram_user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pending_notifications",
+                        to="tracker.telegramuser",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("created_at",),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("telegram_user", "key"),
+                        name="unique_pending_notification",
+                    )
+                ],
+            },
+        ),
+    ]
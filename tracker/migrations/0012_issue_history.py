@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0011_notification_digests"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssueHistory",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.PositiveIntegerField()),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("assigned", "Assigned"),
+                            ("pull_request", "Pull request opened"),
+                            ("closed", "Closed"),
+                        ],
+                        max_length=12,
+                    ),
+                ),
+                ("login", models.CharField(blank=True, max_length=39)),
+                ("occurred_at", models.DateTimeField()),
+                (
+                    "tracked",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="history",
+                        to="tracker.trackedrepository",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Issue history",
+                "ordering": ("-occurred_at",),
+                "indexes": [
+                    models.Index(fields=["occurred_at"], name="issue_history_time_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("tracked", "number", "kind", "occurred_at"),
+                        name="unique_issue_history",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,17 +1,26 @@
-import requests
-from django.conf import settings
+from asgiref.sync import async_to_sync
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
-from django.core.validators import validate_email
+from django.core.validators import MaxValueValidator, RegexValidator, validate_email
 from django.core.exceptions import ValidationError
 from django.db import models
-from django_celery_beat.models import IntervalSchedule, PeriodicTask
+from django.db.models.functions import Lower
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 
 from shared.models import AbstractModel
-from tracker.choices import Roles
-from tracker.values import ROLE_MAX_CHARACTER_LENGTH, DefaultModelValues
+from tracker.choices import (
+    ActivityKind,
+    HistoryKind,
+    NotificationMode,
+    Roles,
+)
+from tracker.utils import validate_repository_link
+from tracker.values import (
+    MILESTONE_PATTERN,
+    ROLE_MAX_CHARACTER_LENGTH,
+    DefaultModelValues,
+)
 
 
 
@@ -144,33 +153,121 @@ class CustomUser(AbstractModel, AbstractBaseUser):
         return self.role == Roles.PROJECT_LEAD
 
 
+class TrackedRepository(AbstractModel):
+    """
+    A GitHub repository shared by every user tracking it.
+    All fetching, caching and syncing is keyed on this canonical entry, while
+    per-user settings live on the Repository subscriptions.
+
+    Attributes:
+    - author (CharField): The owner of the repository.
+    - name (CharField): The name of the repository.
+    - link (URLField): A URL to the repository.
+
+    Methods:
+    - for_slug: Returns the canonical entry of an 'author/name' pair.
+    - __str__: Returns a string representation in the format 'author/name'.
+    """
+
+    author = models.CharField(max_length=DefaultModelValues.author_max_length)
+    name = models.CharField(max_length=DefaultModelValues.name_max_length)
+    link = models.URLField(max_length=DefaultModelValues.link_max_length)
+
+    class Meta:
+        verbose_name_plural = "Tracked repositories"
+        constraints = [
+            models.UniqueConstraint(
+                Lower("author"), Lower("name"), name="unique_tracked_repository"
+            ),
+        ]
+
+    @classmethod
+    def for_slug(cls, author: str, name: str, link: str) -> "TrackedRepository":
+        """
+        Returns the canonical entry of a repository, creating it if needed.
+        GitHub names are case-insensitive, so is the lookup.
+        :param author: str
+        :param name: str
+        :param link: str
+        :return: TrackedRepository
+        """
+        tracked, _ = cls.objects.get_or_create(
+            author__iexact=author,
+            name__iexact=name,
+            defaults={"author": author, "name": name, "link": link},
+        )
+        return tracked
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the repository in the format 'author/name'.
+        :return: str
+        """
+        return f"{self.author}/{self.name}"
+
+
 class Repository(AbstractModel):
     """
-    A model representing a repository, including its name, author, and link.
+    A user's subscription to a tracked repository, including its name, author, and link.
 
     Attributes:
+    - tracked (ForeignKey): The canonical TrackedRepository, set on save.
     - name (CharField): The name of the repository with a max length defined by DefaultModelValues.
     - author (CharField): The author of the repository with a max length defined by DefaultModelValues.
     - link (URLField): A URL to the repository with a max length defined by DefaultModelValues.
     - time_limit (PositiveIntegerField): The time limit associated with the repository in seconds.
+    - labels (CharField): Comma-separated labels an issue must have to be tracked.
+    - milestone (CharField): The milestone number, "*" or "none" issues are filtered by.
 
     Inherits from:
     - AbstractModel: A shared abstract model providing common fields or methods.
 
     Methods:
+    - save: Links the subscription to its canonical TrackedRepository.
     - __str__: Returns a string representation of the repository in the format 'author/name'.
     """
 
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    tracked = models.ForeignKey(
+        TrackedRepository,
+        on_delete=models.CASCADE,
+        related_name="subscriptions",
+        editable=False,
+    )
     name = models.CharField(max_length=DefaultModelValues.name_max_length)
     author = models.CharField(max_length=DefaultModelValues.author_max_length)
     link = models.URLField(max_length=DefaultModelValues.link_max_length)
     time_limit = models.PositiveIntegerField(
         default=DefaultModelValues.time_limit_default
     )
+    labels = models.CharField(
+        max_length=DefaultModelValues.labels_max_length,
+        blank=True,
+        help_text="Comma-separated labels, e.g. ODHack,good first issue",
+    )
+    milestone = models.CharField(
+        max_length=DefaultModelValues.milestone_max_length,
+        blank=True,
+        help_text='Milestone number, "*" for any or "none" for issues without one',
+        validators=[
+            RegexValidator(
+                rf"^(?:{MILESTONE_PATTERN})$",
+                'Enter a milestone number, "*" or "none".',
+            )
+        ],
+    )
 
     class Meta:
         verbose_name_plural = "Repositories"
+        indexes = [
+            models.Index(fields=["author", "name"], name="repository_slug_idx"),
+            models.Index(fields=["user", "created_at"], name="repository_user_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "author", "name"], name="unique_user_repository"
+            ),
+        ]
 
     def clean(self) -> None:
         """
@@ -179,21 +276,41 @@ class Repository(AbstractModel):
         """
         super().clean()
 
-        if self.name not in self.link:
+        if self.name.lower() not in self.link.lower():
             raise ValidationError("Repository name must be in the link.")
 
-        if self.author not in self.link:
+        if self.author.lower() not in self.link.lower():
             raise ValidationError("Repository author must be in the link.")
 
-        try:
-            response = requests.get(str(self.link))
-            response.raise_for_status()
+        if (
+            Repository.objects.filter(
+                user_id=self.user_id, author__iexact=self.author, name__iexact=self.name
+            )
+            .exclude(id=self.id)
+            .exists()
+        ):
+            raise ValidationError("This repository is already tracked.")
 
-            if not response.ok:
-                raise ValidationError("Repository link is invalid.")
+        async_to_sync(validate_repository_link)(str(self.link))
 
-        except requests.exceptions.RequestException as e:
-            raise ValidationError(f"Something went wrong: {e}")
+    def save(self, *args, **kwargs) -> None:
+        """
+        Links the subscription to its canonical repository and takes over
+        its spelling of author, name and link, so every path keys on the same
+        repository and the subscription stays valid.
+        :return: None
+        """
+        if (
+            not self.tracked_id
+            or self.tracked.author.lower() != self.author.lower()
+            or self.tracked.name.lower() != self.name.lower()
+        ):
+            self.tracked = TrackedRepository.for_slug(self.author, self.name, self.link)
+
+        self.author, self.name = self.tracked.author, self.tracked.name
+        self.link = self.tracked.link
+
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         """
@@ -210,13 +327,30 @@ class TelegramUser(AbstractModel):
     Attributes:
         user (CustomUser): A one-to-one relationship with the CustomUser model.
         telegram_id (str): A unique identifier for the user on Telegram.
+        notification_mode (str): How review notifications are delivered.
+        quiet_hours_start (int): The UTC hour notifications are held from.
+        quiet_hours_end (int): The UTC hour notifications are sent again from.
+        last_digest_at (datetime): The start of the window of the last digest.
 
     Methods:
     - __str__: Returns a string representation of the telegram user.
+    - is_quiet_at: Checks notifications are held at an hour.
     """
 
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE)
     telegram_id = models.CharField(unique=True)
+    notification_mode = models.CharField(
+        max_length=DefaultModelValues.notification_mode_max_length,
+        choices=NotificationMode.choices,
+        default=NotificationMode.IMMEDIATE,
+    )
+    quiet_hours_start = models.PositiveSmallIntegerField(
+        null=True, blank=True, validators=[MaxValueValidator(23)]
+    )
+    quiet_hours_end = models.PositiveSmallIntegerField(
+        null=True, blank=True, validators=[MaxValueValidator(23)]
+    )
+    last_digest_at = models.DateTimeField(null=True, blank=True)
 
     def __str__(self) -> str:
         """
@@ -225,25 +359,53 @@ class TelegramUser(AbstractModel):
         """
         return f"{self.user}: {self.telegram_id}"
 
-    def create_approval_task(
-        self, interval: int = settings.DEFAULT_SCHEDULE_INTERVAL
-    ) -> "PeriodicTask":
+    def is_quiet_at(self, hour: int) -> bool:
+        """
+        Checks notifications are held at an hour. Quiet hours may wrap
+        around midnight, e.g. from 22 to 7.
+        :param hour: UTC hour
+        :return: bool
         """
-        Creates a periodic task for fetching user approval and revision.
-        :param interval: The interval for the task (default: 1 hour)
+        start, end = self.quiet_hours_start, self.quiet_hours_end
+
+        if start is None or end is None or start == end:
+            return False
+        if start < end:
+            return start <= hour < end
+        return hour >= start or hour < end
+
+
+class PendingNotification(AbstractModel):
+    """
+    A review notification buffered until the next digest of a Telegram user.
+    The same review state is buffered once per digest.
 
-        :return: PeriodicTask
+    Attributes:
+    - telegram_user (TelegramUser): The recipient.
+    - key (str): Identifies the notified review state, e.g. 'repo#12:login:state'.
+    - payload (dict): The "repo", "pull", "number", "login" and "state" of the review.
+    """
+
+    telegram_user = models.ForeignKey(
+        TelegramUser, on_delete=models.CASCADE, related_name="pending_notifications"
+    )
+    key = models.CharField(max_length=DefaultModelValues.notification_key_max_length)
+    payload = models.JSONField()
+
+    class Meta:
+        ordering = ("created_at",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["telegram_user", "key"], name="unique_pending_notification"
+            )
+        ]
+
+    def __str__(self) -> str:
         """
-        schedule, _ = IntervalSchedule.objects.get_or_create(
-            every=interval, period=IntervalSchedule.SECONDS
-        )
-        task, _ = PeriodicTask.objects.get_or_create(
-            name=f"user_{self.user.id}_approval_task",
-            task="core.tasks.fetch_approvals",
-            interval=schedule,
-            args=[str(self.telegram_id)],
-        )
-        return task
+        Returns a string representation of the notification.
+        :return: str
+        """
+        return f"{self.telegram_user_id}: {self.key}"
 
 
 class Contributor(AbstractModel):
@@ -264,6 +426,7 @@ class Contributor(AbstractModel):
 
     class Meta:
         verbose_name_plural = "Contributors"
+        indexes = [models.Index(fields=["role"], name="contributor_role_idx")]
     
     def __str__(self):
         """
@@ -271,7 +434,139 @@ class Contributor(AbstractModel):
         """
         telegram_id = self.user.telegramuser.telegram_id if hasattr(self.user, 'telegramuser') else "No Telegram ID"
         return f"Contributor: {telegram_id} (Role: {self.role})"
-    
+
+    def to_dict(self, full: bool = False) -> dict:
+        """
+        Returns a JSON-serializable representation of the contributor.
+        :param full: include notes and rank, visible only to project leads
+        :return: dict
+        """
+        data = {
+            "id": self.id,
+            "user": self.user.telegramuser.telegram_id,
+            "role": self.role,
+        }
+
+        if full:
+            data.update(notes=self.notes, rank=self.rank)
+
+        return data
+
+
+class LeaderboardEntry(AbstractModel):
+    """
+    The precomputed leaderboard row of a GitHub account.
+    Counters and the score are incremented as activity is recorded,
+    see `tracker.leaderboard.record_activity`.
+
+    Attributes:
+    - login (str): The GitHub login of the contributor.
+    - issues_completed (int): Issues closed within the repository time limit.
+    - pull_requests_merged (int): Merged pull requests.
+    - reviews_received (int): Reviews of the contributor's pull requests.
+    - deadlines_missed (int): Assignments that outlived the time limit.
+    - score (int): The weighted sum of the counters, see LEADERBOARD_POINTS.
+    """
+
+    login = models.CharField(
+        max_length=DefaultModelValues.github_login_max_length, unique=True
+    )
+    issues_completed = models.PositiveIntegerField(default=0)
+    pull_requests_merged = models.PositiveIntegerField(default=0)
+    reviews_received = models.PositiveIntegerField(default=0)
+    deadlines_missed = models.PositiveIntegerField(default=0)
+    score = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Leaderboard"
+        ordering = ("-score", "login")
+        indexes = [
+            models.Index(fields=["-score", "login"], name="leaderboard_rank_idx")
+        ]
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the entry.
+        :return: str
+        """
+        return f"{self.login}: {self.score}"
+
+
+class ActivityEvent(AbstractModel):
+    """
+    A piece of GitHub activity that has been counted on the leaderboard.
+    The unique key makes recording idempotent, so repeated syncs never
+    count the same activity twice.
+
+    Attributes:
+    - key (str): A stable identifier of the activity, e.g. 'review:123'.
+    - kind (str): The ActivityKind of the activity.
+    - login (str): The GitHub login the activity is credited to.
+    """
+
+    key = models.CharField(
+        max_length=DefaultModelValues.activity_key_max_length, unique=True
+    )
+    kind = models.CharField(
+        max_length=DefaultModelValues.activity_kind_max_length,
+        choices=ActivityKind.choices,
+    )
+    login = models.CharField(max_length=DefaultModelValues.github_login_max_length)
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the event.
+        :return: str
+        """
+        return f"{self.login}: {self.key}"
+
+
+class IssueHistory(models.Model):
+    """
+    An append-only entry of the history of the issues of a tracked repository.
+    Entries are numerous and never change, so they skip the uuid and the
+    timestamps of AbstractModel.
+
+    Attributes:
+    - tracked (TrackedRepository): The repository.
+    - number (int): The number of the issue or of the pull request.
+    - kind (str): HistoryKind of the entry.
+    - login (str): The assignee, or the author of a pull request.
+    - occurred_at (datetime): When it happened on GitHub.
+    """
+
+    tracked = models.ForeignKey(
+        TrackedRepository, on_delete=models.CASCADE, related_name="history"
+    )
+    number = models.PositiveIntegerField()
+    kind = models.CharField(
+        max_length=DefaultModelValues.history_kind_max_length,
+        choices=HistoryKind.choices,
+    )
+    login = models.CharField(
+        max_length=DefaultModelValues.github_login_max_length, blank=True
+    )
+    occurred_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "Issue history"
+        ordering = ("-occurred_at",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tracked", "number", "kind", "occurred_at"],
+                name="unique_issue_history",
+            )
+        ]
+        indexes = [models.Index(fields=["occurred_at"], name="issue_history_time_idx")]
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the entry.
+        :return: str
+        """
+        return f"#{self.number} {self.kind} {self.login}"
+
+
 @receiver(post_save, sender=CustomUser)
 def create_telegram_user(sender, instance, created, **kwargs):
     """
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+
+from .choices import NotificationMode
+from .models import PendingNotification, TelegramUser
+from .values import DIGEST_WINDOWS
+
+
+def notification_key(revision: dict, review: dict) -> str:
+    """
+    Returns the key a review state is buffered under, so a review reported
+    by several approvals runs appears once in a digest. The pull request
+    is keyed by its number, titles are neither unique nor short.
+    :param revision: a revision as returned by `get_repository_revisions`
+    :param review: a review of the revision
+    :return: str
+    """
+    login = (review.get("user") or dict()).get("login", str())
+    return f"{revision['repo']}#{revision['number']}:{login}:{review['state']}"
+
+
+def sends_immediately(telegram_user: TelegramUser, now: datetime) -> bool:
+    """
+    Checks reviews are sent to a user right away instead of being buffered.
+    :param telegram_user: TelegramUser
+    :param now: the current time
+    :return: bool
+    """
+    return (
+        telegram_user.notification_mode == NotificationMode.IMMEDIATE
+        and not telegram_user.is_quiet_at(now.hour)
+    )
+
+
+def buffer_reviews(telegram_user: TelegramUser, revisions: list[dict]) -> int:
+    """
+    Buffers the reviews of revisions until the next digest of a user.
+    Review states already buffered are skipped.
+    :param telegram_user: TelegramUser
+    :param revisions: revisions as returned by `get_repository_revisions`
+    :return: the number of buffered reviews
+    """
+    notifications = {
+        notification_key(revision, review): PendingNotification(
+            telegram_user=telegram_user,
+            key=notification_key(revision, review),
+            payload={
+                "repo": revision["repo"],
+                "pull": revision["pull"],
+                "number": revision["number"],
+                "login": (review.get("user") or dict()).get("login", str()),
+                "state": review["state"],
+            },
+        )
+        for revision in revisions
+        for review in revision.get("reviews", [])
+    }
+
+    created = PendingNotification.objects.bulk_create(
+        notifications.values(), ignore_conflicts=True
+    )
+    return len(created)
+
+
+def is_digest_due(telegram_user: TelegramUser, window_start: datetime) -> bool:
+    """
+    Checks the digest window of a user has passed and they are not in
+    their quiet hours.
+    :param telegram_user: TelegramUser
+    :param window_start: the start of the current hour
+    :return: bool
+    """
+    if telegram_user.is_quiet_at(window_start.hour):
+        return False
+
+    if telegram_user.last_digest_at is None:
+        return True
+
+    window = timedelta(seconds=DIGEST_WINDOWS[telegram_user.notification_mode])
+    return window_start - telegram_user.last_digest_at >= window
+
+
+def digest_revisions(notifications: list[PendingNotification]) -> list[dict]:
+    """
+    Groups buffered reviews by pull request into one consolidated report.
+    :param notifications: list of PendingNotification, oldest first
+    :return: revisions in the format of `get_repository_revisions`
+    """
+    revisions = dict()
+
+    for notification in notifications:
+        payload = notification.payload
+        revision = revisions.setdefault(
+            (payload["repo"], payload["number"]),
+            {
+                "repo": payload["repo"],
+                "pull": payload["pull"],
+                "number": payload["number"],
+                "reviews": [],
+            },
+        )
+        revision["reviews"].append(
+            {"user": {"login": payload["login"]}, "state": payload["state"]}
+        )
+
+    return list(revisions.values())
@@ -0,0 +1,76 @@
+import logging
+from functools import cache
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+POPULARITY_KEY = "popularity:issues"
+
+
+@cache
+def get_redis() -> redis.Redis | None:
+    """
+    Returns a Redis client for the configured REDIS_URL, None without Redis.
+    :return: redis.Redis or None
+    """
+    return redis.Redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+
+
+def record_request(url: str) -> None:
+    """
+    Counts a request of a repository listing in the popularity ranking.
+    :param url: The API endpoint that was requested.
+    :return: None
+    """
+    client = get_redis()
+    if client is None:
+        return
+
+    try:
+        client.zincrby(POPULARITY_KEY, 1, url)
+    except redis.RedisError as e:
+        logger.info(e)
+
+
+def get_hot_urls(limit: int) -> list[str]:
+    """
+    Returns the most requested listings, most popular first.
+    :param limit: maximal amount of listings
+    :return: list of URLs
+    """
+    client = get_redis()
+    if client is None:
+        return []
+
+    try:
+        return [url.decode() for url in client.zrevrange(POPULARITY_KEY, 0, limit - 1)]
+    except redis.RedisError as e:
+        logger.info(e)
+    return []
+
+
+def decay_and_evict(factor: float, min_score: float) -> list[str]:
+    """
+    Ages the popularity counters (LFU decay) and drops listings that went cold.
+    :param factor: multiplier applied to every counter
+    :param min_score: listings below this score are evicted
+    :return: list of evicted URLs
+    """
+    client = get_redis()
+    if client is None:
+        return []
+
+    try:
+        with client.pipeline() as pipeline:
+            pipeline.zunionstore(POPULARITY_KEY, {POPULARITY_KEY: factor})
+            pipeline.zrangebyscore(POPULARITY_KEY, "-inf", f"({min_score}")
+            pipeline.zremrangebyscore(POPULARITY_KEY, "-inf", f"({min_score}")
+            _, cold, _ = pipeline.execute()
+
+        return [url.decode() for url in cold]
+    except redis.RedisError as e:
+        logger.info(e)
+    return []
@@ -0,0 +1,200 @@
+import msgspec
+
+
+class User(msgspec.Struct, gc=False):
+    """
+    A GitHub account as embedded in issues, pull requests and reviews.
+
+    Attributes:
+    - login (str): The username of the account.
+    """
+
+    login: str = str()
+
+
+class Label(msgspec.Struct, gc=False):
+    """
+    A label attached to an issue.
+
+    Attributes:
+    - name (str): The name of the label.
+    """
+
+    name: str = str()
+
+
+class PullRequestLink(msgspec.Struct, gc=False):
+    """
+    Marks an item of the issues listing that is backed by a pull request.
+
+    Attributes:
+    - url (str): The API endpoint of the pull request.
+    - merged_at (str | None): The time the pull request was merged.
+    """
+
+    url: str = str()
+    merged_at: str | None = None
+
+
+class Issue(msgspec.Struct, gc=False):
+    """
+    The fields of a GitHub issue the tracker uses.
+    Everything else in the payload is skipped while decoding.
+
+    Attributes:
+    - number (int): The number of the issue in its repository.
+    - title (str): The title of the issue.
+    - html_url (str): A link to the issue.
+    - state (str): "open" or "closed".
+    - state_reason (str | None): Why the issue was closed, e.g. "completed".
+    - closed_at (str | None): The time the issue was closed.
+    - updated_at (str): The time the issue was last updated.
+    - user (User | None): The author of the issue.
+    - repository_url (str): The API endpoint of the repository.
+    - assignee (User | None): The assignee of the issue.
+    - labels (list[Label]): The labels of the issue.
+    - draft (bool): Whether the item is a draft.
+    - pull_request (PullRequestLink | None): Set if the item is a pull request.
+    - assigned_at (str): The time of the last assignment, filled in on demand.
+    - days (int): Full days since the last assignment, filled in on demand.
+    """
+
+    number: int
+    title: str = str()
+    html_url: str = str()
+    state: str = "open"
+    state_reason: str | None = None
+    closed_at: str | None = None
+    updated_at: str = str()
+    user: User | None = None
+    repository_url: str = str()
+    assignee: User | None = None
+    labels: list[Label] = []
+    draft: bool = False
+    pull_request: PullRequestLink | None = None
+    assigned_at: str = str()
+    days: int = 0
+
+    @property
+    def assignee_login(self) -> str:
+        """
+        Returns the login of the assignee, an empty string if there is none.
+        :return: str
+        """
+        return self.assignee.login if self.assignee else str()
+
+    @property
+    def events_url(self) -> str:
+        """
+        Returns the API endpoint of the issue events.
+        :return: str
+        """
+        return f"{self.repository_url}/issues/{self.number}/events"
+
+
+class ClosedItem(Issue, gc=False):
+    """
+    A closed issue or pull request of the activity sync. Unlike cached
+    listings it keeps the time it was opened, for the issue history.
+
+    Attributes:
+    - created_at (str): The time the item was opened.
+    """
+
+    created_at: str = str()
+
+
+class IssueEvent(msgspec.Struct, gc=False):
+    """
+    An entry of the issue events timeline.
+
+    Attributes:
+    - event (str): The type of the event, e.g. "assigned".
+    - created_at (str): The time of the event.
+    - assignee (User | None): The assignee of an assignment event.
+    """
+
+    event: str = str()
+    created_at: str = str()
+    assignee: User | None = None
+
+
+class PullRequest(msgspec.Struct, gc=False):
+    """
+    The fields of a GitHub pull request the tracker uses.
+
+    Attributes:
+    - number (int): The number of the pull request in its repository.
+    - title (str): The title of the pull request.
+    - user (User | None): The author of the pull request.
+    - draft (bool): Whether the pull request is a draft.
+    - created_at (str): The time the pull request was opened.
+    """
+
+    number: int
+    title: str = str()
+    user: User | None = None
+    draft: bool = False
+    created_at: str = str()
+
+
+class LinkedPullRequest(PullRequest, gc=False):
+    """
+    An open pull request as read by the link index, with the text its
+    closing references are parsed from.
+
+    Attributes:
+    - body (str | None): The description of the pull request.
+    - updated_at (str): The time the pull request was last updated.
+    """
+
+    body: str | None = None
+    updated_at: str = str()
+
+
+class ReferenceSource(msgspec.Struct, gc=False):
+    """
+    The item a cross-reference event comes from.
+
+    Attributes:
+    - issue (Issue | None): The referencing issue or pull request.
+    """
+
+    issue: Issue | None = None
+
+
+class TimelineEvent(msgspec.Struct, gc=False):
+    """
+    An entry of the issue timeline.
+
+    Attributes:
+    - event (str): The type of the event, e.g. "cross-referenced".
+    - source (ReferenceSource | None): The origin of a cross-reference.
+    """
+
+    event: str = str()
+    source: ReferenceSource | None = None
+
+
+class Review(msgspec.Struct, gc=False):
+    """
+    A review of a pull request.
+
+    Attributes:
+    - id (int): The id of the review.
+    - user (User | None): The reviewer.
+    - state (str): e.g. "APPROVED" or "CHANGES_REQUESTED".
+    """
+
+    id: int = 0
+    user: User | None = None
+    state: str = str()
+
+
+ISSUES_DECODER = msgspec.json.Decoder(list[Issue])
+CLOSED_ITEMS_DECODER = msgspec.json.Decoder(list[ClosedItem])
+ISSUE_EVENTS_DECODER = msgspec.json.Decoder(list[IssueEvent])
+PULL_REQUESTS_DECODER = msgspec.json.Decoder(list[PullRequest])
+LINKED_PULL_REQUESTS_DECODER = msgspec.json.Decoder(list[LinkedPullRequest])
+TIMELINE_DECODER = msgspec.json.Decoder(list[TimelineEvent])
+REVIEWS_DECODER = msgspec.json.Decoder(list[Review])
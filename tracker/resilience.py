@@ -0,0 +1,252 @@
+import hashlib
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+LAST_GOOD_KEY = "last_good:{digest}"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_lock = threading.Lock()
+_breakers = dict()
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    Raised instead of sending a request while the circuit of its endpoint
+    class is open. It is a `RequestException`, so callers handle it like
+    any other failed request.
+    """
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """
+    Raised instead of sending a request once the deadline of the current
+    thread has passed, see `request_deadline`.
+    """
+
+
+class StaleResultError(requests.exceptions.RequestException):
+    """
+    Raised instead of returning a result computed from stale records, so
+    the fetch is retried rather than the last known data being cached.
+    """
+
+
+class CircuitBreaker:
+    """
+    A per-process circuit breaker of a class of GitHub endpoints.
+
+    The circuit opens after `settings.GITHUB_CIRCUIT_THRESHOLD` consecutive
+    failed calls and rejects calls for `settings.GITHUB_CIRCUIT_COOLDOWN`
+    seconds. Then a single trial call is let through: its success closes
+    the circuit, its failure opens it again.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Checks a call may be sent.
+        :return: bool
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return True
+
+            if time.monotonic() - self.opened_at < settings.GITHUB_CIRCUIT_COOLDOWN:
+                return False
+
+            if self.probing:
+                return False
+
+            self.probing = True
+            return True
+
+    def record_success(self) -> None:
+        """
+        Closes the circuit.
+        :return: None
+        """
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self) -> None:
+        """
+        Counts a failed call, opening the circuit once the threshold is
+        reached or when the trial call fails.
+        :return: None
+        """
+        with self.lock:
+            self.failures += 1
+
+            if self.probing or self.failures >= settings.GITHUB_CIRCUIT_THRESHOLD:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Checks the circuit currently rejects calls.
+        :return: bool
+        """
+        return self.opened_at is not None
+
+
+def endpoint_class(url: str) -> str:
+    """
+    Returns the class of a GitHub API endpoint a circuit is kept for,
+    e.g. 'issues', 'pulls', 'events', 'reviews' or 'search'.
+    :param url: a GitHub API URL
+    :return: str
+    """
+    parts = [part for part in urlsplit(url).path.split("/") if part]
+
+    if len(parts) > 3 and parts[0] == "repos":
+        return parts[-1] if parts[-1] in ("events", "reviews") else parts[3]
+
+    return parts[0] if parts else "root"
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    """
+    Returns the circuit breaker of an endpoint class.
+    :param endpoint: the endpoint class, see `endpoint_class`
+    :return: CircuitBreaker
+    """
+    with _lock:
+        if endpoint not in _breakers:
+            _breakers[endpoint] = CircuitBreaker(endpoint)
+
+    return _breakers[endpoint]
+
+
+def is_failure(response: requests.Response) -> bool:
+    """
+    Checks a response means GitHub is failing or throttling us, as opposed
+    to rejecting the request itself (e.g. 404).
+    :param response: requests.Response
+    :return: bool
+    """
+    if response.status_code in RETRY_STATUSES:
+        return True
+
+    return (
+        response.status_code == 403
+        and response.headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+
+def retry_after(response: requests.Response) -> float | None:
+    """
+    Returns the delay GitHub asks for before the next request, if any.
+    :param response: requests.Response
+    :return: seconds or None
+    """
+    if value := response.headers.get("Retry-After"):
+        return float(value) if value.isdigit() else None
+
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        reset = response.headers.get("X-RateLimit-Reset", str())
+        return max(float(reset) - time.time(), 0.0) if reset.isdigit() else None
+
+    return None
+
+
+def backoff_delay(attempt: int, requested: float | None = None) -> float | None:
+    """
+    Returns the delay before a retry: the delay requested by GitHub, or an
+    exponential backoff with full jitter.
+    :param attempt: the number of the failed attempt, starting at 0
+    :param requested: the delay requested by GitHub, if any
+    :return: seconds, None if the requested delay is too long to wait for
+    """
+    if requested is not None:
+        return requested if requested <= settings.GITHUB_BACKOFF_MAX else None
+
+    return random.uniform(
+        0, min(settings.GITHUB_BACKOFF_MAX, settings.GITHUB_BACKOFF_BASE * 2**attempt)
+    )
+
+
+class StaleList(list):
+    """
+    The last known good records of an endpoint, served while GitHub fails.
+
+    Attributes:
+    - stale (bool): Always True.
+    - fetched_at (float): When the records were fetched, 0 if never.
+    """
+
+    stale = True
+
+    def __init__(self, items: list = (), fetched_at: float = 0.0) -> None:
+        super().__init__(items)
+        self.fetched_at = fetched_at
+
+
+def stale_since(*results) -> float | None:
+    """
+    Returns when the oldest stale result was fetched.
+    :param results: lists or IssueBuckets
+    :return: a unix timestamp (0 if a result was never fetched) or None if
+             all the results are fresh
+    """
+    stale = [result.fetched_at for result in results if getattr(result, "stale", False)]
+    return min(stale) if stale else None
+
+
+def carry_staleness(value: list, *sources) -> list:
+    """
+    Marks a value computed from stale results as stale.
+    :param value: list computed from the sources
+    :param sources: lists or IssueBuckets the value was computed from
+    :return: the value, or a StaleList of it
+    """
+    fetched_at = stale_since(*sources)
+    return value if fetched_at is None else StaleList(value, fetched_at)
+
+
+def last_good_key(url: str) -> str:
+    """
+    Returns the cache key of the last known good data of a URL.
+    :param url: str
+    :return: str
+    """
+    return LAST_GOOD_KEY.format(digest=hashlib.md5(url.encode()).hexdigest())
+
+
+def remember(url: str, records: list) -> None:
+    """
+    Stores the records of a successful request for `settings.GITHUB_LAST_GOOD_TTL`.
+    :param url: the URL with its query string
+    :param records: list
+    :return: None
+    """
+    cache.set(
+        last_good_key(url),
+        {"records": records, "fetched_at": time.time()},
+        timeout=settings.GITHUB_LAST_GOOD_TTL,
+    )
+
+
+def recall(url: str) -> StaleList:
+    """
+    Returns the last known good records of a URL, marked as stale.
+    :param url: the URL with its query string
+    :return: StaleList, empty if nothing is known
+    """
+    entry = cache.get(last_good_key(url))
+    return StaleList(entry["records"], entry["fetched_at"]) if entry else StaleList()
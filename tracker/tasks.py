@@ -1,16 +1,151 @@
+import hashlib
+import logging
+import time
+from datetime import datetime, timezone
+
 from asgiref.sync import async_to_sync
-from celery import shared_task
+from celery import chord, shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+
+from .approvals import (
+    APPROVALS_LOCK_KEY,
+    REVIEWS_CACHE_KEY,
+    release_approvals_lock,
+    run_approvals_batch,
+)
+from .issues import evict_issues, issues_cache_age, refresh_classified_issues
+from .history import refresh_stats
+from .leaderboard import record_reviews, sync_repository_activity
+from .models import PendingNotification, TelegramUser, TrackedRepository
+from .notifications import (
+    buffer_reviews,
+    digest_revisions,
+    is_digest_due,
+    sends_immediately,
+)
+from .popularity import decay_and_evict, get_hot_urls
+from .resilience import StaleResultError, stale_since
+from .telegram.client import send_revision_messages
+from .utils import get_all_repostitories, get_repository_revisions
+from .values import STATS_PERIODS
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+APPROVALS_CURSOR_KEY = "approvals_cursor"
+APPROVALS_SLOT_KEY = "approvals_slot:{slot}"
+
+
+def approval_offset(telegram_id: str) -> int:
+    """
+    Returns the second of the approvals interval a subscriber is notified at.
+    The offset is derived from a hash of the telegram id, so subscribers are
+    spread evenly over the interval and keep their offset between runs.
+
+    :params telegram_id: The telegram id of the user
+    :returns An offset in [0, settings.APPROVALS_INTERVAL)
+    """
+    digest = hashlib.md5(str(telegram_id).encode()).hexdigest()
+    return int(digest, 16) % settings.APPROVALS_INTERVAL
+
+
+@shared_task
+def dispatch_approvals() -> None:
+    """
+    Queue the approvals run of the subscribers whose offset falls into the
+    slots of the approvals interval that were not dispatched yet.
+
+    Placeholder TelegramUsers of leads who have not linked Telegram yet
+    are skipped.
+
+    Beat runs the dispatcher at the start of every slot of
+    `settings.APPROVALS_INTERVAL / settings.APPROVALS_SLOTS` seconds, so
+    every subscriber is notified once per interval. Within the slot, runs
+    are delayed to the exact offset.
+
+    The last dispatched slot is kept in the cache: a late or skipped beat
+    is caught up by the next run, at most one interval back, and a slot
+    is only ever claimed by one run.
+
+    With `settings.APPROVALS_BATCH_SIZE` above 1, the subscribers of the slots
+    are grouped by offset into batches of that size instead, each delayed to
+    the offset of its first subscriber.
 
-from .models import TelegramUser
-from .telegram.bot import send_revision_messages
-from .utils import get_user_revisions
+    :returns None
+    """
+    now = int(time.time())
+    slot_width = settings.APPROVALS_INTERVAL // settings.APPROVALS_SLOTS
+    current_slot = now // slot_width
+
+    last_slot = cache.get(APPROVALS_CURSOR_KEY)
+    first_slot = (
+        current_slot
+        if last_slot is None
+        else max(last_slot + 1, current_slot - settings.APPROVALS_SLOTS + 1)
+    )
+    slots = [
+        slot
+        for slot in range(first_slot, current_slot + 1)
+        if cache.add(
+            APPROVALS_SLOT_KEY.format(slot=slot),
+            True,
+            timeout=settings.APPROVALS_INTERVAL,
+        )
+    ]
+    cache.set(APPROVALS_CURSOR_KEY, max(current_slot, last_slot or 0), timeout=None)
+
+    if not slots:
+        return
+
+    telegram_ids = (
+        TelegramUser.objects.filter(user__repository__isnull=False)
+        .exclude(telegram_id__startswith="default_")
+        .values_list("telegram_id", flat=True)
+        .distinct()
+    )
+    offsets = [
+        (approval_offset(telegram_id), telegram_id) for telegram_id in telegram_ids
+    ]
+
+    due = list()
+    for slot in slots:
+        slot_start = slot * slot_width
+        slot_offset = slot_start % settings.APPROVALS_INTERVAL
+
+        due += [
+            (max(slot_start + offset - slot_offset - now, 0), telegram_id)
+            for offset, telegram_id in offsets
+            if 0 <= offset - slot_offset < slot_width
+        ]
+    due.sort()
+
+    if settings.APPROVALS_BATCH_SIZE <= 1:
+        for countdown, telegram_id in due:
+            fetch_approvals.apply_async((telegram_id,), countdown=countdown)
+        return
+
+    for start in range(0, len(due), settings.APPROVALS_BATCH_SIZE):
+        batch = due[start : start + settings.APPROVALS_BATCH_SIZE]
+        fetch_approvals_batch.apply_async(
+            ([telegram_id for _, telegram_id in batch],), countdown=batch[0][0]
+        )
 
 
 @shared_task
 def fetch_approvals(telegram_id: str) -> None:
     """
     Fetch the approvals and revisions of pull request in the repos of current user.
-    Notify the user via telegram of the results
+    Notify the user via telegram of the results.
+
+    The work is split into a chord: one fetch task per tracked repository on
+    the `github` queue, followed by an aggregation step for the subscriber
+    which hands the result over to the `telegram` queue.
+
+    A subscriber has one run at a time: the run holds a lock until its
+    notification is sent, or for at most `settings.APPROVALS_LOCK_TTL`
+    seconds if a step of the run fails.
 
     :params telegram_id: The telegram id of the user
     :returns None
@@ -20,6 +155,286 @@ def fetch_approvals(telegram_id: str) -> None:
     if not telegram_user:
         return
 
-    reviews = get_user_revisions(str(telegram_user.telegram_id))
-    if reviews:
-        async_to_sync(send_revision_messages)(telegram_user.telegram_id, reviews)
+    repositories = async_to_sync(get_all_repostitories)(telegram_user.telegram_id)
+    if not repositories:
+        return
+
+    if not cache.add(
+        APPROVALS_LOCK_KEY.format(telegram_id=telegram_id),
+        True,
+        timeout=settings.APPROVALS_LOCK_TTL,
+    ):
+        return
+
+    tracked_ids = dict.fromkeys(
+        str(repository["tracked_id"]) for repository in repositories
+    )
+    header = [fetch_repository_reviews.s(tracked_id) for tracked_id in tracked_ids]
+    telegram_id = str(telegram_user.telegram_id)
+    chord(header)(
+        aggregate_revisions.s(telegram_id).on_error(release_approvals.si(telegram_id))
+    )
+
+
+@shared_task
+def fetch_approvals_batch(telegram_ids: list[str]) -> None:
+    """
+    Notify a batch of subscribers about the approvals and revisions of
+    their repositories in one event loop, sharing the GitHub session and
+    one Telegram session, see `run_approvals_batch`.
+    Sends hitting Telegram flood limits are handed over to
+    `send_revision_notification`, which retries them.
+
+    :params telegram_ids: The telegram ids of the users
+    :returns None
+    """
+    for telegram_id, reviews in async_to_sync(run_approvals_batch)(telegram_ids):
+        send_revision_notification.delay(telegram_id, reviews)
+
+
+@shared_task(
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=settings.CELERY_FETCH_MAX_RETRIES,
+)
+def fetch_repository_reviews(tracked_id: str) -> list[dict]:
+    """
+    Fetch the reviews of all open pull requests of a tracked repository
+    and credit them on the leaderboard.
+    The result is cached for `settings.REVIEWS_CACHE_TTL` seconds, so the
+    subscribers of a repository share one fetch. If GitHub fails, the task
+    is retried and nothing is cached or credited.
+
+    :params tracked_id: The id of the TrackedRepository
+    :raises StaleResultError: If a listing of the repository failed.
+    :returns A list of reviews data
+    """
+    cache_key = REVIEWS_CACHE_KEY.format(tracked_id=tracked_id)
+    revisions = cache.get(cache_key)
+
+    if revisions is None:
+        tracked = TrackedRepository.objects.filter(id=tracked_id).first()
+        if not tracked:
+            return []
+
+        revisions = get_repository_revisions(tracked.author, tracked.name)
+        if stale_since(revisions) is not None:
+            raise StaleResultError(f"The reviews of {tracked} are stale.")
+
+        record_reviews(revisions)
+        cache.set(cache_key, revisions, timeout=settings.REVIEWS_CACHE_TTL)
+
+    return revisions
+
+
+@shared_task
+def aggregate_revisions(results: list[list[dict]], telegram_id: str) -> None:
+    """
+    Merge the reviews fetched for every repository of a subscriber and
+    deliver them if there is anything to report, otherwise finish the run
+    of the subscriber.
+
+    Subscribers in immediate mode get a notification right away. The
+    reviews of the others, or of anyone in their quiet hours, are buffered
+    for their next digest.
+
+    :params results: The reviews of each repository
+    :params telegram_id: The telegram id of the user
+    :returns None
+    """
+    reviews = [
+        review for repository_reviews in results for review in repository_reviews
+    ]
+
+    if not reviews:
+        release_approvals_lock(telegram_id)
+        return
+
+    telegram_user = TelegramUser.objects.filter(telegram_id=telegram_id).first()
+
+    if telegram_user is None or sends_immediately(
+        telegram_user, datetime.now(timezone.utc)
+    ):
+        send_revision_notification.delay(telegram_id, reviews)
+        return
+
+    buffer_reviews(telegram_user, reviews)
+    release_approvals_lock(telegram_id)
+
+
+@shared_task
+def release_approvals(telegram_id: str) -> None:
+    """
+    Finish the run of a subscriber whose reviews could not be fetched.
+    It is the error callback of the chord of `fetch_approvals`, so a
+    repository failing past its retries does not keep the subscriber
+    locked until `settings.APPROVALS_LOCK_TTL`.
+
+    :params telegram_id: The telegram id of the user
+    :returns None
+    """
+    release_approvals_lock(telegram_id)
+
+
+@shared_task(bind=True, max_retries=settings.CELERY_SEND_MAX_RETRIES)
+def send_revision_notification(self, telegram_id: str, reviews: list[dict]) -> None:
+    """
+    Send the revisions message to the user, respecting Telegram flood limits,
+    and finish the run of the subscriber.
+
+    :params telegram_id: The telegram id of the user
+    :params reviews: The aggregated reviews data
+    :returns None
+    """
+    from aiogram.exceptions import (
+        TelegramAPIError,
+        TelegramNetworkError,
+        TelegramRetryAfter,
+    )
+
+    try:
+        async_to_sync(send_revision_messages)(telegram_id, reviews)
+    except TelegramRetryAfter as e:
+        raise self.retry(exc=e, countdown=e.retry_after)
+    except TelegramNetworkError as e:
+        raise self.retry(exc=e, countdown=2**self.request.retries)
+    except TelegramAPIError as e:
+        logger.info(e)
+
+    release_approvals_lock(telegram_id)
+
+
+@shared_task
+def flush_notification_digests() -> None:
+    """
+    Queue the digest of every user with buffered reviews whose digest
+    window has passed, outside of their quiet hours.
+    Beat runs the flush at the start of every hour.
+
+    :returns None
+    """
+    window_start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    telegram_users = TelegramUser.objects.filter(
+        pending_notifications__isnull=False
+    ).distinct()
+
+    for telegram_user in telegram_users:
+        if is_digest_due(telegram_user, window_start):
+            TelegramUser.objects.filter(id=telegram_user.id).update(
+                last_digest_at=window_start
+            )
+            send_notification_digest.delay(telegram_user.telegram_id)
+
+
+@shared_task(bind=True, max_retries=settings.CELERY_SEND_MAX_RETRIES)
+def send_notification_digest(self, telegram_id: str) -> None:
+    """
+    Send the buffered reviews of a user as one consolidated message,
+    respecting Telegram flood limits. Reviews are only dropped once sent.
+
+    :params telegram_id: The telegram id of the user
+    :returns None
+    """
+    from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter
+
+    notifications = list(
+        PendingNotification.objects.filter(telegram_user__telegram_id=telegram_id)
+    )
+    if not notifications:
+        return
+
+    try:
+        async_to_sync(send_revision_messages)(
+            telegram_id, digest_revisions(notifications)
+        )
+    except TelegramRetryAfter as e:
+        raise self.retry(exc=e, countdown=e.retry_after)
+    except TelegramNetworkError as e:
+        raise self.retry(exc=e, countdown=2**self.request.retries)
+
+    PendingNotification.objects.filter(
+        id__in=[notification.id for notification in notifications]
+    ).delete()
+
+
+@shared_task
+def refresh_repository_issues(url: str) -> None:
+    """
+    Refresh the cached issues listing of a repository.
+
+    :params url: The API endpoint for issues
+    :returns None
+    """
+    refresh_classified_issues(url)
+
+
+@shared_task
+def refresh_issue_stats() -> None:
+    """
+    Recompute the cached issue statistics of every period.
+
+    :returns None
+    """
+    for period in STATS_PERIODS:
+        refresh_stats(period)
+
+
+@shared_task
+def prewarm_hot_repositories() -> None:
+    """
+    Refresh the most requested repositories before their cache goes stale,
+    then age the popularity counters and evict the cached listings of
+    repositories nobody asks for anymore.
+
+    :returns None
+    """
+    refresh_after = settings.ISSUES_CACHE_TTL - settings.PREWARM_INTERVAL
+
+    for url in get_hot_urls(settings.PREWARM_HOT_REPOSITORIES):
+        age = issues_cache_age(url)
+
+        if age is None or age > refresh_after:
+            refresh_repository_issues.delay(url)
+
+    cold_urls = decay_and_evict(
+        settings.POPULARITY_DECAY, settings.POPULARITY_MIN_SCORE
+    )
+    for url in cold_urls:
+        evict_issues(url)
+
+
+@shared_task
+def sync_leaderboard() -> None:
+    """
+    Queue a leaderboard sync of every tracked repository with subscribers,
+    using the most lenient time limit of its subscribers.
+
+    :returns None
+    """
+    repositories = (
+        TrackedRepository.objects.annotate(limit=Max("subscriptions__time_limit"))
+        .filter(limit__isnull=False)
+        .values("id", "author", "name", "limit")
+    )
+
+    for repository in repositories:
+        sync_repository_leaderboard.delay(
+            {
+                "tracked_id": str(repository["id"]),
+                "author": repository["author"],
+                "name": repository["name"],
+                "time_limit": repository["limit"],
+            }
+        )
+
+
+@shared_task
+def sync_repository_leaderboard(repository: dict) -> None:
+    """
+    Record the activity and the issue history of a repository since its
+    previous sync.
+
+    :params repository: dict with "author", "name" and "time_limit" keys
+    :returns None
+    """
+    sync_repository_activity(repository)
@@ -1,36 +1,67 @@
 import asyncio
 import logging
-import os
 import sys
+from typing import Callable
 
-from aiogram import Bot, Dispatcher, F, html
-from aiogram.client.default import DefaultBotProperties
-from aiogram.filters import CommandObject, CommandStart
+from aiogram import Dispatcher, F, html
+from aiogram.filters import Command, CommandObject, CommandStart
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisStorage
+from aiogram.types import CallbackQuery
 from aiogram.types.message import Message
-from aiogram.utils.deep_linking import create_start_link
 from aiogram.utils.keyboard import ReplyKeyboardBuilder, ReplyKeyboardMarkup
+from django.conf import settings
 from dotenv import load_dotenv
-from tracker import ISSUES_URL, PULLS_URL, get_issues_without_pull_requests
+from tracker import PULLS_URL, get_issues_without_pull_requests
+from tracker.choices import NotificationMode
+from tracker.db import log_pool_stats
+from tracker.history import get_stats
+from tracker.issues import issues_listing_url
+from tracker.leaderboard import get_leaderboard
+from tracker.telegram.client import get_bot
+from tracker.telegram.streams import consume_updates, run_webhook_receiver
+from tracker.telegram.pagination import (
+    ReportPage,
+    ReportSection,
+    load_report,
+    page_markup,
+    render_page,
+    store_report,
+)
+from tracker.telegram.reports import (
+    ProgressMessage,
+    collect_sections,
+    repository_label,
+    stale_notice,
+)
 from tracker.telegram.templates import TEMPLATES
 from tracker.utils import (
     create_telegram_user,
     get_all_available_issues,
     get_all_repostitories,
+    get_tracked_issues_of_user,
     get_user,
-    attach_link_to_issue,
+    update_notification_preferences,
+)
+from tracker.values import (
+    DEFAULT_ISSUES_LABEL,
+    SECONDS_IN_A_DAY,
+    SECONDS_IN_AN_HOUR,
+    STATS_PERIODS,
 )
 
 load_dotenv()
 
-logging.basicConfig(level=logging.INFO, stream=sys.stdout)
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-bot = Bot(
-    token=os.environ.get("TELEGRAM_BOT_TOKEN", str()),
-    default=DefaultBotProperties(parse_mode="HTML"),
+dp = Dispatcher(
+    storage=(
+        RedisStorage.from_url(settings.REDIS_URL)
+        if settings.REDIS_URL
+        else MemoryStorage()
+    )
 )
-dp = Dispatcher()
 
 
 @dp.message(CommandStart(deep_link=True, deep_link_encoded=True))
@@ -72,48 +103,48 @@ async def start_message(message: Message) -> None:
     )
 
 
-@dp.message(F.text == "📓get missed deadlines📓")
-async def send_deprecated_issue_assignees(msg: Message) -> None:
+def build_deadline_section(repository: dict) -> ReportSection:
     """
-    Sends information about assignees that missed the deadline.
-    :param msg: Message instance for communication with a user
-    :return: None
+    Builds the missed deadlines section of a repository.
+    :param repository: dict with "author" and "name" keys
+    :return: ReportSection
     """
-    all_repositories = await get_all_repostitories(msg.from_user.id)
-
-    for repository in all_repositories:
+    issues = get_issues_without_pull_requests(
+        issues_url=issues_listing_url(repository, assigned=True),
+        pull_requests_url=PULLS_URL.format(
+            owner=repository.get("author", str()),
+            repo=repository.get("name", str()),
+        ),
+    )
 
-        repo_message = TEMPLATES.repo_header.substitute(
+    return ReportSection(
+        label=repository_label(repository),
+        header=TEMPLATES.repo_header.substitute(
             author=repository.get("author", "Unknown"),
             repo=repository.get("name", "Unknown"),
-        )
-
-        issues = get_issues_without_pull_requests(
-            issues_url=ISSUES_URL.format(
-                owner=repository.get("author", str()),
-                repo=repository.get("name", str()),
-            ),
-            pull_requests_url=PULLS_URL.format(
-                owner=repository.get("author", str()),
-                repo=repository.get("name", str()),
-            ),
-        )
-
-        issue_messages = ""
-        for issue in issues:
-            issue_messages += TEMPLATES.issue_detail.substitute(
-                title=issue.get("title", "No title"),
-                user=issue.get("assignee", {}).get("login", "Unassigned"),
-                days=issue.get("days", "N/A"),
-
+        ),
+        items=[
+            TEMPLATES.issue_detail.substitute(
+                title=issue.title or "No title",
+                user=issue.assignee_login or "Unassigned",
+                days=issue.days,
             )
+            for issue in issues
+        ],
+        empty=TEMPLATES.no_missed_deadlines.template,
+        wrapper="<blockquote>{}</blockquote>",
+        notice=stale_notice(issues),
+    )
 
-        if not issues:
-            issue_messages = TEMPLATES.no_missed_deadlines.template
-
-        message = repo_message + issue_messages
 
-        await msg.reply(f"<blockquote>{message}</blockquote>")
+@dp.message(F.text == "📓get missed deadlines📓")
+async def send_deprecated_issue_assignees(msg: Message) -> None:
+    """
+    Sends information about assignees that missed the deadline.
+    :param msg: Message instance for communication with a user
+    :return: None
+    """
+    await reply_with_report(msg, build_deadline_section)
 
 
 def escape_html(text: str) -> str:
@@ -127,6 +158,29 @@ def escape_html(text: str) -> str:
     return html.unparse(text)
 
 
+def build_available_section(repository: dict) -> ReportSection:
+    """
+    Builds the available issues section of a repository.
+    :param repository: dict with "author" and "name" keys
+    :return: ReportSection
+    """
+    issues = get_all_available_issues(issues_listing_url(repository, assigned=False))
+
+    return ReportSection(
+        label=repository_label(repository),
+        header=TEMPLATES.repo_header.substitute(
+            author=repository.get("author", "Unknown"),
+            repo=repository.get("name", "Unknown"),
+        ),
+        items=[
+            TEMPLATES.issue_summary.substitute(title=issue.title or "No title provided")
+            for issue in issues
+        ],
+        empty=TEMPLATES.no_issues.template,
+        notice=stale_notice(issues),
+    )
+
+
 @dp.message(F.text == "📖get available issues📖")
 async def send_available_issues(msg: Message) -> None:
     """
@@ -134,45 +188,76 @@ async def send_available_issues(msg: Message) -> None:
     :param msg: Message instance for communication with a user
     :return: None
     """
+    await reply_with_report(msg, build_available_section)
+
+
+async def reply_with_report(
+    msg: Message, build_section: Callable[[dict], ReportSection]
+) -> None:
+    """
+    Processes the user's repositories concurrently while editing a progress
+    message, then replaces it with the first page of the stored report.
+    :param msg: Message instance for communication with a user
+    :param build_section: a blocking function building a section for a repository
+    :return: None
+    """
     all_repositories = await get_all_repostitories(msg.from_user.id)
 
-    for repository in all_repositories:
-        repo_message = TEMPLATES.repo_header.substitute(
-            author=repository.get("author", "Unknown"),
-            repo=repository.get("name", "Unknown"),
-        )
+    if not all_repositories:
+        await msg.reply(TEMPLATES.no_issues.template)
+        return
 
-        issues = get_all_available_issues(
-            ISSUES_URL.format(
-                owner=repository.get("author", str()),
-                repo=repository.get("name", str()),
-            ),
-        )
+    progress = await ProgressMessage.start(msg, all_repositories)
 
+    sections = await collect_sections(all_repositories, build_section, progress)
+    cursor, pages = await store_report(sections)
 
-        issue_messages = ""
-        for issue in issues:
-            issue_messages += TEMPLATES.issue_summary.substitute(
-                title=issue.get("title", "No title provided")
+    await progress.message.edit_text(
+        render_page(pages, 0), reply_markup=page_markup(cursor, pages, 0)
+    )
 
-            )
 
-        if not issues:
-            issue_messages = TEMPLATES.no_issues.template
+@dp.callback_query(ReportPage.filter())
+async def turn_report_page(query: CallbackQuery, callback_data: ReportPage) -> None:
+    """
+    Shows another page of a stored report.
+    :param query: CallbackQuery of the pressed button
+    :param callback_data: ReportPage with the cursor and the requested page
+    :return: None
+    """
+    pages = await load_report(callback_data.cursor)
+
+    if not pages or not 0 <= callback_data.page < len(pages):
+        await query.answer(TEMPLATES.report_expired.template, show_alert=True)
+        return
 
-        message = repo_message + issue_messages
+    await query.message.edit_text(
+        render_page(pages, callback_data.page),
+        reply_markup=page_markup(callback_data.cursor, pages, callback_data.page),
+    )
+    await query.answer()
 
-        await msg.reply(message, parse_mode="HTML")
 
 @dp.message(F.text.contains("/issues "))
 async def get_contributor_tasks(message: Message):
-    _ , username = message.text.split(" ", 1)
-
-    regex = r"ODHack"
-
-    issues = get_user_issues(username, True, True, regex)
+    """
+    Sends the issues of the tracked repositories assigned to a github user.
+    Which issues are tracked is configured per repository (labels, milestone),
+    repositories without a labels filter list the ODHack issues.
+    :param message: Message instance for communication with a user
+    :return: None
+    """
+    _, username = message.text.split(" ", 1)
+
+    repositories = await get_all_repostitories(message.from_user.id)
+    issues = await asyncio.to_thread(
+        get_tracked_issues_of_user,
+        repositories,
+        username.strip(),
+        DEFAULT_ISSUES_LABEL,
+    )
 
-    msg = "ODHack Issues assigned: \n"
+    msg = "Issues assigned: \n"
 
     if len(issues) > 0:
         for issue in issues:
@@ -184,35 +269,168 @@ async def get_contributor_tasks(message: Message):
     await message.reply(msg)
 
 
-async def send_revision_messages(telegram_id: str, reviews_data: list[dict]) -> None:
+@dp.message(Command("leaderboard"))
+async def send_leaderboard(message: Message) -> None:
+    """
+    Sends the top of the precomputed contributor leaderboard.
+    :param message: Message instance for communication with a user
+    :return: None
+    """
+    entries = await get_leaderboard(settings.LEADERBOARD_SIZE)
+
+    if not entries:
+        await message.reply(TEMPLATES.leaderboard_empty.template)
+        return
+
+    msg = TEMPLATES.leaderboard_header.template
+    for entry in entries:
+        msg += TEMPLATES.leaderboard_line.substitute(
+            rank=entry.rank,
+            login=entry.login,
+            score=entry.score,
+            completed=entry.issues_completed,
+            merged=entry.pull_requests_merged,
+            reviews=entry.reviews_received,
+            missed=entry.deadlines_missed,
+        )
+
+    await message.reply(msg)
+
+
+def format_duration(seconds: float | None) -> str:
+    """
+    Renders a duration in hours, or days when it is longer than two days.
+    :param seconds: float or None
+    :return: str
+    """
+    if seconds is None:
+        return "—"
+    if seconds >= 2 * SECONDS_IN_A_DAY:
+        return f"{seconds / SECONDS_IN_A_DAY:.1f}d"
+    return f"{seconds / SECONDS_IN_AN_HOUR:.1f}h"
+
+
+def render_stats_line(name: str, stats: dict) -> str:
     """
-    Send message for all open PR revisions and approvals
-    :params tele_id: The telegram user id of the user to send to
-    :reviews_data: A list of all the reviews data for all pull requests associated to the user repos
+    Renders the statistics of a repository or contributor.
+    :param name: the repository label or the contributor login
+    :param stats: the aggregates returned by `compute_stats`
+    :return: str
     """
-    message = (
-        "=" * 50 + "\n" + "<b>Revisions and Approvals</b>" + "\n" + "=" * 50 + "\n\n"
+    hit_rate = stats["deadline_hit_rate"]
+
+    return TEMPLATES.stats_line.substitute(
+        name=name,
+        assignments=stats["assignments"],
+        p50_pr=format_duration(stats["p50_time_to_pr"]),
+        p90_pr=format_duration(stats["p90_time_to_pr"]),
+        p50_close=format_duration(stats["p50_time_to_close"]),
+        p90_close=format_duration(stats["p90_time_to_close"]),
+        hit_rate="—" if hit_rate is None else f"{hit_rate:.0%}",
     )
-    for data in reviews_data:
-        message += (
-            "-------------------------------"
-            f"Repo: <b>{data['repo']}</b>"
-            "\n"
-            f"Pull Request: <b>{data['pull']}/</b>"
-            "\n"
-            f"<b>Reviews:</b>"
-            "\n"
+
+
+@dp.message(Command("stats"))
+async def send_stats(message: Message, command: CommandObject) -> None:
+    """
+    Sends the time to PR, time to close and deadline hit rate of the user's
+    repositories and of the busiest contributors, from the precomputed
+    statistics.
+    :param message: Message instance for communication with a user
+    :param command: aiogram.filters.CommandObject object
+    :return: None
+    """
+    period = (command.args or "month").strip().lower()
+
+    if period not in STATS_PERIODS:
+        await message.reply(TEMPLATES.stats_usage.template)
+        return
+
+    repositories = await get_all_repostitories(message.from_user.id)
+    stats = await get_stats(period)
+
+    lines = [
+        render_stats_line(entry["label"], entry)
+        for tracked_id in dict.fromkeys(
+            str(repository["tracked_id"]) for repository in repositories
         )
-        for review in data["reviews"]:
-            message += (
-                f"User: <b>{review['user']['login']}</b>"
-                "\n"
-                f"State: {review['state']}"
-                "\n\n"
-            )
-        message += "-------------------------------"
-    # Send bot message
-    await bot.send_message(telegram_id, message)
+        if (entry := stats["repositories"].get(tracked_id))
+    ]
+
+    if not lines:
+        await message.reply(TEMPLATES.stats_empty.template)
+        return
+
+    contributors = sorted(
+        stats["contributors"].items(),
+        key=lambda item: item[1]["assignments"],
+        reverse=True,
+    )[: settings.LEADERBOARD_SIZE]
+
+    msg = TEMPLATES.stats_header.substitute(days=STATS_PERIODS[period])
+    msg += "".join(lines)
+    msg += TEMPLATES.stats_contributors_header.template
+    msg += "".join(render_stats_line(login, entry) for login, entry in contributors)
+
+    await message.reply(msg)
+
+
+@dp.message(Command("notify"))
+async def set_notification_mode(message: Message, command: CommandObject) -> None:
+    """
+    Sets how review notifications are delivered: right away or as a digest.
+    :param message: Message instance for communication with a user
+    :param command: aiogram.filters.CommandObject object
+    :return: None
+    """
+    mode = (command.args or str()).strip().lower()
+
+    if mode not in NotificationMode.values:
+        await message.reply(TEMPLATES.notify_usage.template)
+        return
+
+    if not await update_notification_preferences(
+        str(message.from_user.id), notification_mode=mode
+    ):
+        await message.reply(TEMPLATES.not_linked.template)
+        return
+
+    await message.reply(
+        TEMPLATES.notify_updated.substitute(mode=NotificationMode(mode).label)
+    )
+
+
+@dp.message(Command("quiet"))
+async def set_quiet_hours(message: Message, command: CommandObject) -> None:
+    """
+    Sets the UTC hours review notifications are held, e.g. "/quiet 22-7",
+    or turns them off with "/quiet off".
+    :param message: Message instance for communication with a user
+    :param command: aiogram.filters.CommandObject object
+    :return: None
+    """
+    args = (command.args or str()).strip().lower()
+    start, _, end = args.partition("-")
+
+    if args == "off":
+        start = end = None
+    elif start.isdigit() and end.isdigit() and int(start) < 24 and int(end) < 24:
+        start, end = int(start), int(end)
+    else:
+        await message.reply(TEMPLATES.quiet_usage.template)
+        return
+
+    if not await update_notification_preferences(
+        str(message.from_user.id), quiet_hours_start=start, quiet_hours_end=end
+    ):
+        await message.reply(TEMPLATES.not_linked.template)
+        return
+
+    await message.reply(
+        TEMPLATES.quiet_disabled.template
+        if start is None
+        else TEMPLATES.quiet_updated.substitute(start=start, end=end)
+    )
 
 
 def main_button_markup() -> ReplyKeyboardMarkup:
@@ -227,21 +445,54 @@ def main_button_markup() -> ReplyKeyboardMarkup:
     return builder.as_markup(resize_keyboard=True)
 
 
-async def create_tg_link(uuid) -> str:
-    return await create_start_link(bot=bot, payload=uuid, encode=True)
-
-
 async def start_tg_bot() -> None:
     """
     A function that starts the bot.
     :return: None
     """
+    bot = get_bot()
+    pool_stats = asyncio.create_task(log_pool_stats(settings.DB_POOL_STATS_INTERVAL))
+
     try:
         await dp.start_polling(bot, polling_timeout=0)
 
     finally:
+        pool_stats.cancel()
+        await bot.session.close()
+
+
+async def start_webhook_receiver() -> None:
+    """
+    A function that receives updates via webhook and pushes them to the
+    Redis streams consumed by the bot workers.
+    :return: None
+    """
+    bot = get_bot()
+
+    try:
+        await run_webhook_receiver(bot)
+
+    finally:
+        await bot.session.close()
+
+
+async def start_update_workers(shards: list[int]) -> None:
+    """
+    A function that handles the updates of the given stream shards.
+    :param shards: indexes of the shards to consume
+    :return: None
+    """
+    bot = get_bot()
+    pool_stats = asyncio.create_task(log_pool_stats(settings.DB_POOL_STATS_INTERVAL))
+
+    try:
+        await asyncio.gather(*(consume_updates(dp, bot, shard) for shard in shards))
+
+    finally:
+        pool_stats.cancel()
         await bot.session.close()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
     asyncio.run(start_tg_bot())
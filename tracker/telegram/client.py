@@ -0,0 +1,145 @@
+"""
+A lightweight facade over the Telegram bot for web and worker processes.
+
+Importing this module does not import aiogram, build a `Bot` or register
+any handlers; the runtime is constructed on first use. Only the bot process
+itself imports `tracker.telegram.bot`.
+"""
+
+from functools import cache
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import cache as django_cache
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+BOT_USERNAME_CACHE_KEY = "telegram_bot_username"
+MESSAGE_MAX_LENGTH = 4096
+
+
+@cache
+def get_bot() -> "Bot":
+    """
+    Returns the process-wide Bot instance, creating it on first use.
+    :return: aiogram.Bot
+    """
+    from aiogram import Bot
+    from aiogram.client.default import DefaultBotProperties
+
+    return Bot(
+        token=settings.TELEGRAM_AUTH_TOKEN or str(),
+        default=DefaultBotProperties(parse_mode="HTML"),
+    )
+
+
+async def get_bot_username() -> str:
+    """
+    Returns the bot username, asking Telegram only once per cache lifetime.
+    `settings.TELEGRAM_BOT_USERNAME` skips the request entirely.
+    :return: str
+    """
+    username = settings.TELEGRAM_BOT_USERNAME or await django_cache.aget(
+        BOT_USERNAME_CACHE_KEY
+    )
+
+    if not username:
+        bot = get_bot()
+        async with bot.context():
+            username = (await bot.me()).username
+        await django_cache.aset(BOT_USERNAME_CACHE_KEY, username, timeout=None)
+
+    return username
+
+
+async def create_tg_link(uuid) -> str:
+    """
+    Builds a deep link to the bot carrying the encoded user uuid.
+    :param uuid: CustomUser id
+    :return: str
+    """
+    from aiogram.utils.deep_linking import create_deep_link
+
+    return create_deep_link(
+        username=await get_bot_username(),
+        link_type="start",
+        payload=str(uuid),
+        encode=True,
+    )
+
+
+def pack_messages(blocks: list[list[str]]) -> list[str]:
+    """
+    Packs blocks of lines into as few Telegram messages as possible.
+    A block is moved to a new message when it fits into one, otherwise it is
+    split between its lines. A line longer than a message is cut.
+    :param blocks: the blocks of the report, each a list of lines
+    :return: the messages to send
+    """
+    messages = [str()]
+    for block in blocks:
+        size = sum(map(len, block))
+        if messages[-1] and len(messages[-1]) + size > MESSAGE_MAX_LENGTH >= size:
+            messages.append(str())
+
+        for line in block:
+            if messages[-1] and len(messages[-1]) + len(line) > MESSAGE_MAX_LENGTH:
+                messages.append(str())
+            while len(line) > MESSAGE_MAX_LENGTH:
+                messages[-1] += line[:MESSAGE_MAX_LENGTH]
+                messages.append(str())
+                line = line[MESSAGE_MAX_LENGTH:]
+            messages[-1] += line
+
+    return [message for message in messages if message]
+
+
+def revision_messages(reviews_data: list[dict]) -> list[str]:
+    """
+    Renders the report of open PR revisions and approvals.
+    A report longer than a Telegram message is split between pull requests,
+    and between the reviews of a pull request too long for one message.
+    :param reviews_data: A list of all the reviews data for all pull requests associated to the user repos
+    :return: the messages to send
+    """
+    header = (
+        "=" * 50 + "\n" + "<b>Revisions and Approvals</b>" + "\n" + "=" * 50 + "\n\n"
+    )
+    blocks = list()
+    for data in reviews_data:
+        block = [
+            "-------------------------------"
+            f"Repo: <b>{data['repo']}</b>"
+            "\n"
+            f"Pull Request: <b>{data['pull']}/</b>"
+            "\n"
+            f"<b>Reviews:</b>"
+            "\n"
+        ]
+        for review in data["reviews"]:
+            # GitHub sends no user for the reviews of deleted accounts
+            login = (review.get("user") or dict()).get("login", "ghost")
+            block.append(f"User: <b>{login}</b>\nState: {review['state']}\n\n")
+        block.append("-------------------------------")
+        blocks.append(block)
+
+    # the header stays with the first pull request
+    if blocks:
+        blocks[0].insert(0, header)
+    else:
+        blocks.append([header])
+
+    return pack_messages(blocks)
+
+
+async def send_revision_messages(telegram_id: str, reviews_data: list[dict]) -> None:
+    """
+    Send message for all open PR revisions and approvals
+    :params tele_id: The telegram user id of the user to send to
+    :reviews_data: A list of all the reviews data for all pull requests associated to the user repos
+    """
+    bot = get_bot()
+    async with bot.context():
+        for message in revision_messages(reviews_data):
+            await bot.send_message(telegram_id, message)
@@ -0,0 +1,148 @@
+import uuid
+from dataclasses import dataclass, field
+
+from aiogram.filters.callback_data import CallbackData
+from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardMarkup
+from django.conf import settings
+from django.core.cache import cache
+
+from tracker.telegram.templates import TEMPLATES
+
+CURSOR_KEY = "report_cursor:{cursor}"
+REPO_BUTTONS_PER_ROW = 2
+
+
+class ReportPage(CallbackData, prefix="report"):
+    """
+    Callback data of the inline report keyboard.
+
+    Attributes:
+    - cursor (str): The key of the stored report.
+    - page (int): The index of the page to show.
+    """
+
+    cursor: str
+    page: int
+
+
+@dataclass
+class ReportSection:
+    """
+    A part of a report that belongs to a single repository.
+
+    Attributes:
+    - label (str): A short repository label in the format 'author/name'.
+    - header (str): The rendered header of the section.
+    - items (list[str]): Rendered lines of the section.
+    - empty (str): A text to show when the section has no items.
+    - wrapper (str): A format string each rendered page is wrapped in.
+    - notice (str): A warning shown under the header of every page.
+    """
+
+    label: str
+    header: str
+    items: list[str] = field(default_factory=list)
+    empty: str = str()
+    wrapper: str = "{}"
+    notice: str = str()
+
+
+def paginate(sections: list[ReportSection], page_size: int) -> list[dict]:
+    """
+    Splits report sections into pages of at most `page_size` items.
+    Each repository starts on its own page.
+    :param sections: list of ReportSection
+    :param page_size: maximal amount of items on a page
+    :return: list of pages with "label" and "text" keys
+    """
+    pages = list()
+
+    for section in sections:
+        chunks = [
+            section.items[index : index + page_size]
+            for index in range(0, len(section.items), page_size)
+        ] or [[section.empty]]
+
+        for chunk in chunks:
+            pages.append(
+                {
+                    "label": section.label,
+                    "text": section.wrapper.format(
+                        section.header + section.notice + "".join(chunk)
+                    ),
+                }
+            )
+
+    return pages
+
+
+async def store_report(sections: list[ReportSection]) -> tuple[str, list[dict]]:
+    """
+    Paginates a report and stores it under a new short-lived cursor.
+    :param sections: list of ReportSection
+    :return: tuple of the cursor and the stored pages
+    """
+    cursor = uuid.uuid4().hex[:12]
+    pages = paginate(sections, settings.REPORT_PAGE_SIZE)
+
+    await cache.aset(
+        CURSOR_KEY.format(cursor=cursor), pages, timeout=settings.REPORT_CURSOR_TTL
+    )
+
+    return cursor, pages
+
+
+async def load_report(cursor: str) -> list[dict] | None:
+    """
+    Returns the pages stored under the cursor or None if it has expired.
+    :param cursor: str
+    :return: list of pages or None
+    """
+    return await cache.aget(CURSOR_KEY.format(cursor=cursor))
+
+
+def render_page(pages: list[dict], page: int) -> str:
+    """
+    Renders a page of a report together with its position.
+    :param pages: list of pages
+    :param page: index of the page
+    :return: str
+    """
+    return pages[page]["text"] + TEMPLATES.page_footer.substitute(
+        page=page + 1, total=len(pages)
+    )
+
+
+def page_markup(cursor: str, pages: list[dict], page: int) -> InlineKeyboardMarkup:
+    """
+    Builds the prev/next and per-repository buttons of a report page.
+    :param cursor: the key of the stored report
+    :param pages: list of pages
+    :param page: index of the current page
+    :return: InlineKeyboardMarkup
+    """
+    builder = InlineKeyboardBuilder()
+
+    navigation = list()
+    if page > 0:
+        navigation.append(("◀️ prev", page - 1))
+    if page < len(pages) - 1:
+        navigation.append(("next ▶️", page + 1))
+
+    for text, target in navigation:
+        builder.button(text=text, callback_data=ReportPage(cursor=cursor, page=target))
+
+    first_pages = dict()
+    for index, item in enumerate(pages):
+        first_pages.setdefault(item["label"], index)
+
+    if len(first_pages) > 1:
+        for label, target in first_pages.items():
+            builder.button(
+                text=label, callback_data=ReportPage(cursor=cursor, page=target)
+            )
+
+    sizes = [len(navigation)] if navigation else []
+    builder.adjust(*sizes, REPO_BUTTONS_PER_ROW)
+
+    return builder.as_markup()
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types.message import Message
+from django.conf import settings
+
+from tracker.http import request_deadline
+from tracker.resilience import stale_since
+from tracker.telegram.pagination import ReportSection
+from tracker.telegram.templates import TEMPLATES
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor = None
+
+
+def get_report_executor() -> ThreadPoolExecutor:
+    """
+    Returns the executor building the report sections of this process,
+    bounded by `settings.REPORT_WORKERS` threads so slow repositories
+    cannot starve the default executor of the event loop.
+    :return: ThreadPoolExecutor
+    """
+    global _executor
+
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.REPORT_WORKERS, thread_name_prefix="report"
+                )
+
+    return _executor
+
+
+def build_before(
+    deadline: float, build_section: Callable[[dict], ReportSection], repository: dict
+) -> ReportSection:
+    """
+    Builds the section of a repository, cutting its GitHub requests short
+    at the deadline so the thread stops once the report gave up on it.
+    :param deadline: `time.monotonic()` deadline of the repository
+    :param build_section: a blocking function building a section for a repository
+    :param repository: repository dict
+    :return: ReportSection
+    """
+    with request_deadline(deadline):
+        return build_section(repository)
+
+
+def repository_label(repository: dict) -> str:
+    """
+    Returns a short repository label in the format 'author/name'.
+    :param repository: dict with "author" and "name" keys
+    :return: str
+    """
+    return f"{repository.get('author', 'Unknown')}/{repository.get('name', 'Unknown')}"
+
+
+def stale_notice(result: list) -> str:
+    """
+    Returns the warning of a result served from the last known GitHub data.
+    :param result: a list returned by the tracker helpers
+    :return: the rendered warning, an empty string if the result is fresh
+    """
+    fetched_at = stale_since(result)
+
+    if fetched_at is None:
+        return str()
+    if not fetched_at:
+        return TEMPLATES.github_unavailable.template
+
+    return TEMPLATES.stale_data.substitute(minutes=int(time.time() - fetched_at) // 60)
+
+
+def failed_section(repository: dict, reason: str) -> ReportSection:
+    """
+    Builds a placeholder section for a repository that could not be processed.
+    :param repository: dict with "author" and "name" keys
+    :param reason: rendered explanation shown instead of the issues
+    :return: ReportSection
+    """
+    return ReportSection(
+        label=repository_label(repository),
+        header=TEMPLATES.repo_header.substitute(
+            author=repository.get("author", "Unknown"),
+            repo=repository.get("name", "Unknown"),
+        ),
+        empty=reason,
+    )
+
+
+class ProgressMessage:
+    """
+    A status message that is edited while repositories are being processed.
+
+    Edits are throttled to `settings.REPORT_PROGRESS_EDIT_INTERVAL` seconds
+    to stay within Telegram's per-chat edit limits.
+    """
+
+    def __init__(self, message: Message, repositories: list[dict]) -> None:
+        self.message = message
+        self.labels = [repository_label(repository) for repository in repositories]
+        self.states = dict.fromkeys(self.labels, TEMPLATES.progress_pending.template)
+        self.last_edit = 0.0
+        self.text = str()
+
+    @classmethod
+    async def start(
+        cls, reply_to: Message, repositories: list[dict]
+    ) -> "ProgressMessage":
+        """
+        Replies with the initial progress of all repositories.
+        :param reply_to: the user's message to reply to
+        :param repositories: list of repository dicts
+        :return: ProgressMessage
+        """
+        progress = cls(reply_to, repositories)
+        progress.text = progress.render()
+        progress.message = await reply_to.reply(progress.text)
+        progress.last_edit = time.monotonic()
+
+        return progress
+
+    def render(self) -> str:
+        """
+        Renders the progress of every repository.
+        :return: str
+        """
+        done = sum(
+            state != TEMPLATES.progress_pending.template
+            for state in self.states.values()
+        )
+        lines = [
+            TEMPLATES.progress_line.substitute(state=self.states[label], repo=label)
+            for label in self.labels
+        ]
+        return TEMPLATES.progress_header.substitute(
+            done=done, total=len(self.labels)
+        ) + "".join(lines)
+
+    async def update(self, label: str, state: str) -> None:
+        """
+        Marks a repository with a new state and edits the message if allowed.
+        :param label: repository label
+        :param state: rendered state of the repository
+        :return: None
+        """
+        self.states[label] = state
+        now = time.monotonic()
+
+        if now - self.last_edit < settings.REPORT_PROGRESS_EDIT_INTERVAL:
+            return
+
+        text = self.render()
+        if text == self.text:
+            return
+
+        self.last_edit, self.text = now, text
+        try:
+            await self.message.edit_text(text)
+        except TelegramBadRequest as e:
+            logger.info(e)
+
+
+async def collect_sections(
+    repositories: list[dict],
+    build_section: Callable[[dict], ReportSection],
+    progress: ProgressMessage | None = None,
+) -> list[ReportSection]:
+    """
+    Builds report sections for all repositories concurrently.
+    Every repository runs in a thread of the report executor, is limited by
+    `settings.REPORT_REPOSITORY_TIMEOUT` and at most
+    `settings.REPORT_CONCURRENCY` repositories are processed at once.
+    The GitHub requests of a timed out repository stop at the same deadline.
+    A slow or failing repository gets a placeholder section instead of
+    failing the whole report.
+
+    :param repositories: list of repository dicts
+    :param build_section: a blocking function building a section for a repository
+    :param progress: an optional ProgressMessage updated as repositories finish
+    :return: list of ReportSection in the order of the repositories
+    """
+    semaphore = asyncio.Semaphore(settings.REPORT_CONCURRENCY)
+    loop = asyncio.get_running_loop()
+
+    async def process(repository: dict) -> ReportSection:
+        async with semaphore:
+            deadline = time.monotonic() + settings.REPORT_REPOSITORY_TIMEOUT
+            try:
+                section = await asyncio.wait_for(
+                    loop.run_in_executor(
+                        get_report_executor(),
+                        build_before,
+                        deadline,
+                        build_section,
+                        repository,
+                    ),
+                    timeout=settings.REPORT_REPOSITORY_TIMEOUT,
+                )
+                state = TEMPLATES.progress_done.substitute(count=len(section.items))
+            except asyncio.TimeoutError:
+                section = failed_section(
+                    repository, TEMPLATES.repository_timeout.template
+                )
+                state = TEMPLATES.progress_timeout.template
+            except Exception as e:
+                logger.exception(e)
+                section = failed_section(
+                    repository, TEMPLATES.repository_failed.template
+                )
+                state = TEMPLATES.progress_failed.template
+
+        if progress:
+            await progress.update(repository_label(repository), state)
+
+        return section
+
+    return list(await asyncio.gather(*map(process, repositories)))
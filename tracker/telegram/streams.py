@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+from weakref import WeakValueDictionary
+
+import redis.asyncio as redis
+from aiogram import Bot, Dispatcher
+from aiohttp import web
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+UPDATES_STREAM = "telegram:updates:{shard}"
+CONSUMER_GROUP = "bot-workers"
+CONSUMER_NAME = "shard-{shard}"
+WEBHOOK_SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+def get_redis() -> redis.Redis:
+    """
+    Returns an asyncio Redis client for the configured REDIS_URL.
+    :return: redis.asyncio.Redis
+    """
+    return redis.from_url(settings.REDIS_URL)
+
+
+def update_chat_id(update: dict) -> int:
+    """
+    Returns the id of the chat an update belongs to, 0 if there is none.
+    :param update: raw Telegram update
+    :return: int
+    """
+    for event in update.values():
+        if not isinstance(event, dict):
+            continue
+
+        chat = (
+            event.get("chat")
+            or event.get("message", dict()).get("chat")
+            or event.get("from")
+        )
+        if chat:
+            return chat.get("id", 0)
+
+    return 0
+
+
+def shard_for(update: dict) -> int:
+    """
+    Returns the stream shard of an update.
+    All updates of a chat go to the same shard, which keeps them in order.
+    :param update: raw Telegram update
+    :return: int
+    """
+    return abs(update_chat_id(update)) % settings.BOT_WORKERS
+
+
+async def publish_update(client: redis.Redis, update: dict) -> None:
+    """
+    Appends an update to the stream of its shard.
+    :param client: redis.asyncio.Redis
+    :param update: raw Telegram update
+    :return: None
+    """
+    await client.xadd(
+        UPDATES_STREAM.format(shard=shard_for(update)),
+        {"update": json.dumps(update)},
+        maxlen=settings.BOT_STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+def create_webhook_app(client: redis.Redis) -> web.Application:
+    """
+    Builds the webhook receiver pushing Telegram updates into Redis streams.
+    :param client: redis.asyncio.Redis
+    :return: aiohttp.web.Application
+    """
+
+    async def receive_update(request: web.Request) -> web.Response:
+        if request.headers.get(WEBHOOK_SECRET_HEADER) != settings.BOT_WEBHOOK_SECRET:
+            return web.Response(status=403)
+
+        await publish_update(client, await request.json())
+
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post(settings.BOT_WEBHOOK_PATH, receive_update)
+
+    return app
+
+
+async def run_webhook_receiver(bot: Bot) -> None:
+    """
+    Registers the webhook and serves it until cancelled.
+    :param bot: aiogram.Bot
+    :return: None
+    """
+    client = get_redis()
+    runner = web.AppRunner(create_webhook_app(client))
+
+    await bot.set_webhook(
+        url=settings.BOT_WEBHOOK_URL + settings.BOT_WEBHOOK_PATH,
+        secret_token=settings.BOT_WEBHOOK_SECRET,
+    )
+    await runner.setup()
+    await web.TCPSite(
+        runner, settings.BOT_WEBHOOK_HOST, settings.BOT_WEBHOOK_PORT
+    ).start()
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        await client.aclose()
+
+
+async def consume_updates(dp: Dispatcher, bot: Bot, shard: int) -> None:
+    """
+    Feeds the updates of a shard into the dispatcher until cancelled.
+
+    Updates of different chats are handled concurrently, up to
+    `settings.BOT_WORKER_CONCURRENCY`, while updates of the same chat wait
+    for each other. An entry is acknowledged once it has been handled, so
+    entries left pending by a crashed worker are handled again on restart.
+
+    :param dp: aiogram.Dispatcher
+    :param bot: aiogram.Bot
+    :param shard: index of the stream to consume
+    :return: None
+    """
+    client = get_redis()
+    stream = UPDATES_STREAM.format(shard=shard)
+    consumer = CONSUMER_NAME.format(shard=shard)
+    semaphore = asyncio.Semaphore(settings.BOT_WORKER_CONCURRENCY)
+    chat_locks = WeakValueDictionary()
+    tasks = set()
+
+    try:
+        await client.xgroup_create(stream, CONSUMER_GROUP, id="0", mkstream=True)
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+    async def handle(entry_id: bytes, update: dict, lock: asyncio.Lock) -> None:
+        async with lock, semaphore:
+            try:
+                await dp.feed_raw_update(bot, update)
+            except Exception as e:
+                logger.exception(e)
+
+        await client.xack(stream, CONSUMER_GROUP, entry_id)
+
+    # Entries delivered before a restart are handled first, then new ones.
+    pending_id = "0"
+
+    try:
+        while True:
+            # Do not read further ahead than the handlers can keep up with.
+            while len(tasks) >= settings.BOT_WORKER_CONCURRENCY * 2:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+            response = await client.xreadgroup(
+                CONSUMER_GROUP,
+                consumer,
+                {stream: pending_id or ">"},
+                count=settings.BOT_STREAM_BATCH,
+                block=settings.BOT_STREAM_BLOCK_MS,
+            )
+            entries = response[0][1] if response else []
+
+            if pending_id:
+                if not entries:
+                    pending_id = None
+                    continue
+                pending_id = entries[-1][0]
+
+            for entry_id, fields in entries:
+                update = json.loads(fields[b"update"])
+                chat_id = update_chat_id(update)
+
+                lock = chat_locks.get(chat_id)
+                if lock is None:
+                    lock = chat_locks[chat_id] = asyncio.Lock()
+
+                task = asyncio.create_task(handle(entry_id, update, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if pending_id:
+                await asyncio.gather(*tasks)
+    finally:
+        await client.aclose()
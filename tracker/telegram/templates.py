@@ -13,6 +13,32 @@ class TemplateNames:
     issue_summary: Template
     no_issues: Template
     issue_list_item: Template
+    page_footer: Template
+    report_expired: Template
+    progress_header: Template
+    progress_line: Template
+    progress_pending: Template
+    progress_done: Template
+    progress_timeout: Template
+    progress_failed: Template
+    repository_timeout: Template
+    repository_failed: Template
+    leaderboard_header: Template
+    leaderboard_line: Template
+    leaderboard_empty: Template
+    stale_data: Template
+    github_unavailable: Template
+    notify_usage: Template
+    notify_updated: Template
+    quiet_usage: Template
+    quiet_updated: Template
+    quiet_disabled: Template
+    not_linked: Template
+    stats_usage: Template
+    stats_header: Template
+    stats_line: Template
+    stats_contributors_header: Template
+    stats_empty: Template
 
 
 TEMPLATES = TemplateNames(
@@ -40,5 +66,47 @@ TEMPLATES = TemplateNames(
         "$issue\n"
         "-----------------------------------\n"
     ),
-
+    page_footer=Template("\nPage $page/$total"),
+    report_expired=Template("This report has expired, please request it again."),
+    progress_header=Template("Working on $total repositories… ($done/$total done)\n\n"),
+    progress_line=Template("$state $repo\n"),
+    progress_pending=Template("⏳"),
+    progress_done=Template("✅ ($count)"),
+    progress_timeout=Template("⚠️ timed out"),
+    progress_failed=Template("❌ failed"),
+    repository_timeout=Template("GitHub took too long to respond, try again later.\n"),
+    repository_failed=Template("Could not load this repository, try again later.\n"),
+    leaderboard_header=Template("<b>Leaderboard</b>\n\n"),
+    leaderboard_line=Template(
+        "$rank. <b>$login</b> — $score pts\n"
+        "\t\t\t\t✅ $completed 🔀 $merged 👀 $reviews ⏰ $missed\n"
+    ),
+    leaderboard_empty=Template("No activity has been tracked yet.\n"),
+    stale_data=Template(
+        "⚠️ GitHub is unavailable, showing data from $minutes minutes ago.\n\n"
+    ),
+    github_unavailable=Template(
+        "⚠️ GitHub is unavailable, this data may be incomplete.\n\n"
+    ),
+    notify_usage=Template("Usage: /notify immediate|hourly|daily"),
+    notify_updated=Template("Review notifications: <b>$mode</b>."),
+    quiet_usage=Template("Usage: /quiet 22-7 (UTC hours) or /quiet off"),
+    quiet_updated=Template(
+        "Notifications are held from $start:00 to $end:00 UTC "
+        "and sent in one message afterwards."
+    ),
+    quiet_disabled=Template("Quiet hours are off."),
+    not_linked=Template(
+        "Open the link from the admin panel to link your account first."
+    ),
+    stats_usage=Template("Usage: /stats week|month|quarter"),
+    stats_header=Template("<b>Statistics of the last $days days</b>\n\n"),
+    stats_line=Template(
+        "<b>$name</b> — $assignments assignments\n"
+        "\t\t\t\tTime to PR: p50 $p50_pr, p90 $p90_pr\n"
+        "\t\t\t\tTime to close: p50 $p50_close, p90 $p90_close\n"
+        "\t\t\t\tDeadlines hit: $hit_rate\n"
+    ),
+    stats_contributors_header=Template("\n<b>Contributors</b>\n"),
+    stats_empty=Template("No assignments were recorded in this period.\n"),
 )
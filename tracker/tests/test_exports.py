@@ -0,0 +1,120 @@
+import django
+
+django.setup()
+
+import csv
+import io
+import json
+import warnings
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+
+from tracker.choices import Roles
+from tracker.exports import iter_report_rows, iter_repositories
+from tracker.models import CustomUser, Repository
+from tracker.records import Issue, User
+from tracker.resilience import StaleList
+
+
+def assignments(*args, **kwargs) -> list[tuple[Issue, bool]]:
+    """
+    Returns the assignments of a repository: one missed deadline and one
+    assignee who has opened a pull request.
+    :return: list of (issue, has_pull_request) pairs
+    """
+    return [
+        (Issue(number=1, title="late", assignee=User(login="slow"), days=3), False),
+        (Issue(number=2, title="busy", assignee=User(login="fast"), days=3), True),
+    ]
+
+
+@patch("tracker.exports.get_assignments", side_effect=assignments)
+class TestAssignmentsExport(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.lead = CustomUser.objects.create_superuser(
+            email="lead@example.com", password="password", role=Roles.PROJECT_LEAD
+        )
+        for index in range(3):
+            Repository.objects.create(
+                user=self.lead,
+                author="owner",
+                name=f"repo{index}",
+                link=f"https://github.com/owner/repo{index}",
+            )
+
+    def test_csv_streamed(self, get_assignments):
+        """Test the endpoint streams a CSV row per assignment."""
+        self.client.force_login(self.lead)
+
+        response = self.client.get(reverse("assignments_export"), {"format": "csv"})
+
+        self.assertTrue(response.streaming)
+        rows = list(csv.DictReader(io.StringIO(b"".join(response).decode())))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(
+            (rows[0]["repository"], rows[0]["assignee"], rows[0]["missed_deadline"]),
+            ("owner/repo0", "slow", "True"),
+        )
+        self.assertEqual(rows[1]["missed_deadline"], "False")
+
+    def test_json_streamed(self, get_assignments):
+        """Test the JSON export is a valid array of rows."""
+        self.client.force_login(self.lead)
+
+        response = self.client.get(reverse("assignments_export"), {"format": "json"})
+
+        rows = json.loads(b"".join(response))
+        self.assertEqual([row["number"] for row in rows], [1, 2] * 3)
+
+    def test_export_forbidden_for_anonymous(self, get_assignments):
+        """Test anonymous users cannot export reports."""
+        response = self.client.get(reverse("assignments_export"))
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_rows_computed_lazily(self, get_assignments):
+        """Test a repository is only processed when its rows are consumed."""
+        rows = iter_report_rows(iter_repositories(Repository.objects.all()))
+
+        next(rows)
+
+        get_assignments.assert_called_once()
+
+    def test_stale_rows_marked(self, get_assignments):
+        """Test rows computed from the last known GitHub data are marked stale."""
+        get_assignments.side_effect = lambda **kwargs: StaleList(assignments(), 10.0)
+
+        rows = list(iter_report_rows(iter_repositories(Repository.objects.all())))
+
+        self.assertTrue(all(row["stale"] for row in rows))
+
+    def test_admin_action(self, get_assignments):
+        """Test the admin action exports the selected repositories only."""
+        self.client.force_login(self.lead)
+        selected = Repository.objects.order_by("created_at")[:1]
+
+        response = self.client.post(
+            reverse("admin:tracker_repository_changelist"),
+            {"action": "export_csv", "_selected_action": [selected[0].pk]},
+        )
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(len(b"".join(response).decode().splitlines()), 3)
+
+    async def test_streamed_under_asgi(self, get_assignments):
+        """Test ASGI serves the rows as they are computed, not buffered first."""
+        await self.async_client.aforce_login(self.lead)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            response = await self.async_client.get(
+                reverse("assignments_export"), {"format": "csv"}
+            )
+            chunks = [chunk async for chunk in response]
+
+        self.assertTrue(response.is_async)
+        self.assertEqual(len(chunks), 7)
+        self.assertEqual(len(b"".join(chunks).decode().splitlines()), 7)
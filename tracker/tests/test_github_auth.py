@@ -0,0 +1,153 @@
+import django
+
+django.setup()
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from tracker.github_auth import (
+    GitHubAuth,
+    InstallationTokenPool,
+    get_token_usage,
+    owner_from_url,
+)
+
+
+def prepare(url: str, auth: GitHubAuth) -> requests.PreparedRequest:
+    """
+    Prepares a GET request with the given authentication.
+    :param url: str
+    :param auth: GitHubAuth
+    :return: requests.PreparedRequest
+    """
+    return requests.Request("GET", url, auth=auth).prepare()
+
+
+class TestGitHubAuth(TestCase):
+    def test_owner_from_url(self):
+        """Test the repository owner is taken from API URLs."""
+        self.assertEqual(
+            owner_from_url("https://api.github.com/repos/Org/repo/issues"), "org"
+        )
+        self.assertEqual(owner_from_url("https://api.github.com/rate_limit"), "")
+
+    def test_requests_routed_by_owner(self):
+        """Test installation tokens are used for their owners only."""
+        pool = MagicMock()
+        pool.token_for.side_effect = lambda owner: "app" if owner == "org" else None
+        auth = GitHubAuth(pool, "personal")
+
+        installed = prepare("https://api.github.com/repos/org/repo/issues", auth)
+        other = prepare("https://api.github.com/repos/user/repo/issues", auth)
+
+        self.assertEqual(installed.headers["Authorization"], "Bearer app")
+        self.assertEqual(other.headers["Authorization"], "Bearer personal")
+
+    def test_usage_recorded_per_token(self):
+        """Test the reported rate limit is stored under the token label."""
+        auth = GitHubAuth(None, "personal")
+        request = prepare("https://api.github.com/repos/user/repo/issues", auth)
+        response = requests.Response()
+        response.headers.update(
+            {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4999"}
+        )
+
+        request.hooks["response"][0](response)
+
+        self.assertEqual(get_token_usage()["token"]["remaining"], 4999)
+
+
+@override_settings(GITHUB_APP_TOKEN_REFRESH_MARGIN=300)
+class TestInstallationTokenPool(TestCase):
+    def setUp(self):
+        self.pool = InstallationTokenPool("1", "key")
+        self.pool.app_headers = MagicMock(return_value={})
+        self.pool.http = MagicMock()
+        self.pool.http.get.return_value.json.return_value = [
+            {"id": 7, "account": {"login": "Org"}}
+        ]
+        self.pool.http.get.return_value.links = {}
+
+    def tearDown(self):
+        cache.clear()
+
+    def mint(self, expires_in: int) -> None:
+        """
+        Makes the next minted token expire in the given number of seconds.
+        :param expires_in: int
+        :return: None
+        """
+        expires_at = time.strftime(
+            "%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + expires_in)
+        )
+        self.pool.http.post.return_value.json.return_value = {
+            "token": f"token-{expires_in}",
+            "expires_at": expires_at,
+        }
+
+    def test_token_minted_once(self):
+        """Test a fresh token is reused until it nears its expiry."""
+        self.mint(3600)
+
+        self.assertEqual(self.pool.token_for("org"), "token-3600")
+        self.assertEqual(self.pool.token_for("org"), "token-3600")
+        self.assertIsNone(self.pool.token_for("elsewhere"))
+        self.pool.http.post.assert_called_once()
+
+    def test_token_refreshed_before_expiry(self):
+        """Test a token within the refresh margin is replaced."""
+        self.mint(3600)
+        self.pool.token_for("org")
+        self.pool.tokens[7].expires_at = time.time() + 60
+        cache.clear()
+        self.mint(7200)
+
+        self.assertEqual(self.pool.token_for("org"), "token-7200")
+
+    def test_failed_installations_load_retried(self):
+        """Test a failed installations load is not cached as no installation."""
+        self.mint(3600)
+        self.pool.http.get.return_value.raise_for_status.side_effect = (
+            requests.ConnectionError
+        )
+
+        self.assertIsNone(self.pool.token_for("org"))
+
+        self.pool.http.get.return_value.raise_for_status.side_effect = None
+
+        self.assertEqual(self.pool.token_for("org"), "token-3600")
+
+    def test_minting_does_not_block_other_installations(self):
+        """Test a slow token request only holds up its own installation."""
+        self.pool.http.get.return_value.json.return_value = [
+            {"id": 7, "account": {"login": "Org"}},
+            {"id": 8, "account": {"login": "Other"}},
+        ]
+        self.mint(3600)
+        minting, released = threading.Event(), threading.Event()
+        timed_out = list()
+        mint_token = self.pool.mint_token
+
+        def slow_mint(installation_id: int):
+            if installation_id == 7:
+                minting.set()
+                timed_out.append(not released.wait(2))
+            return mint_token(installation_id)
+
+        self.pool.mint_token = slow_mint
+        slow = threading.Thread(target=self.pool.token_for, args=("org",))
+        slow.start()
+        minting.wait(2)
+
+        try:
+            self.assertEqual(self.pool.token_for("other"), "token-3600")
+        finally:
+            released.set()
+            slow.join()
+
+        self.assertEqual(timed_out, [False])
@@ -0,0 +1,119 @@
+import django
+
+django.setup()
+
+from datetime import datetime, timedelta, timezone
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from tracker.choices import HistoryKind, Roles
+from tracker.history import compute_stats, get_period_stats, percentile
+from tracker.models import CustomUser, IssueHistory, Repository
+from tracker.values import SECONDS_IN_AN_HOUR
+
+NOW = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+class TestIssueStats(TestCase):
+    def setUp(self):
+        """Set up a repository with three assignments, two of them answered by a pull request."""
+        cache.clear()
+        self.lead = CustomUser.objects.create_superuser(
+            email="lead@example.com", password="password", role=Roles.PROJECT_LEAD
+        )
+        repository = Repository.objects.create(
+            user=self.lead,
+            author="owner",
+            name="repo",
+            link="https://github.com/owner/repo",
+            time_limit=2 * SECONDS_IN_AN_HOUR,
+        )
+        self.tracked_id = str(repository.tracked_id)
+
+        def entry(number, kind, login, hours):
+            return IssueHistory(
+                tracked_id=self.tracked_id,
+                number=number,
+                kind=kind,
+                login=login,
+                occurred_at=NOW - timedelta(days=1) + timedelta(hours=hours),
+            )
+
+        IssueHistory.objects.bulk_create(
+            [
+                entry(1, HistoryKind.ASSIGNED, "fast", 0),
+                entry(101, HistoryKind.PULL_REQUEST, "fast", 1),
+                entry(1, HistoryKind.CLOSED, "fast", 1),
+                entry(2, HistoryKind.ASSIGNED, "slow", 0),
+                entry(102, HistoryKind.PULL_REQUEST, "slow", 3),
+                entry(2, HistoryKind.CLOSED, "slow", 4),
+                entry(3, HistoryKind.ASSIGNED, "idle", 0),
+            ]
+        )
+
+    def test_percentile(self):
+        """Test percentiles interpolate between ranks."""
+        self.assertIsNone(percentile([], 0.5))
+        self.assertEqual(percentile([1.0, 3.0], 0.5), 2.0)
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0, 5.0], 0.9), 4.6)
+
+    def test_compute_stats(self):
+        """Test the percentiles and the hit rate of a repository and a contributor."""
+        stats = compute_stats(NOW - timedelta(days=7), NOW)
+        repository = stats["repositories"][self.tracked_id]
+
+        self.assertEqual(repository["label"], "owner/repo")
+        self.assertEqual(repository["assignments"], 3)
+        self.assertEqual(repository["p50_time_to_pr"], 2 * SECONDS_IN_AN_HOUR)
+        self.assertEqual(repository["p90_time_to_pr"], 2.8 * SECONDS_IN_AN_HOUR)
+        self.assertEqual(repository["deadline_hit_rate"], 1 / 3)
+        self.assertEqual(
+            stats["contributors"]["slow"]["p50_time_to_close"], 4 * SECONDS_IN_AN_HOUR
+        )
+        self.assertIsNone(stats["contributors"]["idle"]["p50_time_to_pr"])
+
+    def test_cached_stats(self):
+        """Test the stats of a period are read from the cache after the first call."""
+        stats = get_period_stats("quarter")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_period_stats("quarter"), stats)
+
+    def test_admin_chart(self):
+        """Test the admin change list renders the chart without edit rights."""
+        self.client.force_login(self.lead)
+        response = self.client.get(reverse("admin:tracker_issuehistory_changelist"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "issue-stats-chart")
+        self.assertEqual(
+            self.client.get(reverse("admin:tracker_issuehistory_add")).status_code, 403
+        )
+
+    def test_admin_limited_to_tracked_repositories(self):
+        """Test leads only see the history and chart of their own repositories."""
+        other = CustomUser.objects.create_superuser(
+            email="other@example.com", password="password", role=Roles.PROJECT_LEAD
+        )
+        Repository.objects.create(
+            user=other,
+            author="other",
+            name="private",
+            link="https://github.com/other/private",
+        )
+
+        self.client.force_login(other)
+        response = self.client.get(reverse("admin:tracker_issuehistory_changelist"))
+
+        self.assertEqual(response.context["chart"], [])
+        self.assertEqual(response.context["cl"].result_count, 0)
+
+        self.client.force_login(self.lead)
+        response = self.client.get(reverse("admin:tracker_issuehistory_changelist"))
+
+        self.assertEqual(
+            [row["label"] for row in response.context["chart"]], ["owner/repo"]
+        )
+        self.assertEqual(response.context["cl"].result_count, 7)
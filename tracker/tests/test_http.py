@@ -0,0 +1,35 @@
+import django
+
+django.setup()
+
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from tracker import http
+from tracker.github_auth import GitHubAuth
+
+
+class TestGetSession(TestCase):
+    def test_session_is_shared(self):
+        """Test the same pooled session is returned for every call."""
+        session = http.get_session()
+
+        self.assertIs(http.get_session(), session)
+        self.assertIsInstance(session.auth, GitHubAuth)
+
+    def test_session_recreated_after_fork(self):
+        """Test a forked process does not reuse its parent's session."""
+        session = http.get_session()
+
+        with patch("tracker.http.os.getpid", return_value=-1):
+            self.assertIsNot(http.get_session(), session)
+
+    def test_default_timeout_applied(self):
+        """Test requests get a timeout unless the caller passes one."""
+        session = http.GitHubSession()
+
+        with patch("requests.Session.request") as request:
+            session.get("https://api.github.com")
+
+        self.assertIsNotNone(request.call_args.kwargs["timeout"])
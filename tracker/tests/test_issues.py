@@ -0,0 +1,137 @@
+import django
+
+django.setup()
+
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from tracker.issues import (
+    classify_issues,
+    get_classified_issues,
+    issues_cache_key,
+    issues_listing_url,
+    refresh_classified_issues,
+)
+from tracker.records import ISSUES_DECODER
+
+ISSUES_PAYLOAD = [
+    {"number": 1, "state": "open", "assignee": None, "body": "..."},
+    {"number": 2, "state": "open", "assignee": {"login": "octocat", "id": 1}},
+    {"number": 3, "state": "open", "draft": True},
+    {"number": 4, "state": "open", "pull_request": {"url": "..."}},
+    {"number": 5, "state": "closed", "assignee": None},
+]
+ISSUES = ISSUES_DECODER.decode(json.dumps(ISSUES_PAYLOAD))
+
+
+class TestClassifyIssues(TestCase):
+    def test_classify_issues(self):
+        """Test every issue lands in exactly one bucket."""
+        buckets = classify_issues(ISSUES)
+
+        self.assertEqual([issue.number for issue in buckets.available], [1])
+        self.assertEqual([issue.number for issue in buckets.assigned], [2])
+        self.assertEqual([issue.number for issue in buckets.draft], [3])
+        self.assertEqual([issue.number for issue in buckets.pull_requests], [4])
+
+
+class TestGetClassifiedIssues(TestCase):
+    def tearDown(self):
+        cache.clear()
+
+    @patch("tracker.issues.get_session")
+    def test_listing_fetched_once(self, get_session):
+        """Test both reports of a repository share one GitHub request."""
+        get_session.return_value.get.return_value = MagicMock(
+            content=json.dumps(ISSUES_PAYLOAD).encode()
+        )
+        url = "https://api.github.com/repos/owner/repo/issues"
+
+        available = get_classified_issues(url).available
+        assigned = get_classified_issues(url).assigned
+
+        self.assertEqual(len(available), 1)
+        self.assertEqual(len(assigned), 1)
+        get_session.return_value.get.assert_called_once()
+
+    @override_settings(ISSUES_CACHE_TTL=60)
+    @patch("tracker.tasks.refresh_repository_issues.delay")
+    @patch("tracker.issues.get_session")
+    def test_stale_listing_served_while_refreshing(self, get_session, refresh):
+        """Test a stale listing is returned at once and refreshed in background."""
+        url = "https://api.github.com/repos/owner/repo/issues"
+        stale = classify_issues(ISSUES)
+        cache.set(
+            issues_cache_key(url), {"buckets": stale, "fetched_at": time.time() - 120}
+        )
+
+        self.assertEqual(get_classified_issues(url), stale)
+        self.assertEqual(get_classified_issues(url), stale)
+
+        get_session.return_value.get.assert_not_called()
+        refresh.assert_called_once_with(url)
+
+    @patch("tracker.issues.get_session")
+    def test_failed_refresh_keeps_cached_listing(self, get_session):
+        """Test a failing refresh serves the last known listing marked stale."""
+        url = "https://api.github.com/repos/owner/repo/issues"
+        cached = classify_issues(ISSUES)
+        cache.set(issues_cache_key(url), {"buckets": cached, "fetched_at": 10.0})
+        get_session.return_value.get.side_effect = requests.ConnectionError
+
+        buckets = refresh_classified_issues(url)
+
+        self.assertEqual(buckets.assigned, cached.assigned)
+        self.assertEqual((buckets.stale, buckets.fetched_at), (True, 10.0))
+
+    @patch("tracker.issues.get_session")
+    def test_failed_cold_fetch_is_stale(self, get_session):
+        """Test a failing fetch without a known listing is not reported as empty."""
+        get_session.return_value.get.side_effect = requests.ConnectionError
+
+        buckets = get_classified_issues("https://api.github.com/repos/a/b/issues")
+
+        self.assertEqual((buckets.stale, buckets.fetched_at), (True, 0.0))
+
+
+class TestIssuesListingUrl(TestCase):
+    def test_filters_become_query_parameters(self):
+        """Test repository filters are pushed down into the GitHub query."""
+        url = issues_listing_url(
+            {
+                "author": "owner",
+                "name": "repo",
+                "labels": "ODHack, good first issue",
+                "milestone": "3",
+            },
+            assigned=False,
+        )
+
+        self.assertEqual(
+            url,
+            "https://api.github.com/repos/owner/repo/issues?state=open"
+            "&labels=ODHack%2Cgood+first+issue&milestone=3&assignee=none",
+        )
+
+    def test_no_filters(self):
+        """Test a repository without filters lists all open assigned issues."""
+        url = issues_listing_url({"author": "owner", "name": "repo"}, assigned=True)
+
+        self.assertEqual(
+            url,
+            "https://api.github.com/repos/owner/repo/issues?state=open&assignee=%2A",
+        )
+
+    def test_invalid_milestone_ignored(self):
+        """Test a milestone GitHub would reject is not sent."""
+        url = issues_listing_url(
+            {"author": "owner", "name": "repo", "milestone": "v1&state=closed"},
+            assigned=True,
+        )
+
+        self.assertNotIn("milestone", url)
@@ -0,0 +1,126 @@
+import django
+
+django.setup()
+
+import json
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from tracker.choices import ActivityKind, Roles
+from tracker.issues import IssueBuckets
+from tracker.leaderboard import (
+    get_leaderboard_page,
+    record_activity,
+    sync_repository_activity,
+)
+from tracker.models import CustomUser, LeaderboardEntry
+
+REPOSITORY = {"author": "owner", "name": "repo", "time_limit": 86400}
+CLOSED_PAYLOAD = [
+    {
+        "number": 1,
+        "state": "closed",
+        "state_reason": "completed",
+        "closed_at": "2024-10-01T12:00:00Z",
+        "updated_at": "2024-10-01T12:00:00Z",
+        "assignee": {"login": "fast"},
+    },
+    {
+        "number": 2,
+        "state": "closed",
+        "state_reason": "completed",
+        "closed_at": "2024-10-05T00:00:00Z",
+        "updated_at": "2024-10-05T00:00:00Z",
+        "assignee": {"login": "slow"},
+    },
+    {
+        "number": 3,
+        "state": "closed",
+        "updated_at": "2024-10-06T00:00:00Z",
+        "user": {"login": "fast"},
+        "pull_request": {"url": "...", "merged_at": "2024-10-06T00:00:00Z"},
+    },
+]
+
+
+class TestRecordActivity(TestCase):
+    def test_activity_counted_once(self):
+        """Test the same activity never changes the leaderboard twice."""
+        self.assertTrue(record_activity(ActivityKind.REVIEW_RECEIVED, "review:1", "a"))
+        self.assertFalse(record_activity(ActivityKind.REVIEW_RECEIVED, "review:1", "a"))
+        record_activity(ActivityKind.DEADLINE_MISSED, "deadline:1", "a")
+
+        entry = LeaderboardEntry.objects.get(login="a")
+        self.assertEqual((entry.reviews_received, entry.deadlines_missed), (1, 1))
+        self.assertEqual(entry.score, -4)
+
+    def test_leaderboard_page_ranks(self):
+        """Test a page is numbered from its offset in score order."""
+        for index, login in enumerate(["c", "a", "b"]):
+            for number in range(index + 1):
+                record_activity(
+                    ActivityKind.PULL_REQUEST_MERGED, f"merged:{login}{number}", login
+                )
+
+        page = get_leaderboard_page(1, 2)
+
+        self.assertEqual(
+            [(entry.rank, entry.login) for entry in page], [(2, "a"), (3, "c")]
+        )
+
+
+class TestSyncRepositoryActivity(TestCase):
+    def tearDown(self):
+        cache.clear()
+
+    @patch("tracker.leaderboard.get_classified_issues", return_value=IssueBuckets())
+    @patch(
+        "tracker.leaderboard.check_issue_assignment_events",
+        return_value="2024-10-01T00:00:00Z",
+    )
+    @patch("tracker.leaderboard.get_session")
+    def test_sync_records_closed_items(self, get_session, events, listing):
+        """Test closed issues and merged pull requests are credited once."""
+        get_session.return_value.get.return_value = MagicMock(
+            content=json.dumps(CLOSED_PAYLOAD).encode()
+        )
+
+        sync_repository_activity(REPOSITORY)
+        sync_repository_activity(REPOSITORY)
+
+        fast = LeaderboardEntry.objects.get(login="fast")
+        slow = LeaderboardEntry.objects.get(login="slow")
+        self.assertEqual((fast.issues_completed, fast.pull_requests_merged), (1, 1))
+        self.assertEqual((slow.issues_completed, slow.deadlines_missed), (0, 1))
+
+        params = get_session.return_value.get.call_args.kwargs["params"]
+        self.assertEqual(params["since"], "2024-10-06T00:00:00Z")
+
+
+class TestLeaderboardAdmin(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        lead = CustomUser.objects.create_superuser(
+            email="lead@example.com", password="password", role=Roles.PROJECT_LEAD
+        )
+        self.client.force_login(lead)
+
+        for number in range(3):
+            record_activity(ActivityKind.ISSUE_COMPLETED, f"completed:{number}", "top")
+        record_activity(ActivityKind.REVIEW_RECEIVED, "review:1", "second")
+
+    @patch("tracker.admin.LeaderboardEntryAdmin.list_per_page", 1)
+    def test_changelist_ranks_page(self):
+        """Test the second page of the admin shows the second entry ranked 2."""
+        response = self.client.get(
+            reverse("admin:tracker_leaderboardentry_changelist"), {"p": 2}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(entry.rank, entry.login) for entry in response.context["cl"].result_list],
+            [(2, "second")],
+        )
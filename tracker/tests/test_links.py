@@ -0,0 +1,99 @@
+import django
+
+django.setup()
+
+import json
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from tracker.links import closing_references, get_link_index
+from tracker.records import Issue, LinkedPullRequest, User
+
+REPOSITORY_URL = "https://api.github.com/repos/owner/repo"
+PULLS_URL = f"{REPOSITORY_URL}/pulls"
+
+
+def issue(number: int, assignee: str) -> Issue:
+    """
+    Returns an assigned issue of the repository.
+    :param number: the issue number
+    :param assignee: the assignee login
+    :return: Issue
+    """
+    return Issue(
+        number=number,
+        repository_url=REPOSITORY_URL,
+        assignee=User(login=assignee),
+        updated_at="2024-10-01T00:00:00Z",
+    )
+
+
+def timeline(*pull_numbers: int) -> MagicMock:
+    """
+    Returns a fake timeline page cross-referenced by pull requests.
+    :param pull_numbers: the referencing pull requests
+    :return: MagicMock
+    """
+    events = [
+        {
+            "event": "cross-referenced",
+            "source": {
+                "issue": {
+                    "number": number,
+                    "repository_url": REPOSITORY_URL,
+                    "pull_request": {"url": f"{PULLS_URL}/{number}"},
+                }
+            },
+        }
+        for number in pull_numbers
+    ]
+    return MagicMock(content=json.dumps(events).encode(), links=dict())
+
+
+@patch("tracker.links.get_page")
+@patch("tracker.links.fetch_records")
+class TestLinkIndex(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.issues = [issue(1, "busy"), issue(2, "busy"), issue(3, "other")]
+
+    def test_closing_references(self, fetch_records, get_page):
+        """Test closing keywords of the repository itself are recognized."""
+        body = "Fixes #1, closes owner/repo#2, resolves other/repo#3, see #4"
+
+        self.assertEqual(closing_references(body, "owner/repo"), {1, 2})
+        self.assertEqual(closing_references(None, "owner/repo"), set())
+
+    def test_links_per_issue(self, fetch_records, get_page):
+        """Test a contributor with several issues only has the linked ones covered."""
+        fetch_records.return_value = [
+            LinkedPullRequest(number=10, user=User(login="busy"), body="Fixes #1"),
+            LinkedPullRequest(number=11, user=User(login="other"), body="WIP"),
+        ]
+        get_page.side_effect = [timeline(), timeline(), timeline(11)]
+
+        index = get_link_index(PULLS_URL, self.issues)
+
+        self.assertEqual(
+            [index.has_pull_request(issue) for issue in self.issues],
+            [True, False, True],
+        )
+        self.assertEqual(index.pulls_for(3), {11})
+        self.assertEqual(index.issues_of("busy"), {1})
+
+    def test_refreshed_incrementally(self, fetch_records, get_page):
+        """Test an unchanged repository is answered from the index without requests."""
+        fetch_records.return_value = []
+        get_page.return_value = timeline()
+
+        get_link_index(PULLS_URL, self.issues)
+        get_link_index(PULLS_URL, self.issues)
+
+        fetch_records.assert_called_once()
+        self.assertEqual(get_page.call_count, 3)
+
+        self.issues[0].updated_at = "2024-10-02T00:00:00Z"
+        get_link_index(PULLS_URL, self.issues)
+        self.assertEqual(get_page.call_count, 4)
@@ -0,0 +1,41 @@
+import django
+
+django.setup()
+
+from importlib import import_module
+
+from django.apps import apps
+from django.test import TestCase
+from django_celery_beat.models import IntervalSchedule, PeriodicTask
+
+retire_approval_tasks = import_module(
+    "tracker.migrations.0010_retire_approval_tasks"
+).retire_approval_tasks
+
+
+class TestRetireApprovalTasks(TestCase):
+    def setUp(self):
+        """Set up the per-user approval task of the baseline and an unrelated task."""
+        schedule = IntervalSchedule.objects.create(
+            every=3600, period=IntervalSchedule.SECONDS
+        )
+        PeriodicTask.objects.create(
+            name="user_7f1c4e2a-0000-4000-8000-000000000000_approval_task",
+            task="core.tasks.fetch_approvals",
+            interval=schedule,
+            args='["123456"]',
+        )
+        PeriodicTask.objects.create(
+            name="sync_approval_task",
+            task="tracker.tasks.sync_leaderboard",
+            interval=schedule,
+        )
+
+    def test_per_user_approval_tasks_deleted(self):
+        """Test the baseline per-user approval tasks are deleted, others are kept."""
+        retire_approval_tasks(apps, None)
+
+        self.assertEqual(
+            list(PeriodicTask.objects.values_list("name", flat=True)),
+            ["sync_approval_task"],
+        )
@@ -2,10 +2,14 @@ import django
 
 django.setup()
 
+from unittest.mock import patch
+
 from django.test import TestCase
 from faker import Faker
 
-from tracker.models import CustomUser
+from django.core.exceptions import ValidationError
+
+from tracker.models import CustomUser, Repository, TrackedRepository
 from tracker.choices import Roles
 
 fake = Faker()
@@ -59,3 +63,56 @@ class TestCustomUserManager(TestCase):
             )
         
         self.assertEqual(str(context.exception), "Invalid email format")
+
+
+class TestTrackedRepository(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.first = CustomUser.objects.create_user(email=fake.email())
+        self.second = CustomUser.objects.create_user(email=fake.email())
+        self.repository = Repository.objects.create(
+            user=self.first,
+            author="Owner",
+            name="Repo",
+            link="https://github.com/Owner/Repo",
+        )
+
+    def test_subscribers_share_tracked_repository(self):
+        """Test every spelling of a repository links to one canonical entry."""
+        subscription = Repository.objects.create(
+            user=self.second,
+            author="owner",
+            name="repo",
+            link="https://github.com/owner/repo",
+            time_limit=60,
+        )
+
+        self.assertEqual(TrackedRepository.objects.count(), 1)
+        self.assertEqual(subscription.tracked_id, self.repository.tracked_id)
+        self.assertEqual((subscription.author, subscription.name), ("Owner", "Repo"))
+
+    @patch("tracker.models.validate_repository_link")
+    def test_other_spelling_stays_valid(self, validate_repository_link):
+        """Test a subscription saved with another spelling can still be edited."""
+        subscription = Repository.objects.create(
+            user=self.second,
+            author="owner",
+            name="repo",
+            link="https://github.com/owner/repo",
+        )
+        subscription.time_limit = 60
+
+        subscription.full_clean()
+        self.assertEqual(subscription.link, "https://github.com/Owner/Repo")
+
+    def test_duplicate_subscription_rejected(self):
+        """Test a user cannot track another spelling of the same repository."""
+        duplicate = Repository(
+            user=self.first,
+            author="owner",
+            name="repo",
+            link="https://github.com/owner/repo",
+        )
+
+        with self.assertRaisesMessage(ValidationError, "already tracked"):
+            duplicate.clean()
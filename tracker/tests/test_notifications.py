@@ -0,0 +1,132 @@
+import django
+
+django.setup()
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from tracker.choices import NotificationMode
+from tracker.models import CustomUser, PendingNotification, TelegramUser
+from tracker.tasks import (
+    aggregate_revisions,
+    flush_notification_digests,
+    send_notification_digest,
+)
+from tracker.telegram.client import MESSAGE_MAX_LENGTH, revision_messages
+
+REVISIONS = [
+    {
+        "repo": "repo",
+        "pull": "Fix",
+        "number": 1,
+        "pull_author": "author",
+        "reviews": [
+            {"id": 1, "user": {"login": "lead"}, "state": "APPROVED"},
+            {"id": 2, "user": {"login": "peer"}, "state": "COMMENTED"},
+        ],
+    }
+]
+
+
+class TestNotificationDigests(TestCase):
+    def setUp(self):
+        """Set up a Telegram user receiving hourly digests."""
+        user = CustomUser.objects.create_user(email="lead@example.com")
+        TelegramUser.objects.filter(user=user).update(
+            telegram_id="42", notification_mode=NotificationMode.HOURLY
+        )
+        self.telegram_user = TelegramUser.objects.get(user=user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_quiet_hours_wrap_around_midnight(self):
+        """Test quiet hours from 22 to 7 hold notifications at night only."""
+        self.telegram_user.quiet_hours_start = 22
+        self.telegram_user.quiet_hours_end = 7
+
+        self.assertTrue(self.telegram_user.is_quiet_at(23))
+        self.assertTrue(self.telegram_user.is_quiet_at(6))
+        self.assertFalse(self.telegram_user.is_quiet_at(7))
+
+    @patch("tracker.tasks.send_revision_notification.delay")
+    def test_reviews_buffered_once(self, send):
+        """Test digest users get reviews buffered without duplicates."""
+        aggregate_revisions([REVISIONS], "42")
+        aggregate_revisions([REVISIONS], "42")
+
+        send.assert_not_called()
+        self.assertEqual(PendingNotification.objects.count(), 2)
+
+    @patch("tracker.tasks.send_revision_notification.delay")
+    def test_pull_requests_with_the_same_title_buffered_apart(self, send):
+        """Test reviews are keyed by pull request number, not by its long title."""
+        title = "x" * 256
+        revisions = [
+            {**REVISIONS[0], "pull": title, "number": number} for number in (1, 2)
+        ]
+
+        aggregate_revisions([revisions], "42")
+
+        keys = PendingNotification.objects.values_list("key", flat=True)
+        self.assertEqual(len(keys), 4)
+        self.assertTrue(all(len(key) <= 255 for key in keys))
+
+    @patch("tracker.tasks.send_revision_notification.delay")
+    def test_immediate_mode_sends_right_away(self, send):
+        """Test immediate users outside quiet hours are not buffered."""
+        TelegramUser.objects.filter(telegram_id="42").update(
+            notification_mode=NotificationMode.IMMEDIATE
+        )
+
+        aggregate_revisions([REVISIONS], "42")
+
+        send.assert_called_once_with("42", REVISIONS)
+        self.assertFalse(PendingNotification.objects.exists())
+
+    @patch("tracker.tasks.send_revision_messages")
+    def test_digest_sent_once_per_window(self, send_messages):
+        """Test one consolidated message is sent per digest window."""
+        aggregate_revisions([REVISIONS], "42")
+        now = datetime(2024, 10, 1, 12, 0, 30, tzinfo=timezone.utc)
+
+        with (
+            patch("tracker.tasks.datetime") as clock,
+            patch("tracker.tasks.send_notification_digest.delay") as send,
+        ):
+            clock.now.return_value = now
+            flush_notification_digests()
+            flush_notification_digests()
+
+        send.assert_called_once_with("42")
+        send_notification_digest("42")
+
+        send_messages.assert_called_once()
+        telegram_id, revisions = send_messages.call_args.args
+        self.assertEqual(telegram_id, "42")
+        self.assertEqual(len(revisions), 1)
+        self.assertEqual(len(revisions[0]["reviews"]), 2)
+        self.assertFalse(PendingNotification.objects.exists())
+
+
+class TestRevisionMessages(TestCase):
+    def test_long_pull_request_split_between_reviews(self):
+        """Test a pull request too long for one message is split between its reviews."""
+        reviews = [
+            {"id": index, "user": {"login": f"reviewer{index}"}, "state": "APPROVED"}
+            for index in range(200)
+        ]
+        revisions = [{**REVISIONS[0], "reviews": reviews}] + REVISIONS
+
+        messages = revision_messages(revisions)
+
+        self.assertGreater(len(messages), 1)
+        self.assertTrue(all(len(message) <= MESSAGE_MAX_LENGTH for message in messages))
+        self.assertIn("reviewer0", messages[0])
+        self.assertEqual(
+            "".join(messages).count("User: <b>"),
+            len(reviews) + len(REVISIONS[0]["reviews"]),
+        )
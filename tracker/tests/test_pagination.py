@@ -0,0 +1,60 @@
+import django
+
+django.setup()
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+
+from tracker.telegram.pagination import (
+    ReportPage,
+    ReportSection,
+    load_report,
+    page_markup,
+    paginate,
+    store_report,
+)
+
+
+class TestPaginate(TestCase):
+    def setUp(self):
+        self.sections = [
+            ReportSection(
+                label="author/first",
+                header="first\n",
+                items=[f"issue {index}\n" for index in range(5)],
+            ),
+            ReportSection(label="author/second", header="second\n", empty="empty\n"),
+        ]
+
+    def test_paginate_splits_sections(self):
+        """Test every repository starts a page and items are chunked."""
+        pages = paginate(self.sections, page_size=2)
+
+        self.assertEqual(len(pages), 4)
+        self.assertEqual(pages[0]["text"], "first\nissue 0\nissue 1\n")
+        self.assertEqual(pages[2]["text"], "first\nissue 4\n")
+        self.assertEqual(
+            pages[3], {"label": "author/second", "text": "second\nempty\n"}
+        )
+
+    def test_page_markup_buttons(self):
+        """Test navigation and repository buttons point to the right pages."""
+        pages = paginate(self.sections, page_size=2)
+        markup = page_markup("cursor", pages, 1)
+        buttons = [button for row in markup.inline_keyboard for button in row]
+
+        targets = {
+            button.text: ReportPage.unpack(button.callback_data).page
+            for button in buttons
+        }
+        self.assertEqual(
+            targets,
+            {"◀️ prev": 0, "next ▶️": 2, "author/first": 0, "author/second": 3},
+        )
+
+    def test_store_and_load_report(self):
+        """Test a stored report can be loaded back by its cursor."""
+        cursor, pages = async_to_sync(store_report)(self.sections)
+
+        self.assertEqual(async_to_sync(load_report)(cursor), pages)
+        self.assertIsNone(async_to_sync(load_report)("missing"))
@@ -0,0 +1,109 @@
+import django
+
+django.setup()
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tracker.choices import ActivityKind, Roles
+from tracker.leaderboard import get_leaderboard, record_activity
+from tracker.models import Contributor, CustomUser, Repository, TelegramUser
+from tracker.utils import create_telegram_user, get_all_repostitories, get_user
+
+ROWS = 5
+
+
+class QueryBudgetTestCase(TestCase):
+    """
+    Query budgets of the hot paths. The data set has several rows of every
+    kind, so a budget fails as soon as a path issues a query per row.
+    """
+
+    def setUp(self):
+        """Set up test data."""
+        self.lead = CustomUser.objects.create_superuser(
+            email="lead@example.com", password="password", role=Roles.PROJECT_LEAD
+        )
+        TelegramUser.objects.filter(user=self.lead).update(telegram_id="1")
+
+        for index in range(ROWS):
+            Repository.objects.create(
+                user=self.lead,
+                author="owner",
+                name=f"repo{index}",
+                link=f"https://github.com/owner/repo{index}",
+            )
+            Contributor.objects.create(
+                user=CustomUser.objects.create_user(email=f"user{index}@example.com"),
+                notes="notes",
+            )
+            record_activity(
+                ActivityKind.PULL_REQUEST_MERGED, f"merged:{index}", f"{index}"
+            )
+
+
+class TestBotQueryBudget(QueryBudgetTestCase):
+    def test_get_all_repositories(self):
+        """Test the repositories of a subscriber are loaded in 2 queries."""
+        with self.assertNumQueries(2):
+            repositories = async_to_sync(get_all_repostitories)("1")
+
+        self.assertEqual(len(repositories), ROWS)
+
+    def test_get_user(self):
+        """Test a user is loaded in 1 query."""
+        with self.assertNumQueries(1):
+            async_to_sync(get_user)(self.lead.id)
+
+    def test_create_telegram_user(self):
+        """Test linking a Telegram account is a single upsert."""
+        with self.assertNumQueries(1):
+            async_to_sync(create_telegram_user)(self.lead, "2")
+
+    def test_get_leaderboard(self):
+        """Test the leaderboard page is read in 1 query."""
+        with self.assertNumQueries(1):
+            entries = async_to_sync(get_leaderboard)(ROWS)
+
+        self.assertEqual(len(entries), ROWS)
+
+
+@override_settings(TELEGRAM_BOT_USERNAME="tracker_bot")
+class TestAdminQueryBudget(QueryBudgetTestCase):
+    def setUp(self):
+        """Log the project lead in."""
+        super().setUp()
+        self.client.force_login(self.lead)
+
+    def test_repository_changelist(self):
+        """Test the repository changelist does not query per row."""
+        with self.assertNumQueries(7):
+            self.client.get(reverse("admin:tracker_repository_changelist"))
+
+    def test_contributor_changelist(self):
+        """Test the contributor changelist does not query per row."""
+        with self.assertNumQueries(7):
+            self.client.get(reverse("admin:tracker_contributor_changelist"))
+
+    def test_contributor_changelist_json(self):
+        """Test the JSON contributor changelist does not query per row."""
+        with self.assertNumQueries(5):
+            response = self.client.get(
+                reverse("admin:tracker_contributor_changelist"),
+                headers={"Content-Type": "application/json"},
+            )
+
+        self.assertEqual(len(response.json()), ROWS)
+
+    def test_leaderboard_changelist(self):
+        """Test the leaderboard changelist does not query per row."""
+        with self.assertNumQueries(6):
+            self.client.get(reverse("admin:tracker_leaderboardentry_changelist"))
+
+    def test_contributors_endpoint(self):
+        """Test the contributors JSON endpoint does not query per row."""
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("contributors"))
+
+        self.assertEqual(len(response.json()), ROWS)
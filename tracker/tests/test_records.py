@@ -0,0 +1,116 @@
+import django
+
+django.setup()
+
+import json
+import pickle
+
+from django.test import TestCase
+from kombu.serialization import dumps, loads
+
+from tracker.codec import (
+    CELERY_SERIALIZER,
+    JsonResponse,
+    register_celery_serializer,
+)
+from tracker.records import ISSUES_DECODER, Issue, Review, User
+
+USER = {
+    "login": "octocat",
+    "id": 1,
+    "node_id": "MDQ6VXNlcjE=",
+    "avatar_url": "https://github.com/images/error/octocat_happy.gif",
+    "url": "https://api.github.com/users/octocat",
+    "html_url": "https://github.com/octocat",
+    "followers_url": "https://api.github.com/users/octocat/followers",
+    "repos_url": "https://api.github.com/users/octocat/repos",
+    "events_url": "https://api.github.com/users/octocat/events{/privacy}",
+    "type": "User",
+    "site_admin": False,
+}
+
+
+def issue_payload(number: int) -> dict:
+    """
+    Returns an issue shaped like the GitHub issues endpoint returns it.
+    :param number: the issue number
+    :return: dict
+    """
+    url = f"https://api.github.com/repos/owner/repo/issues/{number}"
+    return {
+        "url": url,
+        "repository_url": "https://api.github.com/repos/owner/repo",
+        "labels_url": f"{url}/labels{{/name}}",
+        "comments_url": f"{url}/comments",
+        "events_url": f"{url}/events",
+        "html_url": f"https://github.com/owner/repo/issues/{number}",
+        "id": number,
+        "node_id": f"MDU6SXNzdWUx{number}",
+        "number": number,
+        "title": f"Issue {number}",
+        "user": USER,
+        "labels": [{"id": 1, "name": "ODHack", "color": "f29513", "default": False}],
+        "state": "open",
+        "locked": False,
+        "assignee": USER,
+        "assignees": [USER],
+        "comments": 3,
+        "created_at": "2024-10-01T00:00:00Z",
+        "updated_at": "2024-10-02T00:00:00Z",
+        "author_association": "CONTRIBUTOR",
+        "body": f"Description of issue {number}. " * 20,
+        "reactions": {"url": f"{url}/reactions", "total_count": 0, "+1": 0},
+    }
+
+
+class TestIssueRecords(TestCase):
+    def test_decode_keeps_used_fields(self):
+        """Test issues decode into records holding only the used fields."""
+        issue = ISSUES_DECODER.decode(json.dumps([issue_payload(7)]))[0]
+
+        self.assertEqual(issue.number, 7)
+        self.assertEqual(issue.events_url, issue_payload(7)["events_url"])
+        self.assertEqual(issue.assignee_login, "octocat")
+        self.assertEqual([label.name for label in issue.labels], ["ODHack"])
+        self.assertFalse(hasattr(issue, "body"))
+        self.assertEqual(pickle.loads(pickle.dumps(issue)), issue)
+
+    def test_cached_listing_is_compact(self):
+        """Test a cached listing takes an order of magnitude less space."""
+        payload = json.dumps([issue_payload(number) for number in range(100)])
+
+        records = pickle.dumps(ISSUES_DECODER.decode(payload))
+        dicts = pickle.dumps(json.loads(payload))
+
+        self.assertLess(len(records) * 10, len(dicts))
+
+
+class TestCodec(TestCase):
+    def setUp(self):
+        register_celery_serializer()
+
+    def test_celery_serializer_round_trip(self):
+        """Test records survive the Celery serializer as plain dicts."""
+        data = [{"repo": "repo", "reviews": [Review(user=User(login="a"), state="OK")]}]
+
+        content_type, encoding, body = dumps(data, serializer=CELERY_SERIALIZER)
+
+        self.assertEqual(
+            loads(body, content_type, encoding),
+            [
+                {
+                    "repo": "repo",
+                    "reviews": [{"id": 0, "user": {"login": "a"}, "state": "OK"}],
+                }
+            ],
+        )
+
+    def test_json_response(self):
+        """Test the response encodes records like django's JsonResponse."""
+        response = JsonResponse([Issue(number=1, title="t")], safe=False)
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(response.content)[0]["title"], "t")
+
+        with self.assertRaises(TypeError):
+            JsonResponse([1])
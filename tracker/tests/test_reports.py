@@ -0,0 +1,69 @@
+import django
+
+django.setup()
+
+import threading
+import time
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+
+from tracker.http import GitHubSession
+from tracker.resilience import DeadlineExceeded
+from tracker.telegram.pagination import ReportSection
+from tracker.telegram.reports import collect_sections, repository_label
+from tracker.telegram.templates import TEMPLATES
+
+
+def build_section(repository: dict) -> ReportSection:
+    if repository["name"] == "slow":
+        time.sleep(0.5)
+    if repository["name"] == "broken":
+        raise ValueError("GitHub is down")
+
+    return ReportSection(
+        label=repository_label(repository), header="", items=["issue\n"]
+    )
+
+
+@override_settings(REPORT_REPOSITORY_TIMEOUT=0.1, REPORT_CONCURRENCY=2)
+class TestCollectSections(TestCase):
+    def test_collect_sections_keeps_partial_results(self):
+        """Test slow and failing repositories do not hide the others."""
+        repositories = [
+            {"author": "author", "name": "slow"},
+            {"author": "author", "name": "fine"},
+            {"author": "author", "name": "broken"},
+        ]
+
+        sections = async_to_sync(collect_sections)(repositories, build_section)
+
+        self.assertEqual(
+            [section.label for section in sections],
+            ["author/slow", "author/fine", "author/broken"],
+        )
+        self.assertEqual(sections[0].empty, TEMPLATES.repository_timeout.template)
+        self.assertEqual(sections[1].items, ["issue\n"])
+        self.assertEqual(sections[2].empty, TEMPLATES.repository_failed.template)
+
+    @patch("requests.Session.request")
+    def test_timed_out_repository_stops_requesting(self, request):
+        """Test the GitHub requests of a timed out repository stop at its deadline."""
+        stopped = threading.Event()
+
+        def build_slow_section(repository: dict) -> ReportSection:
+            time.sleep(0.2)
+            try:
+                GitHubSession().get("https://api.github.com/repos/author/slow/issues")
+            except DeadlineExceeded:
+                stopped.set()
+            return build_section(repository)
+
+        sections = async_to_sync(collect_sections)(
+            [{"author": "author", "name": "fine"}], build_slow_section
+        )
+
+        self.assertEqual(sections[0].empty, TEMPLATES.repository_timeout.template)
+        self.assertTrue(stopped.wait(1))
+        request.assert_not_called()
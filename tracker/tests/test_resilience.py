@@ -0,0 +1,168 @@
+import django
+
+django.setup()
+
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from tracker import resilience
+from tracker.http import GitHubSession, request_deadline
+from tracker.records import PULL_REQUESTS_DECODER
+from tracker.resilience import (
+    CircuitOpenError,
+    DeadlineExceeded,
+    endpoint_class,
+    get_breaker,
+)
+from tracker.telegram.reports import stale_notice
+from tracker.utils import fetch_records
+
+PULLS_URL = "https://api.github.com/repos/owner/repo/pulls"
+
+
+def response(status_code: int, headers: dict | None = None) -> MagicMock:
+    """
+    Returns a fake response of the GitHub API.
+    :param status_code: int
+    :param headers: the response headers
+    :return: MagicMock
+    """
+    return MagicMock(status_code=status_code, headers=headers or dict())
+
+
+@override_settings(GITHUB_MAX_RETRIES=2, GITHUB_CIRCUIT_THRESHOLD=2)
+@patch("tracker.http.time.sleep")
+class TestGitHubSessionResilience(TestCase):
+    def setUp(self):
+        resilience._breakers.clear()
+        self.session = GitHubSession()
+
+    def test_endpoint_class(self, sleep):
+        """Test URLs are grouped into the endpoint classes with a circuit."""
+        self.assertEqual(endpoint_class(f"{PULLS_URL}?state=open"), "pulls")
+        self.assertEqual(endpoint_class(f"{PULLS_URL}/1/reviews"), "reviews")
+        self.assertEqual(
+            endpoint_class("https://api.github.com/repos/a/b/issues/1/events"), "events"
+        )
+        self.assertEqual(
+            endpoint_class("https://api.github.com/search/issues"), "search"
+        )
+
+    def test_server_errors_retried(self, sleep):
+        """Test a 5xx is retried with backoff until GitHub recovers."""
+        with patch(
+            "requests.Session.request",
+            side_effect=[response(502), response(503), response(200)],
+        ) as request:
+            self.assertEqual(self.session.get(PULLS_URL).status_code, 200)
+
+        self.assertEqual(request.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+        self.assertFalse(get_breaker("pulls").is_open)
+
+    def test_client_errors_not_retried(self, sleep):
+        """Test a 404 is returned at once and does not count as a failure."""
+        with patch("requests.Session.request", return_value=response(404)) as request:
+            self.session.get(PULLS_URL)
+
+        request.assert_called_once()
+        self.assertEqual(get_breaker("pulls").failures, 0)
+
+    def test_circuit_opens_per_endpoint_class(self, sleep):
+        """Test a failing endpoint class is short-circuited, others are not."""
+        with patch(
+            "requests.Session.request", side_effect=requests.ConnectionError
+        ) as request:
+            for _ in range(2):
+                with self.assertRaises(requests.ConnectionError):
+                    self.session.get(PULLS_URL)
+
+            with self.assertRaises(CircuitOpenError):
+                self.session.get(PULLS_URL)
+
+        self.assertEqual(request.call_count, 6)
+
+        with patch("requests.Session.request", return_value=response(200)):
+            self.session.get(f"{PULLS_URL}/1/reviews")
+
+    @override_settings(GITHUB_CIRCUIT_COOLDOWN=0)
+    def test_trial_call_closes_circuit(self, sleep):
+        """Test the first call after the cooldown closes the circuit on success."""
+        breaker = get_breaker("pulls")
+        breaker.record_failure()
+        breaker.record_failure()
+
+        with patch("requests.Session.request", return_value=response(200)):
+            self.session.get(PULLS_URL)
+
+        self.assertFalse(breaker.is_open)
+
+    @override_settings(GITHUB_CIRCUIT_COOLDOWN=0)
+    def test_failed_trial_call_reopens_circuit(self, sleep):
+        """Test a trial call failing on any error opens the circuit again."""
+        breaker = get_breaker("pulls")
+        breaker.record_failure()
+        breaker.record_failure()
+
+        with patch(
+            "requests.Session.request", side_effect=requests.TooManyRedirects
+        ) as request:
+            with self.assertRaises(requests.TooManyRedirects):
+                self.session.get(PULLS_URL)
+
+        request.assert_called_once()
+        self.assertTrue(breaker.is_open)
+        self.assertFalse(breaker.probing)
+
+        with patch("requests.Session.request", return_value=response(200)):
+            self.session.get(PULLS_URL)
+
+        self.assertFalse(breaker.is_open)
+
+    def test_timeout_capped_to_deadline(self, sleep):
+        """Test requests within a deadline wait no longer than the time left."""
+        with patch("requests.Session.request", return_value=response(200)) as request:
+            with request_deadline(time.monotonic() + 1):
+                self.session.get(PULLS_URL)
+
+        self.assertTrue(all(part <= 1 for part in request.call_args.kwargs["timeout"]))
+
+    def test_retries_stop_at_deadline(self, sleep):
+        """Test a failing request is not retried past the deadline."""
+        with patch("requests.Session.request", return_value=response(502)) as request:
+            with request_deadline(time.monotonic() - 1):
+                with self.assertRaises(DeadlineExceeded):
+                    self.session.get(PULLS_URL)
+
+            with patch("tracker.http.backoff_delay", return_value=1.0):
+                with request_deadline(time.monotonic() + 0.5):
+                    self.session.get(PULLS_URL)
+
+        request.assert_called_once()
+        sleep.assert_not_called()
+
+
+class TestFetchRecords(TestCase):
+    def tearDown(self):
+        cache.clear()
+
+    @patch("tracker.utils.get_session")
+    def test_last_known_records_served_stale(self, get_session):
+        """Test a failing fetch returns the last known records marked stale."""
+        get_session.return_value.get.return_value = MagicMock(
+            content=json.dumps([{"number": 1, "title": "fix"}]).encode()
+        )
+        fresh = fetch_records(PULLS_URL, PULL_REQUESTS_DECODER, {"state": "open"})
+
+        get_session.return_value.get.side_effect = CircuitOpenError
+        stale = fetch_records(PULLS_URL, PULL_REQUESTS_DECODER, {"state": "open"})
+
+        self.assertEqual(stale, fresh)
+        self.assertTrue(stale.stale)
+        self.assertEqual(stale_notice(fresh), str())
+        self.assertIn("minutes ago", stale_notice(stale))
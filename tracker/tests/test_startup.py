@@ -0,0 +1,68 @@
+import django
+
+django.setup()
+
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from unittest import skipUnless
+
+from django.test import SimpleTestCase
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+{imports}
+seconds = time.perf_counter() - start
+with open("/proc/self/status") as status:
+    rss_kb = next(int(line.split()[1]) for line in status if line.startswith("VmRSS"))
+print(json.dumps({{"seconds": seconds, "rss_kb": rss_kb, "modules": sorted(sys.modules)}}))
+"""
+
+PROCESS_IMPORTS = {
+    "web": "import core.asgi, core.wsgi, core.urls, tracker.admin",
+    "worker": "import core.celery, tracker.tasks",
+}
+
+# Modules only the bot process may import.
+BOT_ONLY_MODULES = ("aiogram", "tracker.telegram.bot")
+
+STARTUP_SECONDS_BUDGET = 10
+STARTUP_RSS_KB_BUDGET = 150 * 1024
+
+
+def probe(imports: str) -> dict:
+    """
+    Imports modules in a fresh interpreter and reports its cold-start cost.
+    :param imports: import statements to run after django.setup()
+    :return: dict with "seconds", "rss_kb" and "modules" keys
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(imports=imports)],
+        capture_output=True,
+        check=True,
+        cwd=settings.BASE_DIR,
+        env=os.environ,
+        text=True,
+    ).stdout
+
+    return json.loads(output.splitlines()[-1])
+
+
+@skipUnless(os.path.exists("/proc/self/status"), "needs procfs to measure memory")
+class TestStartup(SimpleTestCase):
+    def test_process_startup_skips_bot_runtime(self):
+        """Test web and worker processes start without the Telegram runtime."""
+        for process_type, imports in PROCESS_IMPORTS.items():
+            with self.subTest(process_type=process_type):
+                result = probe(imports)
+
+                for module in BOT_ONLY_MODULES:
+                    self.assertNotIn(module, result["modules"])
+                self.assertLess(result["seconds"], STARTUP_SECONDS_BUDGET)
+                self.assertLess(result["rss_kb"], STARTUP_RSS_KB_BUDGET)
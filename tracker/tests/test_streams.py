@@ -0,0 +1,31 @@
+import django
+
+django.setup()
+
+from django.test import SimpleTestCase, override_settings
+
+from tracker.telegram.streams import shard_for, update_chat_id
+
+
+class TestUpdateSharding(SimpleTestCase):
+    def test_update_chat_id(self):
+        """Test the chat is found for messages and callback queries."""
+        message = {"update_id": 1, "message": {"chat": {"id": 42}}}
+        callback = {
+            "update_id": 2,
+            "callback_query": {"from": {"id": 7}, "message": {"chat": {"id": 42}}},
+        }
+
+        self.assertEqual(update_chat_id(message), 42)
+        self.assertEqual(update_chat_id(callback), 42)
+        self.assertEqual(update_chat_id({"update_id": 3}), 0)
+
+    @override_settings(BOT_WORKERS=4)
+    def test_shard_for_keeps_chat_together(self):
+        """Test every update of a chat lands on the same shard."""
+        updates = [
+            {"update_id": 1, "message": {"chat": {"id": -1005}}},
+            {"update_id": 2, "edited_message": {"chat": {"id": -1005}}},
+        ]
+
+        self.assertEqual({shard_for(update) for update in updates}, {1})
@@ -0,0 +1,279 @@
+import django
+
+django.setup()
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from tracker.approvals import APPROVALS_LOCK_KEY
+from tracker.models import CustomUser, Repository, TelegramUser, TrackedRepository
+from tracker.tasks import (
+    aggregate_revisions,
+    approval_offset,
+    dispatch_approvals,
+    fetch_approvals,
+    fetch_approvals_batch,
+    fetch_repository_reviews,
+)
+from tracker.records import Review, User
+from tracker.resilience import StaleList, StaleResultError
+
+
+class TestAggregateRevisions(TestCase):
+    def tearDown(self):
+        cache.clear()
+
+    @patch("tracker.tasks.send_revision_notification.delay")
+    def test_aggregate_revisions_merges_repositories(self, send):
+        """Test reviews of every repository end up in one notification."""
+        aggregate_revisions([[{"repo": "first"}], [], [{"repo": "second"}]], "42")
+
+        send.assert_called_once_with("42", [{"repo": "first"}, {"repo": "second"}])
+
+    @patch("tracker.tasks.send_revision_notification.delay")
+    def test_aggregate_revisions_skips_empty_results(self, send):
+        """Test nothing is sent when no repository has reviews."""
+        aggregate_revisions([[], []], "42")
+
+        send.assert_not_called()
+
+
+class TestFetchRepositoryReviews(TestCase):
+    def tearDown(self):
+        cache.clear()
+
+    @patch("tracker.tasks.record_reviews")
+    @patch("tracker.tasks.get_repository_revisions", return_value=[{"repo": "repo"}])
+    def test_reviews_fetched_once_per_tracked_repository(self, revisions, record):
+        """Test the subscribers of a repository share one fetch."""
+        tracked = TrackedRepository.objects.create(
+            author="owner", name="repo", link="https://github.com/owner/repo"
+        )
+
+        for _ in range(3):
+            result = fetch_repository_reviews(str(tracked.id))
+
+        self.assertEqual(result, [{"repo": "repo"}])
+        revisions.assert_called_once_with("owner", "repo")
+
+    @patch("tracker.tasks.record_reviews")
+    @patch(
+        "tracker.tasks.get_repository_revisions",
+        return_value=StaleList([{"repo": "repo"}], fetched_at=1.0),
+    )
+    def test_stale_reviews_retried_not_cached(self, revisions, record):
+        """Test a failed fetch raises for a retry and caches nothing."""
+        tracked = TrackedRepository.objects.create(
+            author="owner", name="repo", link="https://github.com/owner/repo"
+        )
+
+        for _ in range(2):
+            with self.assertRaises(StaleResultError):
+                fetch_repository_reviews(str(tracked.id))
+
+        self.assertEqual(revisions.call_count, 2)
+        record.assert_not_called()
+
+
+@override_settings(APPROVALS_INTERVAL=600, APPROVALS_SLOTS=10)
+class TestDispatchApprovals(TestCase):
+    def setUp(self):
+        """Set up subscribers with a repository each."""
+        for index in range(20):
+            user = CustomUser.objects.create_user(email=f"user{index}@example.com")
+            TelegramUser.objects.filter(user=user).update(telegram_id=str(index))
+            Repository.objects.create(
+                user=user,
+                author="owner",
+                name=f"repo{index}",
+                link=f"https://github.com/owner/repo{index}",
+            )
+
+    def tearDown(self):
+        cache.clear()
+
+    @patch("tracker.tasks.fetch_approvals.apply_async")
+    def test_subscribers_dispatched_once_per_interval(self, apply_async):
+        """Test every subscriber runs once per interval, at its own offset."""
+        for slot in range(10):
+            with patch("tracker.tasks.time.time", return_value=6000 + slot * 60):
+                dispatch_approvals()
+
+        dispatched = {
+            call.args[0][0]: call.kwargs["countdown"]
+            for call in apply_async.call_args_list
+        }
+        self.assertEqual(apply_async.call_count, 20)
+        self.assertEqual(
+            dispatched,
+            {str(index): approval_offset(str(index)) % 60 for index in range(20)},
+        )
+
+    @patch("tracker.tasks.fetch_approvals.apply_async")
+    def test_unlinked_subscribers_skipped(self, apply_async):
+        """Test leads who have not linked Telegram are never dispatched."""
+        user = CustomUser.objects.create_user(email="unlinked@example.com")
+        Repository.objects.create(
+            user=user,
+            author="owner",
+            name="unlinked",
+            link="https://github.com/owner/unlinked",
+        )
+
+        for slot in range(10):
+            with patch("tracker.tasks.time.time", return_value=6000 + slot * 60):
+                dispatch_approvals()
+
+        dispatched = [call.args[0][0] for call in apply_async.call_args_list]
+        self.assertEqual(len(dispatched), 20)
+        self.assertNotIn(f"default_{user.id}", dispatched)
+
+    @patch("tracker.tasks.fetch_approvals.apply_async")
+    def test_late_run_catches_up_missed_slots(self, apply_async):
+        """Test the slots of a skipped beat are dispatched by the next run."""
+        for now in (6000, 6130, 6190, 6240, 6300, 6360, 6420, 6480, 6540):
+            with patch("tracker.tasks.time.time", return_value=now):
+                dispatch_approvals()
+
+        dispatched = [call.args[0][0] for call in apply_async.call_args_list]
+        self.assertEqual(sorted(dispatched), sorted(str(index) for index in range(20)))
+
+        missed = {
+            call.args[0][0]: call.kwargs["countdown"]
+            for call in apply_async.call_args_list
+            if 60 <= approval_offset(call.args[0][0]) < 120
+        }
+        self.assertTrue(all(countdown == 0 for countdown in missed.values()))
+
+    @patch("tracker.tasks.fetch_approvals.apply_async")
+    def test_duplicate_run_dispatches_nothing(self, apply_async):
+        """Test a second run within the same slot dispatches no subscriber again."""
+        for now in (6000, 6010, 6059):
+            with patch("tracker.tasks.time.time", return_value=now):
+                dispatch_approvals()
+
+        dispatched = [call.args[0][0] for call in apply_async.call_args_list]
+        self.assertEqual(len(dispatched), len(set(dispatched)))
+        self.assertEqual(
+            sorted(dispatched),
+            sorted(
+                str(index) for index in range(20) if approval_offset(str(index)) < 60
+            ),
+        )
+
+    @patch("tracker.tasks.chord")
+    def test_overlapping_runs_skipped(self, chord):
+        """Test a subscriber gets no new run while the previous one is going."""
+        fetch_approvals("1")
+        fetch_approvals("1")
+        chord.assert_called_once()
+
+        aggregate_revisions([[]], "1")
+        fetch_approvals("1")
+        self.assertEqual(chord.call_count, 2)
+
+    @patch("tracker.tasks.chord")
+    def test_failed_chord_releases_subscriber(self, chord):
+        """Test the error callback of the chord finishes the subscriber's run."""
+        fetch_approvals("1")
+        self.assertIsNotNone(cache.get(APPROVALS_LOCK_KEY.format(telegram_id="1")))
+
+        body = chord.return_value.call_args.args[0]
+        for errback in body.options["link_error"]:
+            errback.apply(("failed-task-id",))
+
+        self.assertIsNone(cache.get(APPROVALS_LOCK_KEY.format(telegram_id="1")))
+
+    @override_settings(APPROVALS_BATCH_SIZE=8)
+    @patch("tracker.tasks.fetch_approvals_batch.apply_async")
+    def test_subscribers_dispatched_in_batches(self, apply_async):
+        """Test every subscriber is part of one batch per interval."""
+        for slot in range(10):
+            with patch("tracker.tasks.time.time", return_value=6000 + slot * 60):
+                dispatch_approvals()
+
+        batches = [call.args[0][0] for call in apply_async.call_args_list]
+
+        self.assertTrue(all(len(batch) <= 8 for batch in batches))
+        self.assertEqual(
+            sorted(telegram_id for batch in batches for telegram_id in batch),
+            sorted(str(index) for index in range(20)),
+        )
+
+    @patch("tracker.approvals.record_reviews")
+    @patch("tracker.approvals.get_repository_revisions")
+    @patch("tracker.approvals.get_bot")
+    def test_batch_shares_fetches_and_bot_session(self, get_bot, revisions, record):
+        """Test a batch fetches every repository once and sends through one session."""
+        shared = TelegramUser.objects.get(telegram_id="1").user
+        Repository.objects.create(
+            user=shared,
+            author="owner",
+            name="repo0",
+            link="https://github.com/owner/repo0",
+        )
+        revisions.side_effect = lambda author, name: (
+            [
+                {
+                    "repo": name,
+                    "pull": "Fix",
+                    "number": 1,
+                    "pull_author": "author",
+                    "reviews": [Review(id=1, user=User(login="lead"), state="OK")],
+                }
+            ]
+            if name == "repo0"
+            else []
+        )
+        bot = MagicMock(send_message=AsyncMock())
+        get_bot.return_value = bot
+
+        fetch_approvals_batch(["0", "1", "2"])
+
+        self.assertEqual(revisions.call_count, 3)
+        bot.context.assert_called_once()
+        self.assertEqual(
+            sorted(call.args[0] for call in bot.send_message.call_args_list),
+            ["0", "1"],
+        )
+        self.assertFalse(
+            any(
+                cache.get(APPROVALS_LOCK_KEY.format(telegram_id=telegram_id))
+                for telegram_id in ("0", "1", "2")
+            )
+        )
+
+    @patch("tracker.approvals.record_reviews")
+    @patch("tracker.approvals.get_repository_revisions")
+    @patch("tracker.approvals.get_bot")
+    def test_failed_delivery_releases_subscriber(self, get_bot, revisions, record):
+        """Test a subscriber whose delivery fails does not stop the batch or stay locked."""
+        revisions.side_effect = lambda author, name: [
+            {
+                "repo": name,
+                "pull": "Fix",
+                "number": 1,
+                "pull_author": "author",
+                "reviews": [Review(id=1, user=None, state="APPROVED")],
+            }
+        ]
+
+        async def send_message(telegram_id, message):
+            if telegram_id == "0":
+                raise ValueError("broken")
+
+        bot = MagicMock(send_message=AsyncMock(side_effect=send_message))
+        get_bot.return_value = bot
+
+        fetch_approvals_batch(["0", "1"])
+
+        messages = [call.args[1] for call in bot.send_message.call_args_list]
+        self.assertIn("User: <b>ghost</b>", messages[-1])
+        self.assertFalse(
+            any(
+                cache.get(APPROVALS_LOCK_KEY.format(telegram_id=telegram_id))
+                for telegram_id in ("0", "1")
+            )
+        )
@@ -2,13 +2,28 @@ import django
 
 django.setup()
 
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
 from asgiref.sync import async_to_sync
+from django.core.cache import cache
 from django.test import TestCase
 from faker import Faker
 
 from tracker.choices import Roles
 from tracker.models import CustomUser, Repository, TelegramUser
-from tracker.utils import get_all_repostitories, get_user
+from tracker import db
+from tracker.db import database_sync_to_async
+from tracker.issues import IssueBuckets
+from tracker.records import Issue, Label, User
+from tracker.utils import (
+    check_issue_assignment_events,
+    create_telegram_user,
+    get_all_repostitories,
+    get_tracked_issues_of_user,
+    get_user,
+)
 
 fake = Faker()
 
@@ -45,8 +60,7 @@ class TestGetUser(TestCase):
     def setUp(self):
         """Set up test data."""
         self.custom_user = CustomUser.objects.create(
-            email=fake.email(),
-            role=Roles.CONTRIBUTOR
+            email=fake.email(), role=Roles.CONTRIBUTOR
         )
         self.user_id = str(self.custom_user.id)
 
@@ -61,4 +75,120 @@ class TestGetUser(TestCase):
         """Test retrieving user with invalid UUID raises exception."""
         invalid_uuid = "00000000-0000-0000-0000-000000000000"
         with self.assertRaises(CustomUser.DoesNotExist):
-            async_to_sync(get_user)(uuid=invalid_uuid)
\ No newline at end of file
+            async_to_sync(get_user)(uuid=invalid_uuid)
+
+
+class TestCreateTelegramUser(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.custom_user = CustomUser.objects.create(
+            email=fake.email(), role=Roles.CONTRIBUTOR
+        )
+
+    def test_create_telegram_user_upserts(self):
+        """Test linking replaces the placeholder telegram id of the user."""
+        async_to_sync(create_telegram_user)(self.custom_user, "123")
+        async_to_sync(create_telegram_user)(self.custom_user, "456")
+
+        telegram_users = TelegramUser.objects.filter(user=self.custom_user)
+        self.assertEqual(telegram_users.count(), 1)
+        self.assertEqual(telegram_users.get().telegram_id, "456")
+
+
+class TestDatabaseSyncToAsync(TestCase):
+    def tearDown(self):
+        db._executor = None
+
+    def test_runs_on_configured_executor(self):
+        """Test calls run on the dedicated executor once it is configured."""
+        thread_name = database_sync_to_async(lambda: threading.current_thread().name)
+
+        db.configure_database_executor(2)
+
+        self.assertTrue(async_to_sync(thread_name)().startswith("database"))
+
+
+EVENTS_URL = "https://api.github.com/repos/owner/repo/issues/1/events"
+
+
+def events_page(page: int, events: list[tuple[str, str]], last: int) -> MagicMock:
+    """
+    Returns a fake page of issue events with its pagination links.
+    :param page: the page number
+    :param events: (event, created_at) pairs, oldest first
+    :param last: the number of the last page
+    :return: MagicMock
+    """
+    links = dict()
+    if page < last:
+        links["last"] = {"url": f"{EVENTS_URL}?per_page=100&page={last}"}
+    if page > 1:
+        links["prev"] = {"url": f"{EVENTS_URL}?per_page=100&page={page - 1}"}
+
+    content = json.dumps(
+        [{"event": event, "created_at": created_at} for event, created_at in events]
+    )
+    return MagicMock(content=content.encode(), links=links)
+
+
+@patch("tracker.utils.get_session")
+class TestCheckIssueAssignmentEvents(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.issue = Issue(
+            number=1,
+            repository_url="https://api.github.com/repos/owner/repo",
+            updated_at="2024-10-03T00:00:00Z",
+        )
+
+    def test_walks_back_from_last_page(self, get_session):
+        """Test the last pages are read newest first until an assignment is found."""
+        get_session.return_value.get.side_effect = [
+            events_page(1, [("assigned", "2024-10-01T00:00:00Z")], last=3),
+            events_page(3, [("labeled", "2024-10-03T00:00:00Z")], last=3),
+            events_page(2, [("assigned", "2024-10-02T00:00:00Z")], last=3),
+        ]
+
+        self.assertEqual(
+            check_issue_assignment_events(self.issue), "2024-10-02T00:00:00Z"
+        )
+        self.assertEqual(get_session.return_value.get.call_count, 3)
+
+    def test_cached_until_updated(self, get_session):
+        """Test an unchanged issue costs no request, an updated one is checked again."""
+        get_session.return_value.get.return_value = events_page(
+            1, [("assigned", "2024-10-01T00:00:00Z")], last=1
+        )
+
+        check_issue_assignment_events(self.issue)
+        check_issue_assignment_events(self.issue)
+        self.assertEqual(get_session.return_value.get.call_count, 1)
+
+        self.issue.updated_at = "2024-10-04T00:00:00Z"
+        check_issue_assignment_events(self.issue)
+        self.assertEqual(get_session.return_value.get.call_count, 2)
+
+
+class TestGetTrackedIssuesOfUser(TestCase):
+    @patch("tracker.utils.get_classified_issues")
+    def test_default_label_without_labels_filter(self, get_classified_issues):
+        """Test only repositories without a labels filter fall back to the default label."""
+        get_classified_issues.return_value = IssueBuckets(
+            assigned=[
+                Issue(
+                    number=1,
+                    title="hack",
+                    assignee=User(login="dev"),
+                    labels=[Label(name="ODHack")],
+                ),
+                Issue(number=2, title="other", assignee=User(login="dev")),
+            ]
+        )
+        repositories = [
+            {"author": "owner", "name": "plain"},
+            {"author": "owner", "name": "filtered", "labels": "bug"},
+        ]
+
+        issues = get_tracked_issues_of_user(repositories, "dev", "ODHack")
+
+        self.assertEqual([">hack<" in issue for issue in issues], [True, True, False])
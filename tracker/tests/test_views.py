@@ -0,0 +1,111 @@
+import django
+
+django.setup()
+
+from unittest.mock import patch
+
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from faker import Faker
+
+from tracker.choices import Roles
+from tracker.models import Contributor, CustomUser
+
+fake = Faker()
+
+
+class TestContributorListView(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        self.password = fake.password()
+        self.lead = CustomUser.objects.create_superuser(
+            email=fake.email(), password=self.password, role=Roles.PROJECT_LEAD
+        )
+        self.contributor = Contributor.objects.create(
+            user=CustomUser.objects.create_user(email=fake.email()),
+            notes="notes",
+            rank=3,
+        )
+
+    async def test_contributors_forbidden_for_anonymous(self):
+        """Test anonymous users cannot list contributors."""
+        response = await self.async_client.get(reverse("contributors"))
+
+        self.assertEqual(response.status_code, 403)
+
+    async def test_contributors_full_data_for_lead(self):
+        """Test project leads see notes and rank."""
+        await self.async_client.aforce_login(self.lead)
+
+        response = await self.async_client.get(reverse("contributors"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["rank"], 3)
+        self.assertEqual(response.json()[0]["notes"], "notes")
+
+
+@override_settings(HEALTH_TOKEN="health-token")
+class TestDatabaseHealthView(TestCase):
+    def test_database_health(self):
+        """Test the health check reports the process type to staff users."""
+        self.client.force_login(
+            CustomUser.objects.create_superuser(
+                email=fake.email(), password=fake.password()
+            )
+        )
+        response = self.client.get(reverse("database_health"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "ok")
+        self.assertEqual(response.json()["process"], "web")
+
+    def test_database_health_with_token(self):
+        """Test callers with the health token see the pool usage."""
+        response = self.client.get(
+            reverse("database_health"), headers={"X-Health-Token": "health-token"}
+        )
+
+        self.assertIn("pool", response.json())
+
+    def test_database_health_anonymous(self):
+        """Test anonymous callers only see the status."""
+        response = self.client.get(
+            reverse("database_health"), headers={"X-Health-Token": "wrong"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    @patch("tracker.views.check_database", side_effect=DatabaseError("db-host"))
+    def test_database_error_hidden_from_anonymous(self, check_database):
+        """Test a database error is reported as degraded without its details."""
+        response = self.client.get(reverse("database_health"))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {"status": "degraded"})
+
+
+@override_settings(HEALTH_TOKEN="health-token")
+@patch(
+    "tracker.views.get_token_usage",
+    return_value={
+        "installation:owner": {"limit": 5000, "remaining": 0, "used": 5000, "reset": 0},
+        "token": {"limit": 5000, "remaining": 0, "used": 5000, "reset": 2**40},
+    },
+)
+class TestGitHubUsageView(TestCase):
+    def test_usage_hidden_from_anonymous(self, get_token_usage):
+        """Test anonymous callers only see whether a token is exhausted."""
+        response = self.client.get(reverse("github_usage"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "degraded"})
+
+    def test_usage_with_token(self, get_token_usage):
+        """Test callers with the health token see the usage of every token."""
+        response = self.client.get(
+            reverse("github_usage"), headers={"X-Health-Token": "health-token"}
+        )
+
+        self.assertEqual(response.json()["tokens"]["token"]["remaining"], 0)
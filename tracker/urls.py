@@ -1,5 +1,21 @@
 from django.urls import path
 
-from .views import CreateUserView
+from .views import (
+    AssignmentsExportView,
+    ContributorListView,
+    CreateUserView,
+    DatabaseHealthView,
+    GitHubUsageView,
+)
 
-urlpatterns = [path("", CreateUserView.as_view(), name="create_user")]
+urlpatterns = [
+    path("", CreateUserView.as_view(), name="create_user"),
+    path("api/contributors/", ContributorListView.as_view(), name="contributors"),
+    path("api/health/db/", DatabaseHealthView.as_view(), name="database_health"),
+    path("api/health/github/", GitHubUsageView.as_view(), name="github_usage"),
+    path(
+        "api/reports/assignments/",
+        AssignmentsExportView.as_view(),
+        name="assignments_export",
+    ),
+]
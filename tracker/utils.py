@@ -1,14 +1,31 @@
+import hashlib
 import logging
-from collections import defaultdict
+import re
 from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlencode, urlsplit
 
+import msgspec
 import requests
-from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.sync import async_to_sync
 from dateutil.relativedelta import relativedelta
-
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+
+from .db import database_sync_to_async
+from .http import get_session
+from .issues import get_classified_issues, issues_listing_url
+from .records import (
+    ISSUE_EVENTS_DECODER,
+    PULL_REQUESTS_DECODER,
+    REVIEWS_DECODER,
+    Issue,
+    PullRequest,
+    Review,
+)
+from .resilience import carry_staleness, recall, remember
 from .values import (
     DATETIME_FORMAT,
-    HEADERS,
     PULLS_REVIEWS_URL,
     PULLS_URL,
     SECONDS_IN_AN_HOUR,
@@ -17,24 +34,28 @@ from .values import (
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+ASSIGNMENT_CACHE_KEY = "assigned_at:{digest}"
+EVENTS_PAGE_SIZE = 100
 
-@sync_to_async
+
+@database_sync_to_async
 def get_all_repostitories(tele_id: str) -> list[dict]:
     """
     A function that returns a list of repositories asyncronously.
     :param tele_id: str
     :return: Repositories
     """
-    from .models import TelegramUser
+    from .models import Repository, TelegramUser
 
-    repositories = TelegramUser.objects.get(
+    user_id = TelegramUser.objects.values_list("user_id", flat=True).get(
         telegram_id=tele_id
-    ).user.repository_set.values()
+    )
+    repositories = Repository.objects.filter(user_id=user_id).order_by("created_at")
 
-    return list(repositories)
+    return list(repositories.values())
 
 
-@sync_to_async
+@database_sync_to_async
 def get_user(uuid: str) -> tuple["CustomUser"]:
     """
     Retunrs an user instantce
@@ -48,208 +69,317 @@ def get_user(uuid: str) -> tuple["CustomUser"]:
     return (user,)
 
 
-@sync_to_async
+@database_sync_to_async
 def create_telegram_user(user: object, telegram_id: str) -> None:
     """
-    Creates a new TelegramUser object
+    Creates or updates the TelegramUser of a user in a single upsert
     :param user: CustomUser object
     :param telegram_id: telegram id
     :return: None
     """
     from .models import TelegramUser
 
-    if not TelegramUser.objects.filter(telegram_id=telegram_id, user=user).exists():
-        TelegramUser.objects.create(user=user, telegram_id=telegram_id)
+    TelegramUser.objects.bulk_create(
+        [TelegramUser(user=user, telegram_id=telegram_id)],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["telegram_id", "updated_at"],
+    )
 
 
-def check_issue_assignment_events(issue: dict) -> dict:
+@database_sync_to_async
+def update_notification_preferences(telegram_id: str, **preferences) -> bool:
     """
-    Checks an issue's timeline for assignment events to determine if it was
-    newly assigned or reassigned to a different contributor.
-    It retrieves events related to the assignment of the issue
-    and extracts the assignee's login and the assignment time.
+    Updates the notification preferences of a Telegram user
+    :param telegram_id: telegram id
+    :param preferences: TelegramUser notification fields to update
+    :return: True if the user exists
+    """
+    from .models import TelegramUser
 
-    :param issue: The issue dictionary containing information about the issue, including
-                  an "events_url" to fetch assignment events.
-    :return: A dictionary with two keys:
-             - "assignee": the login of the user assigned to the issue (empty string if not assigned).
-             - "assigned_at": the time the issue was assigned (empty string if no assignment event).
+    return bool(
+        TelegramUser.objects.filter(telegram_id=telegram_id).update(**preferences)
+    )
+
+
+async def validate_repository_link(link: str) -> None:
     """
+    Checks asynchronously that a repository link responds successfully.
+    :param link: The link to the repository.
+    :raises ValidationError: If the link is invalid or unreachable.
+    :return: None
+    """
+    import aiohttp
+
+    timeout = aiohttp.ClientTimeout(total=settings.GITHUB_REQUEST_TIMEOUT)
+
     try:
-        events_url = issue.get("events_url", str())
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.get(link) as response:
+                if not response.ok:
+                    raise ValidationError("Repository link is invalid.")
+
+    except (aiohttp.ClientError, TimeoutError) as e:
+        raise ValidationError(f"Something went wrong: {e}")
+
+
+def get_page(url: str, params: dict | None = None) -> requests.Response:
+    """
+    Fetches a page of a listing.
+    :param url: The URL of the page.
+    :param params: The query parameters.
+    :raises RequestException: If the request fails.
+    :return: requests.Response
+    """
+    response = get_session().get(url, params=params)
+    response.raise_for_status()
 
-        response = requests.get(events_url, headers=HEADERS)
-        response.raise_for_status()
+    return response
 
-        events = response.json()
 
-        assignment_info = defaultdict(str)
+def fetch_records(
+    url: str, decoder: msgspec.json.Decoder, params: dict | None = None
+) -> list:
+    """
+    Fetches and decodes a listing, remembering it as the last known good data.
+    If the request fails, the last known records are returned as a StaleList.
 
-        for event in events:
-            if event.get("event") == "assigned":
-                assignment_info["assignee"] = event.get("assignee", {}).get("login", "")
-                assignment_info["assigned_at"] = event.get("created_at", "")
+    :param url: The API endpoint.
+    :param decoder: The decoder of the records.
+    :param params: The query parameters.
+    :return: A list of records, a StaleList if GitHub failed.
+    """
+    key = f"{url}?{urlencode(params)}" if params else url
 
-        return dict(assignment_info)
+    try:
+        records = decoder.decode(get_page(url, params).content)
+        remember(key, records)
+
+        return records
 
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, msgspec.DecodeError) as e:
         logger.info(e)
-    return {}
+    return recall(key)
 
 
-def get_all_open_and_assigned_issues(url: str) -> list[dict]:
+def get_latest_assignment(events_url: str) -> str:
     """
-    Retrieves all open and assigned issues from a given URL.
-    This function makes a GET request to the provided URL to fetch issues data,
-    and filters the results to return only open and assigned issues.
-    If the request fails, an empty list will be returned.
+    Returns the time of the latest assignment of an issue.
 
-    :param url: The API endpoint for issues.
-    :return: A list of dictionaries representing open and assigned issues.
+    Events are listed oldest first, so the first page only tells the last
+    page of the timeline through the `Link` header. The timeline is read
+    from that last page backwards and the walk stops at the first page
+    with an assignment, which is usually the last one.
+
+    :param events_url: The API endpoint of the issue events.
+    :raises RequestException: If a request fails.
+    :raises DecodeError: If a page is not a list of events.
+    :return: The time of the assignment, an empty string if there is none.
     """
-    try:
-        response = requests.get(url, headers=HEADERS)
-        response.raise_for_status()
-
-        issues = response.json()
-
-        open_assigned_issues = list(
-            filter(
-                lambda issue: issue.get("state") == "open"
-                and issue.get("assignee")
-                and not issue.get("draft")
-                and not issue.get("pull_request"),
-                issues,
-            )
-        )
+    first = get_page(events_url, params={"per_page": EVENTS_PAGE_SIZE})
+    response = first
+
+    if last_url := first.links.get("last", dict()).get("url"):
+        response = get_page(last_url)
+
+    while True:
+        for event in reversed(ISSUE_EVENTS_DECODER.decode(response.content)):
+            if event.event == "assigned":
+                return event.created_at
+
+        previous_url = response.links.get("prev", dict()).get("url")
+        if not previous_url:
+            return str()
+
+        page = parse_qs(urlsplit(previous_url).query).get("page", ["1"])
+        response = first if page == ["1"] else get_page(previous_url)
+
+
+def check_issue_assignment_events(issue: Issue) -> str:
+    """
+    Checks an issue's timeline for assignment events to determine if it was
+    newly assigned or reassigned to a different contributor.
 
-        return open_assigned_issues
+    The time of the last assignment is cached per issue along with the
+    `updated_at` of the issue, which changes on every assignment, so an
+    unchanged issue is answered without any request. If GitHub fails, the
+    last known time is returned.
 
-    except requests.exceptions.RequestException as e:
+    :param issue: The issue with an "events_url" to fetch assignment events.
+    :return: The time the issue was last assigned (empty string if no assignment event).
+    """
+    cache_key = ASSIGNMENT_CACHE_KEY.format(
+        digest=hashlib.md5(issue.events_url.encode()).hexdigest()
+    )
+    cached = cache.get(cache_key)
+
+    if cached and issue.updated_at and cached["updated_at"] == issue.updated_at:
+        return cached["assigned_at"]
+
+    try:
+        assigned_at = get_latest_assignment(issue.events_url)
+
+    except (requests.exceptions.RequestException, msgspec.DecodeError) as e:
         logger.info(e)
-    return []
+        return cached["assigned_at"] if cached else str()
+
+    cache.set(
+        cache_key,
+        {"updated_at": issue.updated_at, "assigned_at": assigned_at},
+        timeout=settings.ASSIGNMENT_CACHE_TTL,
+    )
+    return assigned_at
 
 
-def get_all_open_pull_requests(url: str) -> list[dict]:
+def get_all_open_and_assigned_issues(url: str) -> list[Issue]:
+    """
+    Retrieves all open and assigned issues from a given URL.
+    The issues listing is shared with the other reports, see `get_classified_issues`.
+    If the request fails, the last known issues are returned as a StaleList.
+
+    :param url: The API endpoint for issues.
+    :return: A list of open and assigned issues.
+    """
+    buckets = get_classified_issues(url)
+    return carry_staleness(buckets.assigned, buckets)
+
+
+def get_all_open_pull_requests(url: str) -> list[PullRequest]:
     """
     Retrieves all open pull requests from a given URL.
     This function sends a GET request to the specified URL with the `state=open` parameter
     to retrieve open pull requests. If the request is successful, it returns the response
-    as a list of dictionaries. If the request fails, an empty list is returned.
+    decoded into pull request records. If the request fails, the last known pull
+    requests are returned as a StaleList.
 
     :param url: The API endpoint for pull requests.
-    :return: A list of dictionaries representing open pull requests.
+    :return: A list of open pull requests.
     """
-    try:
-        response = requests.get(url, headers=HEADERS, params={"state": "open"})
-        response.raise_for_status()
-
-        response = response.json()
-
-        return response
-
-    except requests.exceptions.RequestException as e:
-        logger.info(e)
-    return []
+    return fetch_records(url, PULL_REQUESTS_DECODER, params={"state": "open"})
 
 
-def get_issues_without_pull_requests(
+def get_assignments(
     issues_url: str, pull_requests_url: str
-) -> list[dict]:
+) -> list[tuple[Issue, bool]]:
     """
-    Matches open, assigned issues with open or draft pull requests by the same user.
+    Returns the open, assigned issues with the days since their assignment
+    and whether an open or draft pull request is linked to them, see
+    `get_link_index`.
+    The result is a StaleList if any of the listings is stale.
 
     :param issues_url: The API endpoint for issues.
     :param pull_requests_url: The API endpoint for pull requests.
-    :return: List of issues with matched PR details if found.
+    :return: List of (issue, has_pull_request) pairs.
     """
+    from .links import get_link_index
+
     issues = get_all_open_and_assigned_issues(issues_url)
 
     for issue in issues:
-        issue["assignment_info"] = check_issue_assignment_events(issue)
-        assigned_at = issue.get("assignment_info", dict()).get("assigned_at")
+        issue.assigned_at = check_issue_assignment_events(issue)
 
         time_delta = (
             relativedelta(
                 dt1=datetime.now(),
-                dt2=datetime.strptime(assigned_at, "%Y-%m-%dT%H:%M:%SZ"),
+                dt2=datetime.strptime(issue.assigned_at, "%Y-%m-%dT%H:%M:%SZ"),
             )
-            if assigned_at
+            if issue.assigned_at
             else str()
         )
 
-        issue["days"] = time_delta.days if time_delta else 0
+        issue.days = time_delta.days if time_delta else 0
 
-    pull_requests = get_all_open_pull_requests(pull_requests_url)
+    index = get_link_index(pull_requests_url, issues)
 
-    pull_requests_users = [
-        pull_request.get("user", dict()).get("login")
-        for pull_request in pull_requests
-        if pull_request.get("user", dict()).get("login")
-    ]
+    assignments = [(issue, index.has_pull_request(issue)) for issue in issues]
 
-    result = list()
+    return carry_staleness(assignments, issues, index)
 
-    for issue in issues.copy():
-        if (
-            issue.get("days", 0) >= 1
-            and issue.get("assignee", dict()).get("login") not in pull_requests_users
-        ):
-            result.append(issue)
 
-    return result
+def is_deadline_missed(issue: Issue, has_pull_request: bool) -> bool:
+    """
+    Checks an assignee has had an issue for a day without opening a pull request.
+    :param issue: An issue returned by `get_assignments`.
+    :param has_pull_request: Whether an open pull request is linked to the issue.
+    :return: bool
+    """
+    return issue.days >= 1 and not has_pull_request
 
 
-def get_all_available_issues(url: str) -> list[dict]:
+def get_issues_without_pull_requests(
+    issues_url: str, pull_requests_url: str
+) -> list[Issue]:
     """
-    Retrieves all available issues from a given URL.
-    If the response status is not successful, it raises an exception and returns an empty list.
+    Matches open, assigned issues with the open or draft pull requests linked to them.
+    The result is a StaleList if any of the listings is stale.
 
-    :param url: The API endpoint for issues.
-    :return: A list of dictionaries representing available issues or an empty list if an error occurs.
+    :param issues_url: The API endpoint for issues.
+    :param pull_requests_url: The API endpoint for pull requests.
+    :return: List of issues with matched PR details if found.
     """
-    try:
-        response = requests.get(url, headers=HEADERS)
-        response.raise_for_status()
+    assignments = get_assignments(issues_url, pull_requests_url)
 
-        issues = response.json()
+    result = [
+        issue
+        for issue, has_pull_request in assignments
+        if is_deadline_missed(issue, has_pull_request)
+    ]
 
-        available_issues = list(
-            filter(
-                lambda issue: issue.get("state") == "open"
-                and not any(
-                    [
-                        issue.get("assignee"),
-                        issue.get("draft"),
-                        issue.get("pull_request"),
-                    ]
-                ),
-                issues,
-            )
-        )
-        logger.info(available_issues)
-        return available_issues
+    return carry_staleness(result, assignments)
 
-    except requests.exceptions.RequestException as e:
-        logger.info(e)
-    return []
 
+def get_all_available_issues(url: str) -> list[Issue]:
+    """
+    Retrieves all available issues from a given URL.
+    The issues listing is shared with the other reports, see `get_classified_issues`.
+    If the request fails, the last known issues are returned as a StaleList.
 
-def get_pull_reviews(url: str) -> list[dict]:
+    :param url: The API endpoint for issues.
+    :return: A list of available issues.
+    """
+    buckets = get_classified_issues(url)
+    return carry_staleness(buckets.available, buckets)
+
+
+def get_pull_reviews(url: str) -> list[Review]:
     """
     Retrieves all reviews for a pull request.
+    If the request fails, the last known reviews are returned as a StaleList.
     :param url: The API endpoint for pull request review.
-    :return: A list of dictionaries representing available issues.
+    :return: A list of reviews.
     """
-    try:
-        response = requests.get(url, headers=HEADERS)
-        response.raise_for_status()
+    return fetch_records(url, REVIEWS_DECODER)
 
-        if response.ok:
-            return response.json()
-    except requests.exceptions.RequestException as e:
-        logger.info(e)
-    return []
+
+def get_repository_revisions(author: str, name: str) -> list[dict]:
+    """
+    Retrieve the reviews of all open PRs of a single repository
+    :params author: The author of the repository
+    :params name: The name of the repository
+    :return: A list of reviews for the repository open PRs, the reviews are
+             records which the Celery codec sends as plain dicts. A StaleList
+             if any of the listings is stale.
+    """
+    pulls = get_all_open_pull_requests(PULLS_URL.format(owner=author, repo=name))
+    listings = [pulls]
+    reviews_list = []
+    return_data = {"repo": name}
+    for pull in pulls:
+        return_data["pull"] = pull.title  # add the pull title
+        return_data["number"] = pull.number
+        return_data["pull_author"] = pull.user.login if pull.user else str()
+        reviews_data = get_pull_reviews(
+            url=PULLS_REVIEWS_URL.format(
+                owner=author,
+                repo=name,
+                pull_number=pull.number,
+            )
+        )
+        listings.append(reviews_data)
+        if reviews_data:
+            return_data["reviews"] = reviews_data
+            reviews_list.append(return_data.copy())
+    return carry_staleness(reviews_list, *listings)
 
 
 def get_user_revisions(telegram_id: str) -> list[dict]:
@@ -261,60 +391,49 @@ def get_user_revisions(telegram_id: str) -> list[dict]:
     repos = async_to_sync(get_all_repostitories)(telegram_id)
     reviews_list = []
     for repo in repos:
-        pulls = get_all_open_pull_requests(
-            PULLS_URL.format(owner=repo.get("author", ""), repo=repo.get("name", ""))
+        reviews_list.extend(
+            get_repository_revisions(repo.get("author", ""), repo.get("name", ""))
         )
-        return_data = {"repo": repo.get("name", "")}
-        for pull in pulls:
-            return_data["pull"] = pull.get("title", "")  # add the pull title
-            reviews_data = get_pull_reviews(
-                url=PULLS_REVIEWS_URL.format(
-                    owner=repo.get("author", ""),
-                    repo=repo.get("name", ""),
-                    pull_number=pull["number"],
-                )
-            )
-            if reviews_data:
-                return_data["reviews"] = reviews_data
-                reviews_list.append(return_data.copy())
     return reviews_list
 
 
-def get_contributor_issues(
-    username: str, is_state_open: bool, match_label: bool = False, regex: str = ""
-) -> list:
+def get_tracked_issues_of_user(
+    repositories: list[dict], username: str, regex: str = ""
+) -> list[str]:
     """
-    Retrieves all issues assigned to the github account matching the username.
+    Retrieves the issues of the tracked repositories assigned to a github user.
+    Reuses the cached issue classification of every repository, which is
+    already narrowed down by the repository filters.
+    :param repositories: list of repository dicts
     :param username: The username of the github account.
-    :return: A list representing issues assigned.
+    :param regex: Issues of repositories without a labels filter are only
+                  returned if they have a label matching the regex.
+    :return: A list of rendered issues with the time before their deadline.
     """
-    try:
-        api_url = ISSUES_SEARCH.format(username=username)
-
-        response = requests.get(api_url, headers=HEADERS)
-
-        response.raise_for_status()
+    result = list()
 
-        issues = response.json().get("items", [])
-        issues_format = []
-        for issue in issues:
+    for repository in repositories:
+        buckets = get_classified_issues(issues_listing_url(repository, assigned=True))
 
-            if is_state_open and issue.get("state") != "open":
+        for issue in buckets.assigned:
+            if issue.assignee_login.lower() != username.lower():
                 continue
 
-            labels = [label.get("name") for label in issue.get("labels", [])]
-            for label in labels:
-                if not match_label or re.search(regex, label, re.IGNORECASE):
-                    issues_format.append(
-                        f"Issue: {issue.get('title')}: {issue.get('html_url')}"
-                    )
-                    break
+            if (
+                regex
+                and not repository.get("labels", str()).strip()
+                and not any(
+                    re.search(regex, label.name, re.IGNORECASE)
+                    for label in issue.labels
+                )
+            ):
+                continue
 
-        return issues_format
+            title = attach_link_to_issue(issue.title, issue.html_url)
+            deadline = get_time_before_deadline(issue, repository.get("time_limit"))
+            result.append(f"Issue: {title}\n{deadline}")
 
-    except requests.exceptions.RequestException as e:
-        logger.info(e)
-    return []
+    return result
 
 
 def attach_link_to_issue(issue_title: str, issue_link: str) -> str:
@@ -329,39 +448,49 @@ def attach_link_to_issue(issue_title: str, issue_link: str) -> str:
     return title
 
 
-def get_repository_from_issue(issue: dict) -> dict:
-    repository_url = issue.get("repository_url", "")
+def get_repository_from_issue(issue: Issue) -> dict:
+    repository_url = issue.repository_url
     if repository_url:
         parts = repository_url.rstrip("/").split("/")
         return {"author": parts[-2], "name": parts[-1]}
     return {}
 
 
-def get_time_before_deadline(issue: dict) -> str:
+def get_time_before_deadline(issue: Issue, time_limit: int | None = None) -> str:
     """
     Returns the time remaining before the deadline of an assigned issue.
     If the issue has no assignee or deadline, returns appropriate messages.
+    An assignment time already attached to the issue is reused.
 
-    :param issue: The issue dictionary containing information about the issue.
+    :param issue: The issue to check.
+    :param time_limit: The repository time limit in seconds, looked up if not given.
     :return: Time remaining in a human-readable format.
     """
 
-    assignment_info = check_issue_assignment_events(issue)
-    assigned_at = assignment_info.get("assigned_at")
+    assigned_at = issue.assigned_at or check_issue_assignment_events(issue)
 
     if not assigned_at:
         return "This issue is not assigned."
 
-    repository_details = get_repository_from_issue(issue)
-    if not repository_details:
-        return "Repository details not found."
+    if time_limit is None:
+        repository_details = get_repository_from_issue(issue)
+        if not repository_details:
+            return "Repository details not found."
 
-    from .models import Repository
+        from .models import Repository
 
-    repo = Repository.objects.get(
-        author=repository_details.get("author"), name=repository_details.get("name")
-    )
-    time_limit_seconds = repo.time_limit
+        time_limit = (
+            Repository.objects.filter(
+                author=repository_details.get("author"),
+                name=repository_details.get("name"),
+            )
+            .values_list("time_limit", flat=True)
+            .first()
+        )
+        if time_limit is None:
+            return "Repository details not found."
+
+    time_limit_seconds = time_limit
 
     assigned_time = datetime.strptime(assigned_at, DATETIME_FORMAT).replace(
         tzinfo=timezone.utc
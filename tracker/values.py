@@ -1,10 +1,6 @@
-import os
 from dataclasses import dataclass
 
-from dotenv import load_dotenv
-
-load_dotenv()
-
+GITHUB_API_URL = "https://api.github.com"
 ISSUES_URL = "https://api.github.com/repos/{owner}/{repo}/issues"
 PULLS_URL = "https://api.github.com/repos/{owner}/{repo}/pulls"
 PULLS_REVIEWS_URL = (
@@ -12,16 +8,36 @@ PULLS_REVIEWS_URL = (
 )
 
 ROLE_MAX_CHARACTER_LENGTH = 11
-ISSUES_SEARCH = "https://api.github.com/search/issues?q=assignee:{username}+is:issue"
 
+# Authorization is added per request, see tracker.github_auth.GitHubAuth.
 HEADERS = {
     "Accept": "application/vnd.github+json",
-    "Authorization": f'Bearer {os.environ.get("GITHUB_AUTH_TOKEN", "")}',
     "X-GitHub-Api-Version": "2022-11-28",
 }
 
+# Milestone filters GitHub accepts: a milestone number, "*" or "none".
+MILESTONE_PATTERN = r"\d+|\*|none"
+# The label `/issues` filters by in repositories without a labels filter.
+DEFAULT_ISSUES_LABEL = "ODHack"
+
+# Leaderboard points of every ActivityKind.
+LEADERBOARD_POINTS = {
+    "issues_completed": 10,
+    "pull_requests_merged": 5,
+    "reviews_received": 1,
+    "deadlines_missed": -5,
+}
+
 DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 SECONDS_IN_AN_HOUR = 3600
+SECONDS_IN_A_DAY = 86400
+
+# Days covered by every period of the issue statistics.
+STATS_PERIODS = {"week": 7, "month": 30, "quarter": 90}
+
+# Seconds between two digests of every NotificationMode.
+DIGEST_WINDOWS = {"immediate": 0, "hourly": 3600, "daily": 86400}
+
 
 @dataclass(frozen=True)
 class DefaultModelValues:
@@ -41,3 +57,11 @@ class DefaultModelValues:
     link_max_length: int = 255
     email_max_length: int = 255
     time_limit_default: int = 86400
+    labels_max_length: int = 255
+    milestone_max_length: int = 50
+    github_login_max_length: int = 39
+    activity_key_max_length: int = 255
+    activity_kind_max_length: int = 20
+    notification_mode_max_length: int = 10
+    notification_key_max_length: int = 255
+    history_kind_max_length: int = 12
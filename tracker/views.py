@@ -1,11 +1,42 @@
+import hmac
+import time
+
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import login
+from django.db import DatabaseError, transaction
 from django.http import HttpResponse
 from django.shortcuts import redirect, render
+from django.utils.decorators import method_decorator
+from django.views import View
 from django.views.generic import CreateView
 from django.views.generic.list import ListView
 
+from .codec import JsonResponse
+from .db import check_database, get_pool_stats
+from .exports import EXPORT_FORMATS, export_response
+from .github_auth import get_token_usage
 from .forms import SignUpForm
+from .models import Contributor, Repository
+
+HEALTH_TOKEN_HEADER = "X-Health-Token"
+
+
+def sees_health_details(request) -> bool:
+    """
+    Checks the caller of a health endpoint may see more than its status:
+    staff users, or callers sending `settings.HEALTH_TOKEN`.
+    :param request: HttpRequest
+    :return: bool
+    """
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+
+    token = request.headers.get(HEALTH_TOKEN_HEADER, str())
+    return bool(settings.HEALTH_TOKEN) and hmac.compare_digest(
+        token.encode(), settings.HEALTH_TOKEN.encode()
+    )
+
 
 class CreateUserView(CreateView):
     form_class = SignUpForm
@@ -42,4 +73,124 @@ class CreateUserView(CreateView):
 
         [messages.error(request, error_) for error_ in form.errors.values()]
 
-        return render(request, self.template_name, {"form": form})
\ No newline at end of file
+        return render(request, self.template_name, {"form": form})
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ContributorListView(View):
+    """
+    An async JSON endpoint listing contributors for admin users.
+    Notes and rank are only included for project leads.
+    """
+
+    async def get(self, request, *args, **kwargs) -> JsonResponse:
+        """
+        A GET request for this view.
+        :param request: HttpRequest
+        :param args: tuple
+        :param kwargs: dict
+        :return: JsonResponse
+        """
+        user = await request.auser()
+
+        if not user.is_authenticated or not user.is_staff:
+            return JsonResponse({"detail": "Forbidden"}, status=403)
+
+        queryset = Contributor.objects.select_related("user__telegramuser")
+        full = user.is_project_lead()
+
+        data = [contributor.to_dict(full=full) async for contributor in queryset]
+
+        return JsonResponse(data, safe=False)
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class DatabaseHealthView(View):
+    """
+    A health check of the database. Only staff users and callers with the
+    health token see the error and this process' pool usage.
+    """
+
+    def get(self, request, *args, **kwargs) -> JsonResponse:
+        """
+        A GET request for this view.
+        :param request: HttpRequest
+        :param args: tuple
+        :param kwargs: dict
+        :return: JsonResponse
+        """
+        details = sees_health_details(request)
+
+        try:
+            check_database()
+        except DatabaseError as e:
+            data = {"status": "degraded"}
+            if details:
+                data["detail"] = str(e)
+            return JsonResponse(data, status=503)
+
+        if not details:
+            return JsonResponse({"status": "ok"})
+
+        return JsonResponse(
+            {
+                "status": "ok",
+                "process": settings.PROCESS_TYPE,
+                "pool": get_pool_stats(),
+            }
+        )
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class GitHubUsageView(View):
+    """
+    Reports whether a GitHub token ran out of its rate limit. Only staff
+    users and callers with the health token see the usage of every token.
+    """
+
+    def get(self, request, *args, **kwargs) -> JsonResponse:
+        """
+        A GET request for this view.
+        :param request: HttpRequest
+        :param args: tuple
+        :param kwargs: dict
+        :return: JsonResponse
+        """
+        usage = get_token_usage()
+        exhausted = any(
+            token["remaining"] == 0 and token["reset"] > time.time()
+            for token in usage.values()
+        )
+        data = {"status": "degraded" if exhausted else "ok"}
+
+        if sees_health_details(request):
+            data["tokens"] = usage
+
+        return JsonResponse(data)
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class AssignmentsExportView(View):
+    """
+    Streams the assignments and missed deadlines of the repositories of
+    the current admin user as a CSV or JSON file.
+    """
+
+    def get(self, request, *args, **kwargs) -> HttpResponse:
+        """
+        A GET request for this view.
+        :param request: HttpRequest
+        :param args: tuple
+        :param kwargs: dict
+        :return: StreamingHttpResponse
+        """
+        if not request.user.is_authenticated or not request.user.is_staff:
+            return JsonResponse({"detail": "Forbidden"}, status=403)
+
+        export_format = request.GET.get("format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return JsonResponse({"detail": "Unknown format"}, status=400)
+
+        return export_response(
+            request, Repository.objects.filter(user=request.user), export_format
+        )